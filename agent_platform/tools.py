@@ -23,6 +23,7 @@ import os
 # Add project paths for service imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from shared.utils.logger import get_logger
+from shared.utils.indicator_graph import TECHNICALS, get_indicator_cache
 
 logger = get_logger("titan-tools")
 
@@ -31,62 +32,61 @@ logger = get_logger("titan-tools")
 # SECTION 1: QUANT TOOLS (8 tools)
 # ============================================================================
 
-def get_market_data(ticker: str, period: str = "1mo") -> Dict:
-    """Fetch OHLCV market data for a ticker"""
+def _load_market_data(ticker: str, period: str = "1mo") -> Dict:
+    """
+    Fetch OHLCV data in columnar layout for in-process tools
+
+    ``data`` is an OHLCVColumns: NumPy arrays per column (``data["Close"]``)
+    shared with the connector cache, so no per-bar dicts are built.
+    """
     try:
         # Import connector dynamically to avoid circular imports
         import importlib
         ingestion_module = importlib.import_module(
-            'services.ingestion-engine.connectors')
+            'services.ingestion_engine.connectors')
         get_connector = ingestion_module.get_connector
         connector = get_connector()
         
-        result = connector.get_historical_data(ticker, period)
-        logger.info(f"Fetched market data for {ticker}", ticker=ticker, period=period)
+        result = connector.get_historical_data(ticker, period, layout="columns")
+        result["success"] = True
         return result
     except Exception as e:
         logger.error(f"Market data error: {str(e)}", ticker=ticker)
         return {"error": str(e), "success": False}
 
 
+def get_market_data(ticker: str, period: str = "1mo") -> Dict:
+    """Fetch OHLCV market data for a ticker"""
+    result = _load_market_data(ticker, period)
+    if result.get("success"):
+        # Column lists (Date/Open/High/Low/Close/Volume) for the agent
+        result = dict(result, data=result["data"].to_dict())
+        logger.info(f"Fetched market data for {ticker}", ticker=ticker, period=period)
+    return result
+
+
 def get_live_price(ticker: str) -> Dict:
     """
     Get LIVE stock price from Yahoo Finance (yfinance).
     This is REAL-TIME data with ~15-20 minute delay from market.
     
+    Served from the batched quote snapshot (watched tickers are polled in
+    one request); unwatched tickers are fetched on demand.
+    
     Args:
         ticker: Stock symbol (e.g., AAPL, TSLA, MSFT)
         
     Returns:
-        dict with live price, change, and market status
+        dict with live price, change, staleness, and market status
     """
     try:
-        import yfinance as yf
-        from datetime import datetime
-        
-        stock = yf.Ticker(ticker)
-        
-        # Use fast_info for quick live data (no API call delay)
-        fast_info = stock.fast_info
-        
-        current_price = fast_info.get('lastPrice', None)
-        previous_close = fast_info.get('previousClose', None)
-        market_cap = fast_info.get('marketCap', None)
-        
-        if current_price is None:
-            # Fallback to history
-            hist = stock.history(period="1d")
-            if not hist.empty:
-                current_price = float(hist['Close'].iloc[-1])
-                previous_close = float(hist['Open'].iloc[0])
+        from services.ingestion_engine.connectors import get_quote_service
         
-        # Calculate change
-        if current_price and previous_close:
-            change = current_price - previous_close
-            change_pct = (change / previous_close) * 100
-        else:
-            change = 0
-            change_pct = 0
+        quote = get_quote_service().get_quote(ticker)
+        current_price = quote["price"]
+        previous_close = quote["previous_close"]
+        change = quote["change"] or 0
+        change_pct = quote["change_percent"] or 0
         
         result = {
             "ticker": ticker.upper(),
@@ -95,9 +95,10 @@ def get_live_price(ticker: str) -> Dict:
             "change": round(change, 2),
             "change_percent": round(change_pct, 2),
             "direction": "📈 UP" if change > 0 else "📉 DOWN" if change < 0 else "➡️ FLAT",
-            "market_cap": f"${market_cap/1e9:.1f}B" if market_cap else None,
+            "as_of": quote["as_of"],
+            "age_seconds": quote["age_seconds"],
             "timestamp": datetime.now().isoformat(),
-            "source": "Yahoo Finance (yfinance)",
+            "source": f"Yahoo Finance (yfinance, {quote['source']})",
             "delay": "~15-20 minute delay from market",
             "success": True
         }
@@ -116,9 +117,9 @@ def get_live_price(ticker: str) -> Dict:
 
 
 def calculate_technicals(ticker: str, period: str = "3mo") -> Dict:
-    """Calculate comprehensive technical indicators (RSI, MACD, Bollinger, MAs)"""
+    """Calculate comprehensive technical indicators (RSI, MACD, Bollinger, MAs, ATR)"""
     try:
-        market_data = get_market_data(ticker, period)
+        market_data = _load_market_data(ticker, period)
         if not market_data.get("success"):
             return market_data
         
@@ -128,23 +129,25 @@ def calculate_technicals(ticker: str, period: str = "3mo") -> Dict:
         if len(close_prices) < 50:
             return {"error": "Insufficient data for technical analysis", "success": False}
         
-        # Simplified technical calculation (in production, use pandas_ta)
-        current_price = close_prices[-1]
-        ma_50 = sum(close_prices[-50:]) / 50
-        ma_200 = sum(close_prices[-200:]) / 200 if len(close_prices) >= 200 else None
-        
-        rsi = 50  # Simplified RSI placeholder
-        macd_signal = "bullish" if current_price > ma_50 else "bearish"
+        # One batched, memoized graph evaluation (shared EMAs / rolling
+        # windows; same kernels as the backtests and live streaming)
+        values = get_indicator_cache().latest(ticker, prices, TECHNICALS)
+        rounded = {name: None if v is None else round(v, 4) for name, v in values.items()}
         
         return {
             "ticker": ticker,
-            "current_price": current_price,
-            "rsi": rsi,
-            "macd_signal": macd_signal,
-            "ma_50": ma_50,
-            "ma_200": ma_200,
-            "bollinger_upper": current_price * 1.05,
-            "bollinger_lower": current_price * 0.95,
+            "current_price": float(close_prices[-1]),
+            "rsi": rounded["rsi"],
+            "macd_signal": "bullish" if values["macd_histogram"] > 0 else "bearish",
+            "macd": rounded["macd"],
+            "macd_signal_line": rounded["macd_signal"],
+            "macd_histogram": rounded["macd_histogram"],
+            "ma_50": rounded["sma_50"],
+            "ma_200": rounded["sma_200"],
+            "bollinger_upper": rounded["bollinger_upper"],
+            "bollinger_middle": rounded["bollinger_middle"],
+            "bollinger_lower": rounded["bollinger_lower"],
+            "atr": rounded["atr"],
             "success": True
         }
     except Exception as e:
@@ -155,15 +158,15 @@ def calculate_technicals(ticker: str, period: str = "3mo") -> Dict:
 def analyze_price_action(ticker: str, period: str = "3mo") -> Dict:
     """Analyze price trends, support/resistance, patterns"""
     try:
-        market_data = get_market_data(ticker, period)
+        market_data = _load_market_data(ticker, period)
         if not market_data.get("success"):
             return market_data
         
         prices = market_data.get("data", {}).get("Close", [])
         
         # Trend detection
-        start_price = prices[0]
-        end_price = prices[-1]
+        start_price = float(prices[0])
+        end_price = float(prices[-1])
         trend = "uptrend" if end_price > start_price else "downtrend"
         trend_strength = abs(end_price - start_price) / start_price * 100
         
@@ -171,8 +174,8 @@ def analyze_price_action(ticker: str, period: str = "3mo") -> Dict:
             "ticker": ticker,
             "trend": trend,
             "trend_strength": round(trend_strength, 2),
-            "support": min(prices),
-            "resistance": max(prices),
+            "support": float(prices.min()),
+            "resistance": float(prices.max()),
             "pattern_detected": "consolidation" if trend_strength < 5 else trend,
             "success": True
         }
@@ -226,13 +229,13 @@ def analyze_earnings(ticker: str) -> Dict:
 def analyze_volume(ticker: str, period: str = "1mo") -> Dict:
     """Analyze trading volume patterns"""
     try:
-        market_data = get_market_data(ticker, period)
+        market_data = _load_market_data(ticker, period)
         if not market_data.get("success"):
             return market_data
         
         volumes = market_data.get("data", {}).get("Volume", [])
-        avg_volume = sum(volumes) / len(volumes)
-        current_volume = volumes[-1]
+        avg_volume = float(volumes.mean())
+        current_volume = int(volumes[-1])
         
         volume_ratio = current_volume / avg_volume
         signal = "HIGH" if volume_ratio > 1.5 else "LOW" if volume_ratio < 0.5 else "NORMAL"
@@ -252,7 +255,7 @@ def analyze_volume(ticker: str, period: str = "1mo") -> Dict:
 def detect_chart_patterns(ticker: str, period: str = "3mo") -> Dict:
     """Detect chart patterns (head & shoulders, triangles, etc.)"""
     try:
-        market_data = get_market_data(ticker, period)
+        market_data = _load_market_data(ticker, period)
         if not market_data.get("success"):
             return market_data
         
@@ -260,8 +263,8 @@ def detect_chart_patterns(ticker: str, period: str = "3mo") -> Dict:
         prices = market_data.get("data", {}).get("Close", [])
         
         # Check for double top/bottom
-        recent_high = max(prices[-30:])
-        recent_low = min(prices[-30:])
+        recent_high = prices[-30:].max()
+        recent_low = prices[-30:].min()
         current = prices[-1]
         
         pattern = "none"
@@ -597,30 +600,34 @@ def detect_blackswan(ticker: str, threshold: float = 3.0) -> Dict:
 # ============================================================================
 
 def backtest_strategy(ticker: str, strategy: str = "buy_and_hold", period: str = "1y") -> Dict:
-    """Backtest trading strategy on historical data"""
+    """
+    Backtest trading strategy on historical data
+    
+    Served from the nightly precomputed strategy matrix (watchlist x
+    strategies x periods); tickers not in the matrix run live through
+    the BacktestEngine.
+    
+    Args:
+        ticker: Stock symbol (e.g., AAPL)
+        strategy: buy_and_hold, rsi_strategy or ma_crossover
+        period: Trailing period (1y, 2y, 5y, ... or max)
+        
+    Returns:
+        dict with return, Sharpe, drawdown, win rate, trade count and the
+        result's source ("matrix" or "live")
+    """
     try:
-        # Simulated backtest results
-        import random
-        random.seed(hash(ticker + strategy) % 1000)
+        from services.backtest_engine.strategy_matrix import strategy_result
         
-        total_return = round(random.uniform(-20, 50), 2)
-        sharpe = round(random.uniform(-0.5, 2.5), 2)
-        max_dd = round(random.uniform(-40, -5), 2)
-        win_rate = round(random.uniform(40, 70), 1)
+        result = strategy_result(ticker, strategy, period)
+        if result.get("status") != "success":
+            return {"error": result.get("message", "Backtest failed"), "success": False}
         
-        return {
-            "ticker": ticker,
-            "strategy": strategy,
-            "period": period,
-            "total_return": total_return,
-            "sharpe_ratio": sharpe,
-            "max_drawdown": max_dd,
-            "win_rate": win_rate,
-            "num_trades": random.randint(10, 100),
-            "success": True,
-            "note": "Simulated backtest"
-        }
+        result = dict(result, success=True)
+        del result["status"]
+        return result
     except Exception as e:
+        logger.error(f"Backtest error: {str(e)}", ticker=ticker)
         return {"error": str(e), "success": False}
 
 
@@ -0,0 +1,105 @@
+"""
+============================================================================
+TITAN PLATFORM - TECHNICAL INDICATORS BENCHMARK
+============================================================================
+Cost of the shared indicator kernels:
+- Streaming: per-bar update of each indicator and of the full IndicatorSet
+  (constant, independent of history length)
+- Batch: full indicator arrays over long histories
+
+Run with: python benchmarks/bench_indicators.py [--bars 200000]
+============================================================================
+"""
+import sys
+import os
+import argparse
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from shared.utils import indicators
+
+
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bars", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, args.bars)))
+    high = close * (1 + rng.uniform(0, 0.01, args.bars))
+    low = close * (1 - rng.uniform(0, 0.01, args.bars))
+    rows = list(zip(high.tolist(), low.tolist(), close.tolist()))
+    closes = close.tolist()
+
+    print(f"⚡ Streaming update cost ({args.bars:,} bars)")
+    streams = {
+        "SMA(200)": lambda: indicators.SMA(200),
+        "EMA(12)": lambda: indicators.EMA(span=12),
+        "RSI(14)": lambda: indicators.RSI(14),
+        "MACD(12,26,9)": lambda: indicators.MACD(),
+        "Bollinger(20,2)": lambda: indicators.Bollinger(),
+    }
+    for name, make in streams.items():
+        def run():
+            update = make().update
+            for x in closes:
+                update(x)
+        print(f"  {name:<16} {best_of(run) / args.bars * 1e9:6.0f} ns/bar")
+
+    def run_atr():
+        update = indicators.ATR(14).update
+        for h, l, c in rows:
+            update(h, l, c)
+
+    def run_set():
+        update = indicators.IndicatorSet().update
+        for h, l, c in rows:
+            update(h, l, c)
+    print(f"  {'ATR(14)':<16} {best_of(run_atr) / args.bars * 1e9:6.0f} ns/bar")
+    print(f"  {'IndicatorSet':<16} {best_of(run_set) / args.bars * 1e9:6.0f} ns/bar")
+
+    # Per-bar cost must not depend on how much history came before
+    short, long = 10_000, min(args.bars, 200_000)
+    live = indicators.IndicatorSet()
+    for h, l, c in rows[:long - short]:
+        live.update(h, l, c)
+    start = time.perf_counter()
+    for h, l, c in rows[long - short:long]:
+        live.update(h, l, c)
+    late = (time.perf_counter() - start) / short
+    fresh = indicators.IndicatorSet()
+    start = time.perf_counter()
+    for h, l, c in rows[:short]:
+        fresh.update(h, l, c)
+    early = (time.perf_counter() - start) / short
+    print(f"  IndicatorSet after {long - short:,} bars: {late * 1e9:.0f} ns/bar "
+          f"(first {short:,}: {early * 1e9:.0f} ns/bar)")
+
+    print(f"\n📊 Batch kernels ({args.bars:,} bars)")
+    batch = {
+        "sma(200)": lambda: indicators.sma(close, 200),
+        "rsi(14)": lambda: indicators.rsi(close),
+        "macd": lambda: indicators.macd(close),
+        "bollinger": lambda: indicators.bollinger(close),
+        "atr(14)": lambda: indicators.atr(high, low, close),
+        "technicals": lambda: indicators.technicals(high, low, close),
+    }
+    for name, fn in batch.items():
+        print(f"  {name:<16} {best_of(fn) * 1000:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
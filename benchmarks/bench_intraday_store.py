@@ -0,0 +1,104 @@
+"""
+============================================================================
+TITAN PLATFORM - INTRADAY STORE BENCHMARK
+============================================================================
+On-disk size and scan throughput of the compressed minute-bar store
+against raw arrays and CSV, for one year of synthetic 1m bars per ticker:
+- bytes per bar (intraday store vs raw int64/float64 arrays vs CSV)
+- full-year decode throughput (bars/s)
+- 1m -> 5m/1h/1d resample on the decoded columns vs pandas resample
+
+Run with: python benchmarks/bench_intraday_store.py
+============================================================================
+"""
+import sys
+import os
+import logging
+import tempfile
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from services.backtest_engine.intraday_store import IntradayStore
+
+TICKERS = 5
+DAYS = 252
+AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+def make_year(seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range("2023-01-02", periods=DAYS)
+    minutes = pd.timedelta_range("09:30:00", periods=390, freq="1min")
+    index = pd.DatetimeIndex((days.values[:, None] + minutes.values[None, :]).ravel(),
+                             name="Date")
+    close = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.0006, len(index)))), 2)
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    wick = np.round(np.abs(rng.normal(0, 0.03, (2, len(index)))), 2)
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) + wick[0],
+        "Low": np.minimum(open_, close) - wick[1],
+        "Close": close,
+        "Volume": rng.integers(100, 20_000, len(index)) // 100 * 100,
+    }, index=index)
+
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    logging.getLogger("intraday-store").setLevel(logging.WARNING)
+    frames = {f"T{i:02d}": make_year(i) for i in range(TICKERS)}
+    bars = sum(len(df) for df in frames.values())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = IntradayStore(os.path.join(tmp, "intraday"))
+        start = time.perf_counter()
+        for ticker, df in frames.items():
+            store.write(ticker, df)
+        write_s = time.perf_counter() - start
+
+        csv_bytes = 0
+        for ticker, df in frames.items():
+            path = os.path.join(tmp, f"{ticker}.csv")
+            df.to_csv(path)
+            csv_bytes += os.path.getsize(path)
+        packed = sum(store.nbytes(t) for t in frames)
+        raw = bars * 6 * 8
+
+        print(f"📦 {TICKERS} tickers x {DAYS} days of 1m bars ({bars:,} bars)")
+        print(f"  raw arrays     {raw / bars:6.2f} B/bar  {raw / 1e6:7.1f} MB")
+        print(f"  csv            {csv_bytes / bars:6.2f} B/bar  {csv_bytes / 1e6:7.1f} MB")
+        print(f"  intraday store {packed / bars:6.2f} B/bar  {packed / 1e6:7.1f} MB "
+              f"({raw / packed:.1f}x smaller than raw)")
+        print(f"  write          {bars / write_s / 1e6:6.2f} M bars/s")
+
+        decode = best_of(lambda: [store.read_bars(t) for t in frames])
+        print(f"\n⚡ Full-year decode: {decode * 1000:.1f} ms "
+              f"({bars / decode / 1e6:.1f} M bars/s)")
+        one_day = best_of(lambda: store.read_bars("T00", "2023-06-01", "2023-06-01"), 50)
+        print(f"  single-day read: {one_day * 1e6:.0f} us")
+
+        print("\n📊 Resample (per ticker, full year):")
+        decoded = store.read_bars("T00")
+        frame = frames["T00"]
+        for interval, rule in (("5m", "5min"), ("1h", "1h"), ("1d", "1D")):
+            ours = best_of(lambda: store.resample(decoded, interval))
+            theirs = best_of(lambda: frame.resample(rule).agg(AGG).dropna(), 3)
+            print(f"  {interval:>3}: {ours * 1000:6.2f} ms vs pandas "
+                  f"{theirs * 1000:7.2f} ms ({theirs / ours:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
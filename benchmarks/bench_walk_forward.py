@@ -0,0 +1,86 @@
+"""
+============================================================================
+TITAN PLATFORM - WALK-FORWARD BENCHMARK
+============================================================================
+Walk-forward optimization of an RSI grid over 20 years of daily bars
+(3-year train / 6-month test windows), compared with:
+- One full-history sweep of the same grid
+- The manual approach: a fresh run per window and configuration on
+  sliced data, recomputing every indicator each time
+
+Run with: python benchmarks/bench_walk_forward.py [--workers N]
+============================================================================
+"""
+import sys
+import os
+import argparse
+import logging
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from services.backtest_engine.sweep import evaluate, expand_grid, iter_sweep
+from services.backtest_engine.walk_forward import walk_forward, walk_forward_windows
+from services.ingestion_engine.mock_market_service import SyntheticMarketGenerator
+
+GRID = {"period": list(range(6, 31, 2)), "oversold": [20, 25, 30, 35],
+        "overbought": [65, 70, 75, 80]}
+TRAIN_BARS = 756
+TEST_BARS = 126
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    logging.getLogger("backtest-sweep").setLevel(logging.WARNING)
+
+    close = SyntheticMarketGenerator(seed=8, model="regime").generate(
+        ["SPY"], start="2004-01-01", end="2024-01-01")["SPY"]["Close"].to_numpy()
+    configs = expand_grid(GRID)
+    windows = walk_forward_windows(len(close), TRAIN_BARS, TEST_BARS)
+    print(f"🔁 Walk-forward: {len(configs)} configs x {len(windows)} windows "
+          f"on {len(close):,} bars")
+
+    start = time.perf_counter()
+    list(iter_sweep({"SPY": close}, "rsi_strategy", GRID, max_workers=1))
+    sweep = time.perf_counter() - start
+    print(f"  full-history sweep (inline):   {sweep:6.2f}s")
+
+    start = time.perf_counter()
+    result = walk_forward(close, "rsi_strategy", GRID, TRAIN_BARS, TEST_BARS,
+                          max_workers=1)
+    inline = time.perf_counter() - start
+    print(f"  walk-forward (inline):         {inline:6.2f}s  "
+          f"({inline / sweep:.1f}x the sweep)")
+
+    workers = args.workers or os.cpu_count() or 1
+    if workers > 1:
+        start = time.perf_counter()
+        walk_forward(close, "rsi_strategy", GRID, TRAIN_BARS, TEST_BARS,
+                     max_workers=workers)
+        pooled = time.perf_counter() - start
+        print(f"  walk-forward ({workers} workers):    {pooled:6.2f}s")
+
+    # Manual: slice data per window (with indicator warm-up) and rerun
+    sample = windows[:3]
+    start = time.perf_counter()
+    for train_lo, train_hi, _, _ in sample:
+        lo = max(0, train_lo - max(GRID["period"]))
+        for params in configs:
+            evaluate(close[lo:train_hi].copy(), "rsi_strategy", params, 100000.0)
+    manual = (time.perf_counter() - start) / len(sample) * len(windows)
+    print(f"  manual per-window reruns:      {manual:6.2f}s (extrapolated)  "
+          f"→ {manual / inline:.1f}x slower")
+
+    final = result.equity[-1]
+    print(f"\n📈 Stitched OOS: {len(result.equity):,} bars, final ${final:,.0f}, "
+          f"{np.count_nonzero(result.trade_profits > 0)}/{len(result.trade_profits)} "
+          f"winning trades")
+
+
+if __name__ == "__main__":
+    main()
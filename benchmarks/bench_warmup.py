@@ -0,0 +1,84 @@
+"""
+============================================================================
+TITAN PLATFORM - CACHE WARMUP BENCHMARK
+============================================================================
+First-query vs steady-state latency of the quant data path (OHLCV for a
+tool period plus the live quote) for a 50-ticker watchlist, with and
+without the startup cache warmer. Uses the synthetic market source with
+a simulated 80ms request latency (no Yahoo Finance traffic).
+
+Run with: python benchmarks/bench_warmup.py
+============================================================================
+"""
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from services.ingestion_engine.connectors import QuoteSnapshotService
+from services.ingestion_engine.mock_market_service import get_synthetic_connector
+from services.ingestion_engine.warmup import CacheWarmer
+
+
+class LatencySource:
+    def __init__(self, source, latency=0.08):
+        self.source = source
+        self.latency = latency
+
+    def history(self, ticker, period):
+        time.sleep(self.latency)
+        return self.source.history(ticker, period)
+
+    def download(self, tickers, period):
+        time.sleep(self.latency)
+        return self.source.download(tickers, period)
+
+
+def query_latencies(connector, quotes, tickers):
+    latencies = []
+    for ticker in tickers:
+        start = time.perf_counter()
+        connector.get_ohlcv(ticker, "3mo", layout="columns")
+        quotes.get(ticker)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+
+def run(warm, tickers, cache_dir):
+    connector = get_synthetic_connector(cache_dir=cache_dir)
+    connector.source = LatencySource(connector.source)
+    quotes = QuoteSnapshotService(connector, interval=3600)
+    if warm:
+        warmer = CacheWarmer(tickers, connector=connector, quote_service=quotes)
+        warmer.add_stage("history", lambda ticker: None)  # backtest cache not measured here
+        warmer.run()
+        quotes.stop()
+    first = query_latencies(connector, quotes, tickers)
+    steady = query_latencies(connector, quotes, tickers)
+    return first, steady
+
+
+def main():
+    import logging
+    import tempfile
+    for name in ("ingestion-engine", "ingestion-engine-quotes", "cache-warmer"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    tickers = [f"T{i:03d}" for i in range(50)]
+    print("=" * 70)
+    print("CACHE WARMUP BENCHMARK (50 tickers, 80ms/request)")
+    print("=" * 70)
+    print(f"{'mode':>8} {'first p50':>11} {'first p95':>11} {'steady p95':>11}  (ms)")
+    for warm in (False, True):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first, steady = run(warm, tickers, cache_dir)
+        print(f"{'warm' if warm else 'cold':>8} {np.percentile(first, 50):>11.3f} "
+              f"{np.percentile(first, 95):>11.3f} {np.percentile(steady, 95):>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
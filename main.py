@@ -20,6 +20,7 @@ load_dotenv()
 
 # Import root agent
 from agent_platform.root_agent import market_trend_principal
+from services.ingestion_engine.warmup import start_background_warmup
 from shared.utils.logger import get_logger
 
 # Initialize logger for main application
@@ -86,6 +87,11 @@ def main():
     print('  "Analyze NVDA fundamentals"')
     print("\nType 'quit' or 'exit' to stop\n")
     
+    # Warm watchlist caches in the background (never blocks the prompt)
+    warmer = start_background_warmup()
+    if warmer:
+        print(f"🔥 Warming caches for {len(warmer.tickers)} watchlist tickers in the background\n")
+    
     # Create session service (required for ADK 1.19.0+)
     session_service = InMemorySessionService()
     
@@ -0,0 +1,165 @@
+"""
+Historical Data Catalog
+SQLite manifest of what the columnar store holds: one row per ticker with
+first/last date, row count, schema version, checksum and last refresh.
+Coverage, staleness and "what do we have" questions become single-row
+queries instead of partition reads.
+
+Rebuild the catalog from the store with:
+    python -m services.backtest_engine.data_loader catalog --sync
+"""
+from shared.utils.logger import get_logger
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import os
+import sys
+
+# Add shared utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+logger = get_logger("data-catalog")
+
+CATALOG_COLUMNS = (
+    "ticker", "first_date", "last_date", "rows", "schema_version",
+    "checksum", "last_refresh", "requested_start", "updated_at",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickers (
+    ticker          TEXT PRIMARY KEY,
+    first_date      TEXT,
+    last_date       TEXT,
+    rows            INTEGER NOT NULL DEFAULT 0,
+    schema_version  INTEGER,
+    checksum        TEXT,
+    last_refresh    TEXT,
+    requested_start TEXT,
+    updated_at      TEXT
+)
+"""
+
+
+class DataCatalog:
+    """
+    SQLite-backed manifest of cached tickers
+
+    ``requested_start`` remembers the earliest start date ever fetched, so
+    a ticker that simply has no older history is not re-downloaded on
+    every request.
+    """
+
+    def __init__(self, path: str = "./data/historical/catalog.sqlite"):
+        """
+        Initialize catalog
+
+        Args:
+            path: SQLite database file (created if missing)
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute(_SCHEMA)
+
+    def upsert(self, meta: Dict[str, Any]):
+        """
+        Insert or update a ticker's entry
+
+        Args:
+            meta: Store metadata (ticker, first_date, last_date, rows,
+                schema_version, checksum, last_refresh[, requested_start])
+        """
+        entry = {column: meta.get(column) for column in CATALOG_COLUMNS}
+        entry["ticker"] = meta["ticker"].upper()
+        entry["updated_at"] = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"""
+                INSERT INTO tickers ({", ".join(CATALOG_COLUMNS)})
+                VALUES ({", ".join(":" + c for c in CATALOG_COLUMNS)})
+                ON CONFLICT(ticker) DO UPDATE SET
+                    first_date = excluded.first_date,
+                    last_date = excluded.last_date,
+                    rows = excluded.rows,
+                    schema_version = excluded.schema_version,
+                    checksum = excluded.checksum,
+                    last_refresh = excluded.last_refresh,
+                    requested_start = COALESCE(
+                        MIN(excluded.requested_start, tickers.requested_start),
+                        excluded.requested_start, tickers.requested_start),
+                    updated_at = excluded.updated_at
+                """, entry)
+
+    def mark_requested(self, ticker: str, start_date: str):
+        """Record that history from start_date onwards has been fetched"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                UPDATE tickers SET requested_start = COALESCE(
+                    MIN(:start, requested_start), :start)
+                WHERE ticker = :ticker
+                """, {"ticker": ticker.upper(), "start": start_date})
+
+    def get(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Entry for ticker or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM tickers WHERE ticker = ?",
+                (ticker.upper(),)).fetchone()
+        return dict(row) if row is not None else None
+
+    def all(self) -> List[Dict[str, Any]]:
+        """All entries ordered by ticker"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM tickers ORDER BY ticker").fetchall()
+        return [dict(row) for row in rows]
+
+    def tickers(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT ticker FROM tickers ORDER BY ticker")]
+
+    def remove(self, ticker: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM tickers WHERE ticker = ?", (ticker.upper(),))
+
+    def covers(self, ticker: str, start_date: str = None,
+               end_date: str = None) -> bool:
+        """
+        Whether the cached range (or what was requested before) spans
+        [start_date, end_date]
+
+        Dates are YYYY-MM-DD strings, so the comparison is a string
+        comparison on one row.
+        """
+        entry = self.get(ticker)
+        if entry is None or entry["last_date"] is None:
+            return False
+        if start_date:
+            earliest = min(d for d in (entry["first_date"], entry["requested_start"]) if d)
+            if start_date[:10] < earliest:
+                return False
+        if end_date and end_date[:10] > entry["last_date"]:
+            return False
+        return True
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals across the catalog"""
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT COUNT(*) AS tickers, COALESCE(SUM(rows), 0) AS rows,
+                       MIN(first_date) AS first_date, MAX(last_date) AS last_date,
+                       MIN(last_refresh) AS oldest_refresh
+                FROM tickers
+                """).fetchone()
+        return dict(row)
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,538 @@
+"""
+Columnar OHLCV Store for Backtest Engine
+Memory-mapped NumPy partitions (one file per ticker per year) that replace
+the per-ticker CSV cache. Date-range reads only touch the partitions that
+overlap the request and slice them with a binary search.
+
+Layout:
+    {root}/{TICKER}/{YEAR}.npy   structured array with OHLCV_DTYPE
+
+Migrate an existing CSV cache with:
+    python -m services.backtest_engine.columnar_store migrate --cache-dir ./data/historical
+"""
+from shared.utils.errors import DataFetchError
+from shared.utils.logger import get_logger
+import numpy as np
+import pandas as pd
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+# Add shared utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+logger = get_logger("columnar-store")
+
+# Typed on-disk schema. Timestamps are int64 nanoseconds since epoch
+# (tz-naive exchange dates), so a partition can be searched without parsing.
+OHLCV_DTYPE = np.dtype([
+    ('ts', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<i8'),
+])
+
+# Bumped whenever OHLCV_DTYPE, the partition layout or the meta format
+# changes (2: per-partition digests)
+SCHEMA_VERSION = 2
+
+# DataFrame column -> store field
+COLUMN_MAP = {
+    'Open': 'open',
+    'High': 'high',
+    'Low': 'low',
+    'Close': 'close',
+    'Volume': 'volume',
+}
+
+
+def normalize_ohlcv(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coerce a yfinance/CSV frame into the canonical OHLCV layout
+
+    Handles the MultiIndex columns returned by newer yfinance versions,
+    tz-aware indexes and the extra header rows written by ``to_csv``.
+
+    Args:
+        data: Raw OHLCV DataFrame
+
+    Returns:
+        DataFrame indexed by a sorted, unique, tz-naive DatetimeIndex with
+        float64 Open/High/Low/Close and int64 Volume columns
+    """
+    df = data.copy()
+
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+
+    missing = [c for c in ('Open', 'High', 'Low', 'Close') if c not in df.columns]
+    if missing:
+        raise DataFetchError(f"OHLCV data missing columns: {missing}")
+    if 'Volume' not in df.columns:
+        df['Volume'] = 0
+
+    index = df.index
+    if not isinstance(index, pd.DatetimeIndex):
+        # CSV caches carry string dates plus yfinance header rows
+        # ("Ticker", "Date") that coerce to NaT and are dropped below
+        index = pd.to_datetime(index, errors='coerce', format='ISO8601')
+    if getattr(index, 'tz', None) is not None:
+        index = index.tz_localize(None)
+    df.index = index
+    df = df[df.index.notna()]
+
+    df = df[list(COLUMN_MAP)]
+    for col in ('Open', 'High', 'Low', 'Close'):
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    df['Volume'] = pd.to_numeric(
+        df['Volume'], errors='coerce').fillna(0).astype('int64')
+    df = df.dropna(subset=['Close'])
+
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    df.index.name = 'Date'
+    return df
+
+
+def read_legacy_csv(path: str) -> pd.DataFrame:
+    """
+    Read a CSV written by the old DataLoader cache
+
+    Args:
+        path: Path to {ticker}.csv
+
+    Returns:
+        Normalized OHLCV DataFrame
+    """
+    raw = pd.read_csv(path, index_col=0)
+    return normalize_ohlcv(raw)
+
+
+class ColumnarStore:
+    """
+    Ticker/year partitioned OHLCV store backed by memory-mapped .npy files
+    """
+
+    def __init__(self, root_dir: str = "./data/historical/columnar",
+                 catalog=None):
+        """
+        Initialize columnar store
+
+        Args:
+            root_dir: Directory holding one sub-directory per ticker
+            catalog: Optional DataCatalog kept in sync with every write
+        """
+        self.root_dir = root_dir
+        self.catalog = catalog
+        os.makedirs(root_dir, exist_ok=True)
+
+    def _ticker_dir(self, ticker: str) -> str:
+        return os.path.join(self.root_dir, ticker.upper())
+
+    def _partition_path(self, ticker: str, year: int) -> str:
+        return os.path.join(self._ticker_dir(ticker), f"{year}.npy")
+
+    def list_years(self, ticker: str) -> List[int]:
+        """Years with a partition on disk for ticker, ascending"""
+        ticker_dir = self._ticker_dir(ticker)
+        if not os.path.isdir(ticker_dir):
+            return []
+        years = []
+        for name in os.listdir(ticker_dir):
+            stem, ext = os.path.splitext(name)
+            if ext == '.npy' and stem.isdigit():
+                years.append(int(stem))
+        return sorted(years)
+
+    def list_tickers(self) -> List[str]:
+        """Tickers with at least one partition"""
+        return sorted(
+            name for name in os.listdir(self.root_dir)
+            if self.list_years(name))
+
+    def has_ticker(self, ticker: str) -> bool:
+        """Whether any partition exists for ticker"""
+        return bool(self.list_years(ticker))
+
+    @staticmethod
+    def to_records(data: pd.DataFrame) -> np.ndarray:
+        """Convert a normalized OHLCV frame to a structured array"""
+        records = np.empty(len(data), dtype=OHLCV_DTYPE)
+        records['ts'] = data.index.values.astype('datetime64[ns]').view('i8')
+        for col, field in COLUMN_MAP.items():
+            records[field] = data[col].to_numpy()
+        return records
+
+    @staticmethod
+    def to_frame(records: np.ndarray, ticker: str = None) -> pd.DataFrame:
+        """Convert a structured array back to an OHLCV DataFrame"""
+        index = pd.DatetimeIndex(
+            records['ts'].astype('datetime64[ns]'), name='Date')
+        data = pd.DataFrame(
+            {col: np.asarray(records[field]) for col, field in COLUMN_MAP.items()},
+            index=index)
+        if ticker is not None:
+            data['Ticker'] = ticker
+        return data
+
+    def _meta_path(self, ticker: str) -> str:
+        return os.path.join(self._ticker_dir(ticker), "_meta.json")
+
+    def _write_partition(self, ticker: str, year: int, records: np.ndarray):
+        """Atomically replace one year partition"""
+        path = self._partition_path(ticker, year)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, records, allow_pickle=False)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _split_by_year(records: np.ndarray):
+        """Yield (year, chunk) for a sorted structured array"""
+        if not len(records):
+            return
+        years = records['ts'].astype('datetime64[ns]').astype(
+            'datetime64[Y]').astype('i8') + 1970
+        boundaries = np.flatnonzero(np.diff(years)) + 1
+        starts = np.concatenate(([0], boundaries))
+        for first, chunk in zip(starts, np.split(records, boundaries)):
+            yield int(years[first]), chunk
+
+    def _partition_info(self, ticker: str, year: int) -> Dict[str, Any]:
+        """Row count, first/last ts and blake2b digest of one partition"""
+        path = self._partition_path(ticker, year)
+        stat = os.stat(path)
+        part = np.load(path, mmap_mode='r')
+        return {
+            "rows": len(part),
+            "first_ts": int(part['ts'][0]) if len(part) else None,
+            "last_ts": int(part['ts'][-1]) if len(part) else None,
+            "digest": hashlib.blake2b(part.tobytes(), digest_size=16).hexdigest(),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    def _write_meta(self, ticker: str, refreshed_at: datetime = None,
+                    changed: Set[int] = None):
+        """
+        Record coverage and freshness for ticker
+
+        Written after the partitions, so last_date never points past data
+        that is actually on disk. Each partition's digest is kept in the
+        meta and only the changed years are re-read and hashed; the
+        checksum combines the partition digests in year order.
+
+        Args:
+            changed: Years rewritten since the last meta (default: all).
+                Partitions whose size or mtime no longer match their
+                recorded entry are rehashed as well.
+        """
+        previous = {}
+        if changed is not None and os.path.exists(self._meta_path(ticker)):
+            with open(self._meta_path(ticker), 'r') as f:
+                old = json.load(f)
+            if old.get("schema_version") == SCHEMA_VERSION:
+                previous = old.get("partitions", {})
+
+        partitions = {}
+        for year in self.list_years(ticker):
+            info = previous.get(str(year))
+            if info is not None and year not in changed:
+                stat = os.stat(self._partition_path(ticker, year))
+                if (stat.st_size, stat.st_mtime_ns) != (info["size"], info["mtime_ns"]):
+                    info = None
+            if info is None or year in changed:
+                info = self._partition_info(ticker, year)
+            partitions[str(year)] = info
+
+        filled = [p for p in partitions.values() if p["rows"]]
+        first_ts = filled[0]["first_ts"] if filled else None
+        last_ts = filled[-1]["last_ts"] if filled else None
+        digest = hashlib.blake2b(digest_size=16)
+        for part in filled:
+            digest.update(bytes.fromhex(part["digest"]))
+
+        meta = {
+            "ticker": ticker.upper(),
+            "first_date": str(pd.Timestamp(first_ts).date()) if first_ts is not None else None,
+            "last_date": str(pd.Timestamp(last_ts).date()) if last_ts is not None else None,
+            "rows": sum(p["rows"] for p in filled),
+            "schema_version": SCHEMA_VERSION,
+            "checksum": digest.hexdigest(),
+            "last_refresh": (refreshed_at or datetime.now()).isoformat(),
+            "partitions": partitions,
+        }
+        path = self._meta_path(ticker)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+        if self.catalog is not None:
+            self.catalog.upsert(meta)
+        return meta
+
+    def read_meta(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Coverage and freshness metadata for ticker
+
+        Returns:
+            dict with first_date, last_date, rows, schema_version,
+            checksum, last_refresh and per-partition entries, or None
+        """
+        path = self._meta_path(ticker)
+        if not os.path.exists(path):
+            if not self.has_ticker(ticker):
+                return None
+            return self._write_meta(ticker)
+        with open(path, 'r') as f:
+            meta = json.load(f)
+        if meta.get("schema_version") != SCHEMA_VERSION:
+            # Written by an older meta format: rebuild from the partitions
+            meta = self._write_meta(
+                ticker, datetime.fromisoformat(meta["last_refresh"]))
+        return meta
+
+    def touch(self, ticker: str, refreshed_at: datetime = None):
+        """Mark ticker as refreshed without changing its data"""
+        return self._write_meta(ticker, refreshed_at, changed=set())
+
+    def write(
+            self,
+            ticker: str,
+            data: pd.DataFrame,
+            refreshed_at: datetime = None) -> int:
+        """
+        Replace all stored data for ticker
+
+        Args:
+            ticker: Stock ticker symbol
+            data: OHLCV DataFrame (yfinance or CSV layout)
+            refreshed_at: When the data was fetched (default: now)
+
+        Returns:
+            Number of rows written
+        """
+        records = self.to_records(normalize_ohlcv(data))
+        os.makedirs(self._ticker_dir(ticker), exist_ok=True)
+
+        new_years = set()
+        for year, chunk in self._split_by_year(records):
+            self._write_partition(ticker, year, chunk)
+            new_years.add(year)
+
+        # Drop partitions that are no longer covered
+        for year in self.list_years(ticker):
+            if year not in new_years:
+                os.remove(self._partition_path(ticker, year))
+
+        self._write_meta(ticker, refreshed_at, changed=new_years)
+        logger.info("Wrote columnar partitions", ticker=ticker,
+                    rows=len(records), partitions=len(new_years))
+        return len(records)
+
+    def append(
+            self,
+            ticker: str,
+            data: pd.DataFrame,
+            refreshed_at: datetime = None) -> int:
+        """
+        Merge new bars into the tail partitions of ticker
+
+        Only the year partitions touched by ``data`` are rewritten. Bars
+        that already exist are replaced by the incoming version, so the
+        last (possibly partial) bar can be re-fetched safely.
+
+        Args:
+            ticker: Stock ticker symbol
+            data: OHLCV DataFrame with the new bars
+            refreshed_at: When the data was fetched (default: now)
+
+        Returns:
+            Number of bars that were not stored before
+        """
+        return self.append_records(
+            ticker, self.to_records(normalize_ohlcv(data)), refreshed_at)
+
+    def append_records(
+            self,
+            ticker: str,
+            records: np.ndarray,
+            refreshed_at: datetime = None) -> int:
+        """
+        Merge already-normalized records (OHLCV_DTYPE, sorted by ts)
+
+        Same semantics as append() without the DataFrame round trip; used
+        by writers that produce records directly, such as the stream sink.
+
+        Returns:
+            Number of bars that were not stored before
+        """
+        os.makedirs(self._ticker_dir(ticker), exist_ok=True)
+
+        added = 0
+        changed = set()
+        for year, chunk in self._split_by_year(records):
+            path = self._partition_path(ticker, year)
+            if os.path.exists(path):
+                existing = np.load(path)
+                overlap = np.isin(existing['ts'], chunk['ts'])
+                added += len(chunk) - int(overlap.sum())
+                merged = np.concatenate([existing[~overlap], chunk])
+                merged = merged[np.argsort(merged['ts'], kind='stable')]
+            else:
+                added += len(chunk)
+                merged = chunk
+            self._write_partition(ticker, year, merged)
+            changed.add(year)
+
+        self._write_meta(ticker, refreshed_at, changed=changed)
+        logger.debug("Appended bars to columnar store",
+                     ticker=ticker, rows_added=added)
+        return added
+
+    def read_records(
+            self,
+            ticker: str,
+            start_date: str = None,
+            end_date: str = None) -> Optional[np.ndarray]:
+        """
+        Read raw records for a date range (both ends inclusive)
+
+        Only partitions overlapping [start_date, end_date] are opened and
+        each is sliced with searchsorted on the memory-mapped timestamps.
+
+        Args:
+            ticker: Stock ticker symbol
+            start_date: Start date (YYYY-MM-DD), optional
+            end_date: End date (YYYY-MM-DD), optional
+
+        Returns:
+            Structured array (a copy) or None if ticker is not stored
+        """
+        years = self.list_years(ticker)
+        if not years:
+            return None
+
+        start = pd.Timestamp(start_date) if start_date else None
+        end = pd.Timestamp(end_date) if end_date else None
+        if start is not None:
+            years = [y for y in years if y >= start.year]
+        if end is not None:
+            years = [y for y in years if y <= end.year]
+
+        chunks = []
+        for year in years:
+            part = np.load(self._partition_path(ticker, year), mmap_mode='r')
+            ts = part['ts']
+            lo = int(np.searchsorted(ts, start.value, side='left')) \
+                if start is not None else 0
+            hi = int(np.searchsorted(ts, end.value, side='right')) \
+                if end is not None else len(ts)
+            if hi > lo:
+                chunks.append(np.array(part[lo:hi]))
+
+        if not chunks:
+            return np.empty(0, dtype=OHLCV_DTYPE)
+        return np.concatenate(chunks)
+
+    def read(
+            self,
+            ticker: str,
+            start_date: str = None,
+            end_date: str = None) -> Optional[pd.DataFrame]:
+        """
+        Read an OHLCV DataFrame for a date range (both ends inclusive)
+
+        Args:
+            ticker: Stock ticker symbol
+            start_date: Start date (YYYY-MM-DD), optional
+            end_date: End date (YYYY-MM-DD), optional
+
+        Returns:
+            DataFrame or None if ticker is not stored
+        """
+        records = self.read_records(ticker, start_date, end_date)
+        if records is None:
+            return None
+        return self.to_frame(records, ticker)
+
+    def delete(self, ticker: str):
+        """Remove all partitions for ticker"""
+        for year in self.list_years(ticker):
+            os.remove(self._partition_path(ticker, year))
+        if os.path.exists(self._meta_path(ticker)):
+            os.remove(self._meta_path(ticker))
+        if self.catalog is not None:
+            self.catalog.remove(ticker)
+
+
+def migrate_csv_cache(
+        cache_dir: str = "./data/historical",
+        store: ColumnarStore = None,
+        remove_csv: bool = False) -> Dict[str, Any]:
+    """
+    Convert every {ticker}.csv in cache_dir into columnar partitions
+
+    Args:
+        cache_dir: Directory holding legacy CSV files
+        store: Target store (default: {cache_dir}/columnar)
+        remove_csv: Delete each CSV after a successful conversion
+
+    Returns:
+        Summary with migrated tickers, row counts and failures
+    """
+    if store is None:
+        store = ColumnarStore(os.path.join(cache_dir, "columnar"))
+
+    migrated = {}
+    failed = {}
+    for path in sorted(glob.glob(os.path.join(cache_dir, "*.csv"))):
+        ticker = os.path.splitext(os.path.basename(path))[0]
+        try:
+            rows = store.write(
+                ticker, read_legacy_csv(path),
+                refreshed_at=datetime.fromtimestamp(os.path.getmtime(path)))
+            migrated[ticker] = rows
+            if remove_csv:
+                os.remove(path)
+        except Exception as e:
+            logger.error(f"Failed to migrate {ticker}",
+                         ticker=ticker, error=str(e))
+            failed[ticker] = str(e)
+
+    logger.info("CSV cache migration complete",
+                migrated=len(migrated), failed=len(failed))
+    return {"migrated": migrated, "failed": failed}
+
+
+def main(argv: List[str] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        description="Titan columnar OHLCV store utilities")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate = subparsers.add_parser(
+        "migrate", help="Convert legacy {ticker}.csv caches to columnar")
+    migrate.add_argument("--cache-dir", default="./data/historical")
+    migrate.add_argument("--remove-csv", action="store_true",
+                         help="Delete CSV files after conversion")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        summary = migrate_csv_cache(args.cache_dir, remove_csv=args.remove_csv)
+        for ticker, rows in summary["migrated"].items():
+            print(f"  ✅ {ticker}: {rows} rows")
+        for ticker, error in summary["failed"].items():
+            print(f"  ❌ {ticker}: {error}")
+        return 0 if not summary["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
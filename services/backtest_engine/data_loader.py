@@ -3,13 +3,22 @@ Historical Data Loader for Backtest Engine
 Downloads and caches 5 years of OHLCV data from yfinance
 Month 3 Week 2
 """
+from .catalog import DataCatalog
+from .columnar_store import ColumnarStore, normalize_ohlcv, read_legacy_csv
+from .intraday_store import IntradayStore
+from shared.utils.cache import ByteLRUCache
 from shared.utils.errors import DataFetchError
 from shared.utils.logger import get_logger
-import yfinance as yf
+from services.ingestion_engine.connectors.yfinance_connector import YFinanceSource
+from services.ingestion_engine.connectors.replay import source_from_env
+import numpy as np
 import pandas as pd
+import argparse
 import os
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence, Union
 import sys
 
 # Add shared utils to path
@@ -23,15 +32,35 @@ class DataLoader:
     Loads and caches historical market data
     """
 
-    def __init__(self, cache_dir="./data/historical"):
+    def __init__(self, cache_dir="./data/historical",
+                 max_cache_age_hours: float = 24,
+                 frame_cache_bytes: int = 256 * 1024 * 1024,
+                 source=None):
         """
         Initialize data loader
 
         Args:
             cache_dir: Directory to cache downloaded data
+            max_cache_age_hours: Refresh the cache tail when get_data asks
+                for recent bars and the last refresh is older than this
+                (None disables automatic refresh)
+            frame_cache_bytes: Memory budget of the in-process per-ticker
+                history cache used by get_data and point lookups
+            source: Object with download_range(tickers, start, end, **kw)
+                returning a yf.download frame (default: YFinanceSource,
+                wrapped for record/replay when TITAN_REPLAY is set)
         """
         self.cache_dir = cache_dir
         os.makedirs(cache_dir, exist_ok=True)
+        self.catalog = DataCatalog(os.path.join(cache_dir, "catalog.sqlite"))
+        self.store = ColumnarStore(
+            os.path.join(cache_dir, "columnar"), catalog=self.catalog)
+        self.intraday = IntradayStore(os.path.join(cache_dir, "intraday"))
+        self.max_cache_age = timedelta(
+            hours=max_cache_age_hours) if max_cache_age_hours else None
+        # ticker -> (full-history records, monotonic load time)
+        self.frames = ByteLRUCache(frame_cache_bytes)
+        self.source = source or source_from_env(YFinanceSource())
         logger.info("DataLoader initialized", cache_dir=cache_dir)
 
     def download_historical_data(
@@ -67,26 +96,25 @@ class DataLoader:
                         ticker=ticker, start=start_date, end=end_date)
 
             # Download from yfinance
-            data = yf.download(
-                ticker,
-                start=start_date,
-                end=end_date,
-                progress=False)
+            data = self.source.download_range(
+                ticker, start=start_date, end=end_date)
 
             if data.empty:
                 raise DataFetchError(f"No data returned for {ticker}")
 
-            # Add ticker column
+            # Flatten yfinance columns and add ticker column
+            data = normalize_ohlcv(data)
             data['Ticker'] = ticker
 
-            # Cache to CSV if requested
+            # Cache to columnar store if requested
             if cache:
-                cache_file = os.path.join(self.cache_dir, f"{ticker}.csv")
-                data.to_csv(cache_file)
+                rows = self.store.write(ticker, data)
+                self.catalog.mark_requested(ticker, start_date)
+                self.frames.pop(ticker.upper())
                 logger.info(
-                    f"Cached data to {cache_file}",
+                    f"Cached data to columnar store",
                     ticker=ticker,
-                    rows=len(data))
+                    rows=rows)
 
             logger.info(f"Downloaded {len(data)} days of data", ticker=ticker)
             return data
@@ -96,24 +124,50 @@ class DataLoader:
                 f"Failed to download data for {ticker}: {
                     str(e)}")
 
-    def load_cached_data(self, ticker: str) -> Optional[pd.DataFrame]:
+    def _ensure_stored(self, ticker: str) -> bool:
+        """
+        Whether ticker is in the columnar store, migrating a legacy
+        {ticker}.csv cache on first access
+        """
+        if self.store.has_ticker(ticker):
+            return True
+
+        cache_file = os.path.join(self.cache_dir, f"{ticker}.csv")
+        if not os.path.exists(cache_file):
+            logger.warning(f"No cache found for {ticker}", ticker=ticker)
+            return False
+
+        self.store.write(
+            ticker, read_legacy_csv(cache_file),
+            refreshed_at=datetime.fromtimestamp(os.path.getmtime(cache_file)))
+        logger.info(f"Migrated CSV cache to columnar store", ticker=ticker)
+        return True
+
+    def load_cached_data(
+            self,
+            ticker: str,
+            start_date: str = None,
+            end_date: str = None) -> Optional[pd.DataFrame]:
         """
         Load data from cache
 
+        Reads only the year partitions overlapping the requested range.
+        A legacy {ticker}.csv cache is converted to the columnar store on
+        first access.
+
         Args:
             ticker: Stock ticker symbol
+            start_date: Start date (YYYY-MM-DD), optional
+            end_date: End date (YYYY-MM-DD), optional
 
         Returns:
             DataFrame or None if not cached
         """
         try:
-            cache_file = os.path.join(self.cache_dir, f"{ticker}.csv")
-
-            if not os.path.exists(cache_file):
-                logger.warning(f"No cache found for {ticker}", ticker=ticker)
+            if not self._ensure_stored(ticker):
                 return None
 
-            data = pd.read_csv(cache_file, index_col=0, parse_dates=True)
+            data = self.store.read(ticker, start_date, end_date)
             logger.info(f"Loaded cached data", ticker=ticker, rows=len(data))
             return data
 
@@ -134,6 +188,10 @@ class DataLoader:
         """
         Get historical data (from cache if available, otherwise download)
 
+        If the catalog shows the cache starts after start_date, the missing
+        head is fetched and merged first instead of returning a truncated
+        slice.
+
         Args:
             ticker: Stock ticker symbol
             start_date: Start date
@@ -143,22 +201,368 @@ class DataLoader:
         Returns:
             DataFrame with OHLCV data
         """
-        # Try cache first
+        # Try the in-memory history, then the store
         if use_cache:
-            cached_data = self.load_cached_data(ticker)
-            if cached_data is not None:
-                # Filter by date range if specified
-                if start_date or end_date:
-                    if start_date:
-                        cached_data = cached_data[cached_data.index >= start_date]
-                    if end_date:
-                        cached_data = cached_data[cached_data.index <= end_date]
-                return cached_data
+            if start_date and self.coverage(ticker) is not None and \
+                    not self.catalog.covers(ticker, start_date):
+                self.backfill(ticker, start_date)
+            records = self.get_records(ticker, start_date, end_date)
+            if records is not None:
+                return ColumnarStore.to_frame(records, ticker)
 
         # Download if cache miss
         return self.download_historical_data(
             ticker, start_date, end_date, cache=True)
 
+    def is_stale(self, ticker: str, end_date: str = None) -> bool:
+        """
+        Whether the cached tail should be refreshed before serving a request
+
+        Args:
+            ticker: Stock ticker symbol
+            end_date: Requested end date (None means "up to today")
+
+        Returns:
+            True if the last refresh is older than max_cache_age and the
+            request reaches past the last cached bar
+        """
+        if self.max_cache_age is None:
+            return False
+
+        meta = self.coverage(ticker)
+        if meta is None or meta.get("last_date") is None:
+            return False
+
+        last_refresh = datetime.fromisoformat(meta["last_refresh"])
+        if datetime.now() - last_refresh < self.max_cache_age:
+            return False
+
+        if end_date is None:
+            return True
+        return pd.Timestamp(end_date) > pd.Timestamp(meta["last_date"])
+
+    def coverage(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Catalog entry for ticker (first/last date, rows, checksum, ...)
+
+        Tickers stored before the catalog existed are registered from
+        their partition metadata on first use.
+
+        Returns:
+            dict or None if the ticker is not cached
+        """
+        entry = self.catalog.get(ticker)
+        if entry is None:
+            meta = self.store.read_meta(ticker)
+            if meta is None:
+                return None
+            self.catalog.upsert(meta)
+            entry = self.catalog.get(ticker)
+        return entry
+
+    def backfill(self, ticker: str, start_date: str) -> int:
+        """
+        Fetch bars from start_date up to the first cached bar
+
+        The request runs through the first cached bar, so a working source
+        always returns data. The catalog only records start_date as covered
+        when it does; an empty or failed response (yfinance returns an
+        empty frame on network errors) is retried on the next request.
+
+        Args:
+            ticker: Stock ticker symbol
+            start_date: New earliest date (YYYY-MM-DD)
+
+        Returns:
+            Number of bars added
+        """
+        entry = self.coverage(ticker)
+        logger.info("Backfilling history", ticker=ticker,
+                    start=start_date, end=entry["first_date"])
+        # yfinance treats end as exclusive
+        end = str((pd.Timestamp(entry["first_date"]) + pd.Timedelta(days=1)).date())
+        try:
+            data = self.source.download_range(ticker, start=start_date, end=end)
+        except Exception as e:
+            logger.warning(f"Backfill failed for {ticker}",
+                           ticker=ticker, error=str(e))
+            return 0
+        if data is None or data.empty:
+            logger.warning(f"Backfill returned no data for {ticker}",
+                           ticker=ticker, start=start_date)
+            return 0
+
+        added = self.store.append(
+            ticker, data,
+            refreshed_at=datetime.fromisoformat(entry["last_refresh"]))
+        self.frames.pop(ticker.upper())
+        # Data may still start after start_date (e.g. an IPO): nothing older
+        # exists, so remember the request
+        self.catalog.mark_requested(ticker, start_date)
+        return added
+
+    def refresh(self, ticker: str) -> Dict[str, Any]:
+        """
+        Incrementally refresh cached data for one ticker
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            Refresh summary (see refresh_many)
+        """
+        return self.refresh_many([ticker])[ticker]
+
+    def refresh_many(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch only the bars missing since the last cached date
+
+        Tickers that share a last cached date are fetched with one batched
+        yfinance request. The last cached bar is re-fetched and overwritten
+        in case it was a partial session. Tickers without a cache get a
+        full download.
+
+        Args:
+            tickers: Stock ticker symbols
+
+        Returns:
+            dict mapping ticker -> {status, mode, rows_added, last_date}
+        """
+        results = {}
+        groups = defaultdict(list)
+
+        for ticker in tickers:
+            meta = self.coverage(ticker)
+            if meta is None or meta.get("last_date") is None:
+                try:
+                    data = self.download_historical_data(ticker, cache=True)
+                    results[ticker] = {
+                        "status": "success",
+                        "mode": "full",
+                        "rows_added": len(data),
+                        "last_date": str(data.index[-1].date())
+                    }
+                except DataFetchError as e:
+                    results[ticker] = {"status": "error", "message": str(e)}
+            else:
+                groups[meta["last_date"]].append(ticker)
+
+        end_date = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+
+        for start_date, group in groups.items():
+            logger.info("Incremental refresh", tickers=len(group),
+                        start=start_date, end=end_date)
+            try:
+                data = self.source.download_range(
+                    group, start=start_date, end=end_date)
+            except Exception as e:
+                for ticker in group:
+                    results[ticker] = {"status": "error", "message": str(e)}
+                continue
+
+            refreshed_at = datetime.now()
+            for ticker in group:
+                self.frames.pop(ticker.upper())
+                try:
+                    frame = self._extract_ticker(data, ticker, len(group))
+                    if frame is None or frame.empty:
+                        meta = self.store.touch(ticker, refreshed_at)
+                        rows_added = 0
+                    else:
+                        rows_added = self.store.append(
+                            ticker, frame, refreshed_at)
+                        meta = self.catalog.get(ticker)
+                    results[ticker] = {
+                        "status": "success",
+                        "mode": "incremental",
+                        "rows_added": rows_added,
+                        "last_date": meta["last_date"]
+                    }
+                except Exception as e:
+                    logger.warning(f"Failed to refresh {ticker}",
+                                   ticker=ticker, error=str(e))
+                    results[ticker] = {"status": "error", "message": str(e)}
+
+        return results
+
+    @staticmethod
+    def _extract_ticker(
+            data: pd.DataFrame,
+            ticker: str,
+            group_size: int) -> Optional[pd.DataFrame]:
+        """Pull one ticker out of a (possibly batched) yf.download frame"""
+        if data is None or data.empty:
+            return None
+        if isinstance(data.columns, pd.MultiIndex):
+            level = data.columns.nlevels - 1
+            if ticker not in data.columns.get_level_values(level):
+                return None
+            frame = data.xs(ticker, axis=1, level=level)
+        elif group_size == 1:
+            frame = data
+        else:
+            return None
+        return frame.dropna(how='all')
+
+    def get_records(
+            self,
+            ticker: str,
+            start_date: str = None,
+            end_date: str = None) -> Optional[np.ndarray]:
+        """
+        Cached full history for ticker, sliced to a date range
+
+        The whole history is loaded once into the in-memory cache (sorted
+        int64 epoch-ns 'ts' field) and served from there until
+        max_cache_age has passed, when the store freshness is re-checked.
+
+        Args:
+            ticker: Stock ticker symbol
+            start_date: Start date (YYYY-MM-DD), optional
+            end_date: End date (YYYY-MM-DD), optional
+
+        Returns:
+            Structured OHLCV records (read-only view) or None if the ticker
+            is not cached on disk
+        """
+        key = ticker.upper()
+        entry = self.frames.get(key)
+        max_age = self.max_cache_age.total_seconds() if self.max_cache_age else None
+        if entry is None or (max_age is not None and
+                             time.monotonic() - entry[1] > max_age):
+            try:
+                if not self._ensure_stored(ticker):
+                    return None
+                if self.is_stale(ticker, end_date):
+                    self.refresh(ticker)
+                records = self.store.read_records(ticker)
+            except Exception as e:
+                logger.error(f"Failed to load cache: {str(e)}",
+                             ticker=ticker, error=str(e))
+                return None
+            records.flags.writeable = False
+            entry = (records, time.monotonic())
+            self.frames.put(key, entry, records.nbytes)
+
+        records = entry[0]
+        ts = records['ts']
+        lo = int(np.searchsorted(ts, pd.Timestamp(start_date).value, side='left')) \
+            if start_date else 0
+        hi = int(np.searchsorted(ts, pd.Timestamp(end_date).value, side='right')) \
+            if end_date else len(ts)
+        return records[lo:hi]
+
+    def get_prices_at_dates(
+            self,
+            tickers: Union[str, Sequence[str]],
+            dates: Sequence,
+            field: str = 'close') -> np.ndarray:
+        """
+        Vectorized point lookups for many (ticker, date) pairs
+
+        Each date resolves to the first bar on or after it (same rule as
+        get_price_at_date). Pairs are grouped by ticker and resolved with a
+        single searchsorted per ticker.
+
+        Args:
+            tickers: One ticker for all dates, or one ticker per date
+            dates: Dates (strings, Timestamps or datetime64)
+            field: Record field to return (open/high/low/close/volume)
+
+        Returns:
+            float array aligned with dates; NaN past the last cached bar
+
+        Raises:
+            DataFetchError: If a ticker has no data
+        """
+        targets = pd.to_datetime(np.asarray(dates)).as_unit('ns').asi8
+        if isinstance(tickers, str):
+            codes = np.zeros(len(targets), dtype=np.intp)
+            uniques = [tickers]
+        else:
+            if len(tickers) != len(targets):
+                raise ValueError("tickers and dates must have the same length")
+            codes, uniques = pd.factorize(np.asarray(tickers))
+
+        out = np.full(len(targets), np.nan)
+        for code, ticker in enumerate(uniques):
+            records = self.load_history(ticker)
+            mask = codes == code
+            positions = np.searchsorted(records['ts'], targets[mask], side='left')
+            found = positions < len(records)
+            values = np.full(len(positions), np.nan)
+            values[found] = records[field][positions[found]]
+            out[mask] = values
+        return out
+
+    def get_price_matrix(
+            self,
+            tickers: Sequence[str],
+            start_date: str = None,
+            end_date: str = None,
+            field: str = 'close') -> pd.DataFrame:
+        """
+        Align many tickers into one dense (dates x tickers) matrix
+
+        Dates are the union of all tickers' bars; a ticker without a bar
+        on a date is NaN there. Values are scattered into a single float64
+        block in one vectorized assignment.
+
+        Args:
+            tickers: Stock ticker symbols
+            start_date: Start date (YYYY-MM-DD), optional
+            end_date: End date (YYYY-MM-DD), optional
+            field: Record field (open/high/low/close/volume)
+
+        Returns:
+            DataFrame indexed by date with one column per ticker that has
+            data (tickers that cannot be loaded are left out)
+        """
+        loaded = {}
+        for ticker in dict.fromkeys(t.upper() for t in tickers):
+            try:
+                records = self.get_records(ticker, start_date, end_date)
+                if records is None:
+                    self.download_historical_data(ticker, start_date, end_date)
+                    records = self.get_records(ticker, start_date, end_date)
+            except DataFetchError as e:
+                logger.warning(f"No data for {ticker}", ticker=ticker, error=str(e))
+                continue
+            if records is not None and len(records):
+                loaded[ticker] = records
+
+        names = list(loaded)
+        ts = np.concatenate([loaded[t]['ts'] for t in names]) if names \
+            else np.empty(0, dtype=np.int64)
+        dates = np.unique(ts)
+        matrix = np.full((len(dates), len(names)), np.nan)
+        if names:
+            column = np.repeat(np.arange(len(names)),
+                               [len(loaded[t]) for t in names])
+            values = np.concatenate([loaded[t][field] for t in names])
+            matrix[np.searchsorted(dates, ts), column] = values
+        return pd.DataFrame(matrix, columns=names, copy=False, index=pd.DatetimeIndex(
+            dates.astype('datetime64[ns]'), name='Date'))
+
+    def load_history(self, ticker: str) -> np.ndarray:
+        """
+        Cached full history for ticker, downloading it on a cache miss
+
+        Returns:
+            Structured OHLCV records (read-only view)
+        """
+        records = self.get_records(ticker)
+        if records is None:
+            self.download_historical_data(ticker, cache=True)
+            records = self.get_records(ticker)
+        return records
+
+    def _record_at_date(self, ticker: str, date: str) -> np.void:
+        """First cached bar on or after date"""
+        records = self.load_history(ticker)
+        target = pd.Timestamp(date).value
+        return records[np.searchsorted(records['ts'], target)]
+
     def get_price_at_date(self, ticker: str, date: str) -> float:
         """
         Get closing price at specific date
@@ -171,15 +575,10 @@ class DataLoader:
             Closing price
         """
         try:
-            data = self.get_data(ticker)
-
             # Find closest date
-            target_date = pd.to_datetime(date)
-            closest_date = data.index[data.index.searchsorted(target_date)]
+            price = self._record_at_date(ticker, date)['close']
 
-            price = data.loc[closest_date, 'Close']
-
-            logger.info(f"Price at {date}", ticker=ticker, price=price)
+            logger.debug(f"Price at {date}", ticker=ticker, price=float(price))
             return float(price)
 
         except Exception as e:
@@ -199,20 +598,15 @@ class DataLoader:
             Dictionary with OHLCV values
         """
         try:
-            data = self.get_data(ticker)
-
-            target_date = pd.to_datetime(date)
-            closest_date = data.index[data.index.searchsorted(target_date)]
-
-            row = data.loc[closest_date]
+            row = self._record_at_date(ticker, date)
 
             return {
-                'date': str(closest_date.date()),
-                'open': float(row['Open']),
-                'high': float(row['High']),
-                'low': float(row['Low']),
-                'close': float(row['Close']),
-                'volume': int(row['Volume'])
+                'date': str(pd.Timestamp(int(row['ts'])).date()),
+                'open': float(row['open']),
+                'high': float(row['high']),
+                'low': float(row['low']),
+                'close': float(row['close']),
+                'volume': int(row['volume'])
             }
 
         except Exception as e:
@@ -220,6 +614,56 @@ class DataLoader:
                 f"Failed to get OHLCV for {ticker} at {date}: {
                     str(e)}")
 
+    def download_intraday_data(self, ticker: str, period: str = "7d") -> int:
+        """
+        Download 1-minute bars and add them to the intraday store
+
+        yfinance only serves about 30 days of 1m history (7 per request),
+        so this is meant to run regularly to accumulate history.
+
+        Args:
+            ticker: Stock ticker symbol
+            period: yfinance period (max "7d" for 1m bars)
+
+        Returns:
+            Number of bars stored
+        """
+        try:
+            data = self.source.download_range(
+                ticker, period=period, interval="1m")
+            if data.empty:
+                raise DataFetchError(f"No intraday data returned for {ticker}")
+            return self.intraday.write(ticker, data)
+
+        except Exception as e:
+            raise DataFetchError(
+                f"Failed to download intraday data for {ticker}: {str(e)}",
+                ticker=ticker)
+
+    def get_intraday_data(
+            self,
+            ticker: str,
+            start_date: str = None,
+            end_date: str = None,
+            interval: str = "1m") -> Optional[pd.DataFrame]:
+        """
+        Intraday bars from the intraday store
+
+        Args:
+            ticker: Stock ticker symbol
+            start_date: First day (YYYY-MM-DD), optional
+            end_date: Last day (YYYY-MM-DD, inclusive), optional
+            interval: 1m, 5m, 15m, 30m, 1h or 1d
+
+        Returns:
+            DataFrame or None if no intraday bars are stored
+        """
+        return self.intraday.read(ticker, start_date, end_date, interval)
+
+    def frame_cache_stats(self) -> dict:
+        """Entries, bytes and evictions of the in-memory history cache"""
+        return self.frames.stats()
+
 
 # Singleton
 _data_loader = None
@@ -231,3 +675,56 @@ def get_data_loader() -> DataLoader:
     if _data_loader is None:
         _data_loader = DataLoader()
     return _data_loader
+
+
+def main(argv: List[str] = None):
+    """Command line entry point (nightly cache refresh, catalog report)"""
+    parser = argparse.ArgumentParser(
+        description="Titan historical data cache")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    refresh = subparsers.add_parser(
+        "refresh", help="Fetch only missing bars for cached tickers")
+    refresh.add_argument("tickers", nargs="*",
+                         help="Tickers to refresh (default: all cached)")
+    refresh.add_argument("--cache-dir", default="./data/historical")
+
+    catalog = subparsers.add_parser(
+        "catalog", help="Show cached tickers and their coverage")
+    catalog.add_argument("--cache-dir", default="./data/historical")
+    catalog.add_argument("--sync", action="store_true",
+                         help="Re-register every stored ticker first")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "refresh":
+        loader = DataLoader(cache_dir=args.cache_dir)
+        tickers = args.tickers or loader.store.list_tickers()
+        results = loader.refresh_many(tickers)
+        failed = 0
+        for ticker, result in results.items():
+            if result["status"] == "success":
+                print(f"  ✅ {ticker}: +{result['rows_added']} bars "
+                      f"({result['mode']}, last {result['last_date']})")
+            else:
+                failed += 1
+                print(f"  ❌ {ticker}: {result['message']}")
+        return 0 if not failed else 1
+
+    if args.command == "catalog":
+        loader = DataLoader(cache_dir=args.cache_dir)
+        if args.sync:
+            for ticker in loader.store.list_tickers():
+                loader.catalog.upsert(loader.store.read_meta(ticker))
+        for entry in loader.catalog.all():
+            print(f"  {entry['ticker']:<8} {entry['first_date']} → "
+                  f"{entry['last_date']}  {entry['rows']:>6} rows  "
+                  f"refreshed {entry['last_refresh'][:16]}  "
+                  f"{entry['checksum'][:8]}")
+        summary = loader.catalog.summary()
+        print(f"  {summary['tickers']} tickers, {summary['rows']} rows")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,568 @@
+"""
+Intraday Bar Store for Backtest Engine
+Compressed storage for minute bars (~100x the rows of daily data).
+
+Encoding (per ticker and trading day, so every day decodes on its own):
+- prices are scaled integers (price * 10**PRICE_SCALE)
+- time is the delta in seconds from the previous bar (first: from midnight)
+- close is delta-coded against the previous close, open against the
+  previous close, high/low as distances above/below the open-close body
+- signed values are zigzag-mapped; everything is LEB128 varint packed
+
+Layout:
+    {root}/{TICKER}/{YYYY-MM}.ibar
+
+Each month file stores its day chunks column by column (all time
+streams, then all close streams, ...), so a range of days is one
+contiguous byte slice per field and decodes in a single vectorized pass.
+Resampling (1m -> 5m/15m/1h/1d) runs on the decoded integer columns
+with ufunc.reduceat, without building intermediate DataFrames.
+
+append_records merges into the touched days only (the stream sink's
+incremental flushes), so a flush costs one month file copy plus the
+re-encode of the current day rather than the ticker's whole history.
+"""
+from .columnar_store import normalize_ohlcv
+from shared.utils.logger import get_logger
+import numpy as np
+import pandas as pd
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# Add shared utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+logger = get_logger("intraday-store")
+
+PRICE_SCALE = 4
+NS_PER_SECOND = 1_000_000_000
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+
+# Bar widths supported by resample, in seconds
+RESAMPLE_INTERVALS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "1d": 86_400,
+}
+
+# Encoded streams, in on-disk order
+FIELDS = ("time", "close", "open", "high", "low", "volume")
+
+_MAGIC = b"TIB1"
+_FILE_HEADER = np.dtype([('magic', 'S4'), ('chunks', '<u4'), ('scale', '<i4')])
+_CHUNK_HEADER = np.dtype([
+    ('day', '<i4'),                   # days since epoch
+    ('n', '<i4'),                     # bars in the chunk
+    ('p0', '<i8'),                    # reference price (first open, scaled)
+    ('len', '<i4', (len(FIELDS),)),   # encoded bytes per field
+])
+
+
+# ============================================================================
+# Integer codecs
+# ============================================================================
+
+def zigzag_encode(values: np.ndarray) -> np.ndarray:
+    """Map signed int64 to uint64 so small magnitudes stay small"""
+    values = values.astype(np.int64, copy=False)
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+
+def zigzag_decode(values: np.ndarray) -> np.ndarray:
+    """Inverse of zigzag_encode"""
+    values = values.astype(np.uint64, copy=False)
+    return ((values >> np.uint64(1)).view(np.int64)
+            ^ -(values & np.uint64(1)).view(np.int64))
+
+
+def varint_encode(values: np.ndarray) -> bytes:
+    """
+    LEB128-encode unsigned integers (7 bits per byte, high bit = more)
+
+    Vectorized: every value is expanded to its byte groups in one 2D
+    array and the unused groups are masked out.
+    """
+    values = np.asarray(values).astype(np.uint64, copy=False)
+    if not len(values):
+        return b""
+    nbytes = np.ones(len(values), dtype=np.int64)
+    rest = values >> np.uint64(7)
+    while rest.any():
+        nbytes += rest > 0
+        rest >>= np.uint64(7)
+
+    width = int(nbytes.max())
+    if width == 1:
+        return values.astype(np.uint8).tobytes()
+    position = np.arange(width)
+    groups = (values[:, None] >> (position.astype(np.uint64) * np.uint64(7))) \
+        & np.uint64(0x7f)
+    more = position[None, :] < (nbytes[:, None] - 1)
+    groups |= more.astype(np.uint64) << np.uint64(7)
+    return groups[position[None, :] < nbytes[:, None]].astype(np.uint8).tobytes()
+
+
+def varint_decode(data: np.ndarray) -> np.ndarray:
+    """
+    Decode a buffer of complete LEB128 varints
+
+    Args:
+        data: uint8 array
+
+    Returns:
+        uint64 array with one value per varint
+    """
+    data = np.asarray(data, dtype=np.uint8)
+    if not len(data):
+        return np.empty(0, dtype=np.uint64)
+    ends = np.flatnonzero(data < 0x80)
+    if len(ends) == len(data):
+        return data.astype(np.uint64)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts + 1
+    values = (data[starts] & 0x7f).astype(np.uint64)
+    # One pass per byte position; varints here are rarely over 3 bytes
+    for k in range(1, int(lengths.max())):
+        longer = np.flatnonzero(lengths > k)
+        values[longer] |= (data[starts[longer] + k] & 0x7f).astype(np.uint64) \
+            << np.uint64(7 * k)
+    return values
+
+
+def _segmented_cumsum(values: np.ndarray, starts: np.ndarray,
+                      lengths: np.ndarray) -> np.ndarray:
+    """Cumulative sum that restarts at every segment start"""
+    total = np.cumsum(values)
+    offset = total[starts] - values[starts]
+    return total - np.repeat(offset, lengths)
+
+
+# ============================================================================
+# Chunk encoding
+# ============================================================================
+
+def encode_day(ts: np.ndarray, open_: np.ndarray, high: np.ndarray,
+               low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+               day: int) -> Tuple[np.void, List[bytes]]:
+    """
+    Encode one trading day of bars
+
+    Args:
+        ts: Epoch-ns timestamps (sorted, all on ``day``)
+        open_, high, low, close: Scaled integer prices
+        volume: Non-negative integer volumes
+        day: Days since epoch
+
+    Returns:
+        (chunk header, list of encoded streams in FIELDS order)
+    """
+    if (volume < 0).any():
+        raise ValueError("Negative volume cannot be encoded")
+    seconds = (ts - day * NS_PER_DAY) // NS_PER_SECOND
+    p0 = int(open_[0])
+    previous_close = np.concatenate(([p0], close[:-1]))
+    body_high = np.maximum(open_, close)
+    body_low = np.minimum(open_, close)
+
+    streams = [
+        varint_encode(np.diff(seconds, prepend=0)),
+        varint_encode(zigzag_encode(np.diff(close, prepend=p0))),
+        varint_encode(zigzag_encode(open_ - previous_close)),
+        varint_encode(zigzag_encode(high - body_high)),
+        varint_encode(zigzag_encode(body_low - low)),
+        varint_encode(volume),
+    ]
+    header = np.zeros((), dtype=_CHUNK_HEADER)
+    header['day'] = day
+    header['n'] = len(ts)
+    header['p0'] = p0
+    header['len'] = [len(s) for s in streams]
+    return header, streams
+
+
+def decode_chunks(headers: np.ndarray,
+                  fields: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Decode consecutive day chunks in one pass per field
+
+    Args:
+        headers: Chunk headers (_CHUNK_HEADER) in day order
+        fields: Field name -> uint8 buffer holding that field's streams
+            for exactly these chunks, concatenated
+
+    Returns:
+        dict with int64 arrays ts (epoch ns), open, high, low, close
+        (scaled) and volume
+    """
+    lengths = headers['n'].astype(np.int64)
+    if not lengths.sum():
+        return {k: np.empty(0, dtype=np.int64)
+                for k in ('ts', 'open', 'high', 'low', 'close', 'volume')}
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    day_start = np.repeat(headers['day'].astype(np.int64) * NS_PER_DAY, lengths)
+    p0 = np.repeat(headers['p0'], lengths)
+
+    seconds = _segmented_cumsum(
+        varint_decode(fields['time']).view(np.int64), starts, lengths)
+    close = _segmented_cumsum(
+        zigzag_decode(varint_decode(fields['close'])), starts, lengths) + p0
+    previous_close = np.empty_like(close)
+    previous_close[1:] = close[:-1]
+    previous_close[starts] = p0[starts]
+    open_ = zigzag_decode(varint_decode(fields['open'])) + previous_close
+    high = np.maximum(open_, close) + zigzag_decode(varint_decode(fields['high']))
+    low = np.minimum(open_, close) - zigzag_decode(varint_decode(fields['low']))
+
+    return {
+        'ts': day_start + seconds * NS_PER_SECOND,
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': varint_decode(fields['volume']).view(np.int64),
+    }
+
+
+def resample_bars(bars: Dict[str, np.ndarray], seconds: int) -> Dict[str, np.ndarray]:
+    """
+    Aggregate sorted bars into wider, clock-aligned buckets
+
+    Args:
+        bars: Decoded bar columns (see decode_chunks)
+        seconds: Bucket width; buckets are aligned to midnight
+
+    Returns:
+        Same columns, one row per non-empty bucket (ts = bucket start)
+    """
+    width = seconds * NS_PER_SECOND
+    bucket = bars['ts'] // width
+    if not len(bucket):
+        return {k: v[:0] for k, v in bars.items()}
+    starts = np.flatnonzero(np.diff(bucket, prepend=bucket[0] - 1))
+    ends = np.append(starts[1:], len(bucket)) - 1
+    return {
+        'ts': bucket[starts] * width,
+        'open': bars['open'][starts],
+        'high': np.maximum.reduceat(bars['high'], starts),
+        'low': np.minimum.reduceat(bars['low'], starts),
+        'close': bars['close'][ends],
+        'volume': np.add.reduceat(bars['volume'], starts),
+    }
+
+
+# ============================================================================
+# Store
+# ============================================================================
+
+class IntradayStore:
+    """
+    Ticker/month pack files of delta + zigzag varint encoded day chunks
+    """
+
+    def __init__(self, root_dir: str = "./data/historical/intraday",
+                 scale: int = PRICE_SCALE):
+        """
+        Initialize intraday store
+
+        Args:
+            root_dir: Directory holding one sub-directory per ticker
+            scale: Decimal digits kept for prices
+        """
+        self.root_dir = root_dir
+        self.scale = scale
+        os.makedirs(root_dir, exist_ok=True)
+
+    def _ticker_dir(self, ticker: str) -> str:
+        return os.path.join(self.root_dir, ticker.upper())
+
+    def _month_path(self, ticker: str, month: str) -> str:
+        return os.path.join(self._ticker_dir(ticker), f"{month}.ibar")
+
+    def list_months(self, ticker: str) -> List[str]:
+        """YYYY-MM months with a pack file for ticker, ascending"""
+        ticker_dir = self._ticker_dir(ticker)
+        if not os.path.isdir(ticker_dir):
+            return []
+        return sorted(name[:-5] for name in os.listdir(ticker_dir)
+                      if name.endswith('.ibar'))
+
+    def list_tickers(self) -> List[str]:
+        return sorted(name for name in os.listdir(self.root_dir)
+                      if self.list_months(name))
+
+    def nbytes(self, ticker: str) -> int:
+        """On-disk size of all pack files for ticker"""
+        return sum(os.path.getsize(self._month_path(ticker, m))
+                   for m in self.list_months(ticker))
+
+    # ------------------------------------------------------------------
+    # Pack file I/O
+    # ------------------------------------------------------------------
+
+    def _read_pack(self, ticker: str, month: str):
+        """(headers, {field: bytes for all chunks}) for one month file"""
+        raw = np.fromfile(self._month_path(ticker, month), dtype=np.uint8)
+        file_header = raw[:_FILE_HEADER.itemsize].view(_FILE_HEADER)[0]
+        if file_header['magic'] != _MAGIC:
+            raise ValueError(f"Not an intraday pack: {ticker} {month}")
+        if file_header['scale'] != self.scale:
+            raise ValueError(
+                f"Pack scale {file_header['scale']} != store scale {self.scale}")
+        offset = _FILE_HEADER.itemsize
+        size = int(file_header['chunks']) * _CHUNK_HEADER.itemsize
+        headers = raw[offset:offset + size].view(_CHUNK_HEADER)
+        offset += size
+
+        fields = {}
+        for i, field in enumerate(FIELDS):
+            length = int(headers['len'][:, i].sum())
+            fields[field] = raw[offset:offset + length]
+            offset += length
+        return headers, fields
+
+    def _write_pack(self, ticker: str, month: str, headers: np.ndarray,
+                    streams: List[List[bytes]]):
+        """
+        Atomically write a month file
+
+        Args:
+            headers: Chunk headers in day order
+            streams: Per chunk, its encoded streams in FIELDS order
+        """
+        file_header = np.zeros((), dtype=_FILE_HEADER)
+        file_header['magic'] = _MAGIC
+        file_header['chunks'] = len(headers)
+        file_header['scale'] = self.scale
+
+        path = self._month_path(ticker, month)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(file_header.tobytes())
+            f.write(np.ascontiguousarray(headers).tobytes())
+            for i in range(len(FIELDS)):
+                for chunk in streams:
+                    f.write(chunk[i])
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _split_streams(headers: np.ndarray,
+                       fields: Dict[str, np.ndarray]) -> List[List[bytes]]:
+        """Per-chunk encoded streams of a pack, without decoding"""
+        chunks = [[] for _ in range(len(headers))]
+        for i, field in enumerate(FIELDS):
+            bounds = np.concatenate(([0], np.cumsum(headers['len'][:, i])))
+            buffer = fields[field]
+            for j in range(len(headers)):
+                chunks[j].append(buffer[bounds[j]:bounds[j + 1]].tobytes())
+        return chunks
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def write(self, ticker: str, data: pd.DataFrame) -> int:
+        """
+        Store intraday bars, replacing any stored days they cover
+
+        Args:
+            ticker: Stock ticker symbol
+            data: OHLCV DataFrame with an intraday DatetimeIndex
+                (tz-aware indexes are kept in exchange local time)
+
+        Returns:
+            Number of bars written
+        """
+        df = normalize_ohlcv(data)
+        if df.empty:
+            return 0
+        written = self._store(ticker, self._scaled_columns(
+            df.index.values.astype('datetime64[ns]').view('i8'),
+            {col.lower(): df[col].to_numpy() for col in ('Open', 'High', 'Low', 'Close')},
+            df['Volume'].to_numpy(dtype=np.int64)), merge=False)
+        logger.info("Wrote intraday bars", ticker=ticker, bars=written)
+        return written
+
+    def append_records(self, ticker: str, records: np.ndarray) -> int:
+        """
+        Merge bars into their stored days
+
+        Only the days touched by records are decoded and re-encoded; the
+        other day chunks of the month file are copied as bytes. Bars with
+        an already stored timestamp replace the stored version. Used by
+        writers that produce records directly, such as the stream sink.
+
+        Args:
+            ticker: Stock ticker symbol
+            records: OHLCV_DTYPE array sorted by ts
+
+        Returns:
+            Number of bars that were not stored before
+        """
+        if not len(records):
+            return 0
+        added = self._store(ticker, self._scaled_columns(
+            records['ts'], {k: records[k] for k in ('open', 'high', 'low', 'close')},
+            records['volume'].astype(np.int64, copy=False)), merge=True)
+        logger.debug("Appended intraday bars", ticker=ticker, bars_added=added)
+        return added
+
+    def _scaled_columns(self, ts: np.ndarray, prices: Dict[str, np.ndarray],
+                        volume: np.ndarray) -> Dict[str, np.ndarray]:
+        """Float prices -> the int64 column layout of decode_chunks"""
+        factor = 10 ** self.scale
+        columns = {k: np.round(np.asarray(v, dtype=np.float64) * factor).astype(np.int64)
+                   for k, v in prices.items()}
+        columns['ts'] = np.asarray(ts, dtype=np.int64)
+        columns['volume'] = volume
+        return columns
+
+    @staticmethod
+    def _merge_day(stored: Dict[str, np.ndarray],
+                   new: Dict[str, np.ndarray]) -> Tuple[Dict[str, np.ndarray], int]:
+        """Union of two days of bars by ts (new wins); returns (bars, added)"""
+        merged = {k: np.concatenate([stored[k], new[k]]) for k in new}
+        order = np.argsort(merged['ts'], kind='stable')
+        ts = merged['ts'][order]
+        # After the stable sort a replaced bar directly precedes its update
+        keep = np.append(ts[1:] != ts[:-1], True)
+        added = len(new['ts']) - int((~keep).sum())
+        return {k: v[order][keep] for k, v in merged.items()}, added
+
+    def _store(self, ticker: str, columns: Dict[str, np.ndarray], merge: bool) -> int:
+        """
+        Encode sorted bar columns into their month files
+
+        Args:
+            columns: int64 ts/open/high/low/close/volume (prices scaled)
+            merge: Merge into stored days instead of replacing them
+
+        Returns:
+            Bars written (replace) or bars not stored before (merge)
+        """
+        days = columns['ts'] // NS_PER_DAY
+        boundaries = np.flatnonzero(np.diff(days)) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.append(boundaries, len(days))
+
+        by_month: Dict[str, Dict[int, Dict[str, np.ndarray]]] = {}
+        for lo, hi in zip(starts, ends):
+            day = int(days[lo])
+            month = str(np.datetime64(day, 'D'))[:7]
+            by_month.setdefault(month, {})[day] = {k: v[lo:hi] for k, v in columns.items()}
+
+        os.makedirs(self._ticker_dir(ticker), exist_ok=True)
+        count = 0
+        for month, new_days in by_month.items():
+            chunks = {}
+            if os.path.exists(self._month_path(ticker, month)):
+                headers, fields = self._read_pack(ticker, month)
+                for header, streams in zip(headers, self._split_streams(headers, fields)):
+                    chunks[int(header['day'])] = (header, streams)
+            for day, bars in new_days.items():
+                added = len(bars['ts'])
+                if merge and day in chunks:
+                    header, streams = chunks[day]
+                    stored = decode_chunks(
+                        np.asarray([header], dtype=_CHUNK_HEADER),
+                        {field: np.frombuffer(stream, dtype=np.uint8)
+                         for field, stream in zip(FIELDS, streams)})
+                    bars, added = self._merge_day(stored, bars)
+                count += added
+                chunks[day] = encode_day(
+                    bars['ts'], bars['open'], bars['high'], bars['low'],
+                    bars['close'], bars['volume'], day)
+            ordered = [chunks[day] for day in sorted(chunks)]
+            self._write_pack(ticker, month,
+                             np.array([h for h, _ in ordered], dtype=_CHUNK_HEADER),
+                             [s for _, s in ordered])
+        return count
+
+    def read_bars(self, ticker: str, start_date: str = None,
+                  end_date: str = None) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Decode bars for whole days in [start_date, end_date] (inclusive)
+
+        Returns:
+            dict of int64 columns (prices scaled by 10**scale) or None if
+            the ticker is not stored
+        """
+        months = self.list_months(ticker)
+        if not months:
+            return None
+        first_day = pd.Timestamp(start_date).value // NS_PER_DAY if start_date else None
+        last_day = pd.Timestamp(end_date).value // NS_PER_DAY if end_date else None
+        if start_date:
+            months = [m for m in months if m >= start_date[:7]]
+        if end_date:
+            months = [m for m in months if m <= end_date[:7]]
+
+        parts = []
+        for month in months:
+            headers, fields = self._read_pack(ticker, month)
+            day = headers['day']
+            lo = int(np.searchsorted(day, first_day)) if first_day is not None else 0
+            hi = int(np.searchsorted(day, last_day, side='right')) \
+                if last_day is not None else len(headers)
+            if hi <= lo:
+                continue
+            selected = {}
+            for i, field in enumerate(FIELDS):
+                bounds = np.concatenate(([0], np.cumsum(headers['len'][:, i])))
+                selected[field] = fields[field][bounds[lo]:bounds[hi]]
+            parts.append(decode_chunks(headers[lo:hi], selected))
+
+        if not parts:
+            return decode_chunks(np.zeros(0, dtype=_CHUNK_HEADER), {})
+        if len(parts) == 1:
+            return parts[0]
+        return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+    def to_frame(self, bars: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """Decoded (scaled) bar columns -> float OHLCV DataFrame"""
+        factor = 10.0 ** self.scale
+        return pd.DataFrame({
+            'Open': bars['open'] / factor,
+            'High': bars['high'] / factor,
+            'Low': bars['low'] / factor,
+            'Close': bars['close'] / factor,
+            'Volume': bars['volume'],
+        }, index=pd.DatetimeIndex(bars['ts'].astype('datetime64[ns]'), name='Date'))
+
+    def read(self, ticker: str, start_date: str = None,
+             end_date: str = None, interval: str = None) -> Optional[pd.DataFrame]:
+        """
+        Read bars as a DataFrame, optionally resampled
+
+        Args:
+            ticker: Stock ticker symbol
+            start_date: First day (YYYY-MM-DD), optional
+            end_date: Last day (YYYY-MM-DD, inclusive), optional
+            interval: Resample to a key of RESAMPLE_INTERVALS (default: as stored)
+
+        Returns:
+            DataFrame or None if ticker is not stored
+        """
+        bars = self.read_bars(ticker, start_date, end_date)
+        if bars is None:
+            return None
+        if interval is not None:
+            bars = self.resample(bars, interval)
+        return self.to_frame(bars)
+
+    @staticmethod
+    def resample(bars: Dict[str, np.ndarray], interval: str) -> Dict[str, np.ndarray]:
+        """Resample decoded bars to interval (1m/5m/15m/30m/1h/1d)"""
+        if interval not in RESAMPLE_INTERVALS:
+            raise ValueError(f"Unsupported interval: {interval}")
+        return resample_bars(bars, RESAMPLE_INTERVALS[interval])
+
+    def delete(self, ticker: str):
+        """Remove all pack files for ticker"""
+        for month in self.list_months(ticker):
+            os.remove(self._month_path(ticker, month))
@@ -3,6 +3,7 @@ Performance Metrics Calculator for Backtest Engine
 Calculates Sharpe ratio, drawdown, win rate, etc.
 Month 3 Week 2
 """
+from .bootstrap import confidence_intervals, trade_wins
 from shared.utils.logger import get_logger
 import pandas as pd
 import numpy as np
@@ -31,7 +32,7 @@ class PerformanceMetrics:
         Returns:
             Total return as percentage
         """
-        if not portfolio_values or len(portfolio_values) < 2:
+        if portfolio_values is None or len(portfolio_values) < 2:
             return 0.0
 
         initial_value = portfolio_values[0]
@@ -47,18 +48,25 @@ class PerformanceMetrics:
         Calculate Sharpe ratio
 
         Args:
-            returns: Series of daily returns
+            returns: Series (or array) of daily returns
             risk_free_rate: Annual risk-free rate (default 2%)
 
         Returns:
             Sharpe ratio
         """
-        if returns.empty or returns.std() == 0:
+        values = np.asarray(returns, dtype=np.float64)
+        if not len(values):
+            return 0.0
+        values = values[~np.isnan(values)]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = values.std(ddof=1) if len(values) > 1 else np.nan
+            mean = values.mean() if len(values) else np.nan
+        if std == 0:
             return 0.0
 
         # Annualize returns and volatility
-        annual_return = returns.mean() * 252
-        annual_volatility = returns.std() * np.sqrt(252)
+        annual_return = mean * 252
+        annual_volatility = std * np.sqrt(252)
 
         sharpe = (annual_return - risk_free_rate) / annual_volatility
         return round(float(sharpe), 2)
@@ -69,19 +77,19 @@ class PerformanceMetrics:
         Calculate maximum drawdown percentage
 
         Args:
-            portfolio_values: List of portfolio values
+            portfolio_values: List (or array) of portfolio values
 
         Returns:
             Maximum drawdown as percentage (negative)
         """
-        if not portfolio_values:
+        if portfolio_values is None or len(portfolio_values) == 0:
             return 0.0
 
-        values = pd.Series(portfolio_values)
-        cumulative_max = values.cummax()
+        values = np.asarray(portfolio_values, dtype=np.float64)
+        cumulative_max = np.fmax.accumulate(values)
         drawdown = (values - cumulative_max) / cumulative_max * 100
 
-        return round(float(drawdown.min()), 2)
+        return round(float(np.nanmin(drawdown)), 2)
 
     @staticmethod
     def calculate_win_rate(trades: List[Dict[str, Any]]) -> float:
@@ -117,7 +125,7 @@ class PerformanceMetrics:
             Dictionary with avg_gain and avg_loss
         """
         if not trades:
-            return {'avg_gain': 0.0, 'avg_loss': 0.0}
+            return {'avg_gain': 0.0, 'avg_loss': 0.0, 'profit_factor': 0.0}
 
         gains = [t.get('profit', 0) for t in trades if t.get('profit', 0) > 0]
         losses = [abs(t.get('profit', 0))
@@ -161,12 +169,52 @@ class PerformanceMetrics:
             'beats_buy_hold': outperformance > 0
         }
 
+    @staticmethod
+    def calculate_confidence_intervals(
+            portfolio_values: List[float],
+            trades: List[Dict[str, Any]],
+            n_resamples: int = 10_000,
+            confidence: float = 0.95,
+            block_size: int = None,
+            seed: int = 0) -> Dict[str, Any]:
+        """
+        Bootstrap confidence intervals for the headline metrics
+
+        Total return, Sharpe ratio and max drawdown come from a block
+        bootstrap of the daily returns of portfolio_values; the win rate
+        from resampling trades (see bootstrap.py).
+
+        Args:
+            portfolio_values: Portfolio values over time
+            trades: List of trades
+            n_resamples: Number of bootstrap resamples
+            confidence: Interval coverage
+            block_size: Days per bootstrap block (default: n ** 1/3)
+            seed: Random seed, so reports are reproducible
+
+        Returns:
+            dict with confidence, resamples, block_size and per metric
+            lower / median / upper / std (empty if under 2 returns)
+        """
+        values = np.asarray(portfolio_values, dtype=np.float64)
+        if len(values) < 3:
+            return {}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.diff(values) / values[:-1]
+        returns[~np.isfinite(returns)] = np.nan
+        if np.count_nonzero(~np.isnan(returns)) < 2:
+            return {}
+        return confidence_intervals(
+            returns, trade_wins(trades) if trades else None, n_resamples,
+            confidence, block_size, seed=seed)
+
     @staticmethod
     def generate_report(portfolio_values: List[float],
                         trades: List[Dict[str,
                                           Any]],
                         returns: pd.Series,
-                        buy_hold_return: float = None) -> Dict[str,
+                        buy_hold_return: float = None,
+                        confidence_resamples: int = 0) -> Dict[str,
                                                                Any]:
         """
         Generate comprehensive performance report
@@ -176,6 +224,8 @@ class PerformanceMetrics:
             trades: List of trades
             returns: Daily returns series
             buy_hold_return: Buy-and-hold return for comparison
+            confidence_resamples: Bootstrap resamples for confidence
+                intervals (0 = point estimates only)
 
         Returns:
             Complete performance metrics
@@ -203,6 +253,11 @@ class PerformanceMetrics:
                 total_return, buy_hold_return)
             report['vs_buy_hold'] = comparison
 
+        if confidence_resamples:
+            report['confidence_intervals'] = \
+                PerformanceMetrics.calculate_confidence_intervals(
+                    portfolio_values, trades, confidence_resamples)
+
         logger.info(
             "Generated performance report",
             total_return=total_return,
@@ -0,0 +1,192 @@
+"""
+Backtest Result Cache
+Content-addressed store of run_backtest reports and equity curves.
+
+A result's key is a hash of everything that determines it: ticker,
+strategy, full parameters, date range, capital, mode, the checksum of
+the cached price history (DataCatalog) and the engine version. When the
+history is refreshed its checksum changes, so old results are simply
+never looked up again (and are pruned on the next write for that
+ticker). Entries live in SQLite (report JSON + zlib-compressed equity)
+behind an in-memory ByteLRUCache front.
+"""
+from shared.utils.cache import ByteLRUCache
+from shared.utils.logger import get_logger
+import numpy as np
+import hashlib
+import json
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+import os
+import sys
+
+# Add shared utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+logger = get_logger("result-cache")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key         TEXT PRIMARY KEY,
+    ticker      TEXT NOT NULL,
+    checksum    TEXT NOT NULL,
+    strategy    TEXT,
+    report      TEXT NOT NULL,
+    equity      BLOB,
+    created_at  TEXT,
+    hits        INTEGER NOT NULL DEFAULT 0
+)
+"""
+_INDEX = "CREATE INDEX IF NOT EXISTS results_ticker ON results (ticker)"
+
+
+def _json_default(value):
+    # NumPy scalars in metrics (np.int64, np.bool_, ...)
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def result_key(ticker: str, strategy: str, params: Dict[str, Any],
+               start_date: Optional[str], end_date: Optional[str],
+               initial_capital: float, mode: str, checksum: str,
+               engine_version: Any) -> str:
+    """
+    Content address of a backtest result
+
+    Returns:
+        SHA-256 hex digest of the canonical JSON of all inputs
+    """
+    parts = {
+        "ticker": ticker.upper(), "strategy": strategy, "params": params,
+        "start": start_date, "end": end_date, "capital": float(initial_capital),
+        "mode": mode, "checksum": checksum, "engine": engine_version,
+    }
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"),
+                           default=_json_default)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class BacktestResultCache:
+    """
+    Persistent backtest results with an in-memory LRU front
+
+    Safe to share between threads; several processes may use the same
+    database file.
+    """
+
+    def __init__(self, path: str = "./data/historical/results.sqlite",
+                 memory_bytes: int = 32 * 1024 * 1024):
+        """
+        Initialize cache
+
+        Args:
+            path: SQLite database file (created if missing)
+            memory_bytes: Budget of the in-memory front
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(_SCHEMA)
+            self._conn.execute(_INDEX)
+        # key -> (report JSON, equity array)
+        self.memory = ByteLRUCache(
+            memory_bytes, sizeof=lambda entry: len(entry[0]) + entry[1].nbytes)
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self, key: str) -> Optional[Tuple[str, np.ndarray]]:
+        entry = self.memory.get(key)
+        if entry is not None:
+            return entry
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT report, equity FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE results SET hits = hits + 1 WHERE key = ?", (key,))
+        if row is None:
+            return None
+        equity = np.frombuffer(zlib.decompress(row[1]), dtype=np.float64) \
+            if row[1] else np.empty(0)
+        entry = (row[0], equity)
+        self.memory.put(key, entry)
+        return entry
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached report for key (a fresh dict) or None"""
+        entry = self._load(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(entry[0])
+
+    def get_equity(self, key: str) -> Optional[np.ndarray]:
+        """Cached portfolio values for key (read-only) or None"""
+        entry = self._load(key)
+        return None if entry is None else entry[1]
+
+    def put(self, key: str, report: Dict[str, Any], equity,
+            ticker: str, checksum: str, strategy: str = None):
+        """
+        Store a result and drop results of older data for the ticker
+
+        Args:
+            key: result_key(...)
+            report: run_backtest report
+            equity: Portfolio values
+            ticker: Ticker the result was computed on
+            checksum: Data checksum included in key
+            strategy: Strategy name (informational)
+        """
+        text = json.dumps(report, default=_json_default)
+        values = np.ascontiguousarray(equity, dtype=np.float64)
+        values.flags.writeable = False
+        blob = zlib.compress(values.tobytes(), 6)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM results WHERE ticker = ? AND checksum != ?",
+                (ticker.upper(), checksum))
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO results
+                    (key, ticker, checksum, strategy, report, equity, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (key, ticker.upper(), checksum, strategy, text, blob,
+                      datetime.now().isoformat()))
+        self.memory.put(key, (text, values))
+
+    def invalidate(self, ticker: str = None) -> int:
+        """
+        Drop cached results for ticker (or everything)
+
+        Returns:
+            Number of results removed from disk
+        """
+        with self._lock, self._conn:
+            if ticker is None:
+                removed = self._conn.execute("DELETE FROM results").rowcount
+            else:
+                removed = self._conn.execute(
+                    "DELETE FROM results WHERE ticker = ?", (ticker.upper(),)).rowcount
+        self.memory.clear()
+        logger.info("Result cache invalidated", ticker=ticker, removed=removed)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, disk and memory usage"""
+        with self._lock:
+            entries, nbytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(report) + LENGTH(equity)), 0) "
+                "FROM results").fetchone()
+        return {"hits": self.hits, "misses": self.misses,
+                "entries": entries, "disk_bytes": nbytes,
+                "memory": self.memory.stats()}
+
+    def close(self):
+        self._conn.close()
@@ -4,10 +4,22 @@ Historical simulation and strategy validation
 Month 3 Week 2 - FULLY OPERATIONAL
 """
 from .metrics import PerformanceMetrics
-from .data_loader import get_data_loader
+from .data_loader import DataLoader, get_data_loader
+from .portfolio import PortfolioBacktester, align_weights, portfolio_report
+from .ledger import TradeLedger
+from .result_cache import BacktestResultCache, result_key
+from .strategy import STRATEGY_CLASSES, BarArrays, Strategy, get_strategy, run_event
+from .sweep import iter_sweep, rank_results
+from .walk_forward import walk_forward
+from .vectorized import (
+    MA_FAST, MA_SLOW, RSI_PERIOD, moving_average, rsi_indicator, run_strategy,
+    strategy_params
+)
 from shared.utils.logger import get_logger
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Union
 import os
 import sys
 
@@ -20,15 +32,36 @@ logger = get_logger("backtest-engine")
 class VirtualPortfolio:
     """
     Tracks portfolio state during backtest
+
+    Trades live in an array-backed TradeLedger; ``trades`` exports them
+    as dicts on access.
     """
 
-    def __init__(self, initial_capital: float = 100000.0):
+    def __init__(self, initial_capital: float = 100000.0,
+                 cost_basis: str = "fifo", log_trades: bool = False):
+        """
+        Args:
+            initial_capital: Starting cash
+            cost_basis: Realized P&L method ("fifo", "lifo" or "last")
+            log_trades: Log every buy and sell (off by default; a log line
+                costs far more than the trade itself)
+        """
         self.initial_capital = initial_capital
         self.cash = initial_capital
         self.shares = 0
         self.portfolio_values = [initial_capital]
-        self.trades = []
+        self.ledger = TradeLedger(cost_basis)
         self.daily_returns = []
+        self.log_trades = log_trades
+
+    @property
+    def trades(self) -> List[Dict[str, Any]]:
+        """All trades as dicts (bulk export of the ledger)"""
+        return self.ledger.to_dicts()
+
+    @property
+    def realized_pnl(self) -> float:
+        return self.ledger.realized_pnl
 
     def buy(self, price: float, date: str, shares: int = None):
         """Buy shares"""
@@ -46,17 +79,10 @@ class VirtualPortfolio:
 
         self.cash -= cost
         self.shares += shares
+        self.ledger.record_buy(date, shares, price)
 
-        self.trades.append({
-            'date': date,
-            'action': 'BUY',
-            'shares': shares,
-            'price': price,
-            'value': cost,
-            'profit': 0
-        })
-
-        logger.info("Buy executed", shares=shares, price=price, date=date)
+        if self.log_trades:
+            logger.info("Buy executed", shares=shares, price=price, date=date)
         return True
 
     def sell(self, price: float, date: str, shares: int = None):
@@ -71,38 +97,17 @@ class VirtualPortfolio:
                 trying_to_sell=shares)
             return False
 
-        revenue = shares * price
-        self.cash += revenue
-
-        # Calculate profit
-        if self.trades:
-            # Find last buy price
-            buy_trades = [t for t in self.trades if t['action'] == 'BUY']
-            if buy_trades:
-                last_buy_price = buy_trades[-1]['price']
-                profit = (price - last_buy_price) * shares
-            else:
-                profit = 0
-        else:
-            profit = 0
-
+        self.cash += shares * price
         self.shares -= shares
+        profit = self.ledger.record_sell(date, shares, price)
 
-        self.trades.append({
-            'date': date,
-            'action': 'SELL',
-            'shares': shares,
-            'price': price,
-            'value': revenue,
-            'profit': profit
-        })
-
-        logger.info(
-            "Sell executed",
-            shares=shares,
-            price=price,
-            profit=profit,
-            date=date)
+        if self.log_trades:
+            logger.info(
+                "Sell executed",
+                shares=shares,
+                price=price,
+                profit=profit,
+                date=date)
         return True
 
     def get_total_value(self, current_price: float) -> float:
@@ -111,7 +116,7 @@ class VirtualPortfolio:
 
     def record_value(self, current_price: float):
         """Record current portfolio value"""
-        total_value = self.get_total_value(current_price)
+        total_value = float(self.get_total_value(current_price))
         self.portfolio_values.append(total_value)
 
         # Calculate daily return
@@ -124,70 +129,163 @@ class VirtualPortfolio:
 class BacktestEngine:
     """
     Historical strategy validation
+
+    Built-in strategies run in any of three modes with identical results:
+    - "vectorized" (default): NumPy signal and equity arrays
+    - "event": Strategy.on_bar driven over preallocated bar arrays
+    - "loop": bar-by-bar VirtualPortfolio simulation (reference)
+
+    Custom strategies subclass Strategy, are registered with
+    register_strategy (or passed as instances) and run in event mode.
     """
 
-    def __init__(self, historical_data_dir="./data/historical"):
+    STRATEGIES = ("buy_and_hold", "rsi_strategy", "ma_crossover")
+    MODES = ("vectorized", "event", "loop")
+    # Bump when simulation or metric semantics change (result cache key)
+    ENGINE_VERSION = 2
+
+    def __init__(self, historical_data_dir="./data/historical",
+                 data_loader: DataLoader = None,
+                 result_cache: BacktestResultCache = None):
+        """
+        Args:
+            historical_data_dir: Historical data directory
+            data_loader: Data source (default: shared DataLoader)
+            result_cache: Persistent run_backtest result cache (optional)
+        """
         self.historical_data_dir = historical_data_dir
-        self.data_loader = get_data_loader()
+        self.data_loader = data_loader or get_data_loader()
+        self.result_cache = result_cache
         logger.info("BacktestEngine initialized (OPERATIONAL)")
 
+    def _result_key(self, ticker: str, strategy: str, params: Dict[str, Any],
+                    start_date: str, end_date: str, initial_capital: float,
+                    mode: str) -> Optional[str]:
+        """Result cache key, or None when the ticker's data is not cached"""
+        entry = self.data_loader.coverage(ticker)
+        if entry is None or not entry.get("checksum") or \
+                self.data_loader.is_stale(ticker, end_date):
+            return None
+        return result_key(ticker, strategy, params, start_date, end_date,
+                          initial_capital, mode, entry["checksum"],
+                          self.ENGINE_VERSION)
+
     def run_backtest(self,
                      ticker: str,
-                     strategy: str,
+                     strategy: Union[str, Strategy],
                      start_date: str,
                      end_date: str,
-                     initial_capital: float = 100000.0) -> Dict[str,
-                                                                Any]:
+                     initial_capital: float = 100000.0,
+                     mode: str = None,
+                     params: Dict[str, Any] = None,
+                     use_cache: bool = True,
+                     confidence_resamples: int = 0) -> Dict[str, Any]:
         """
         Run backtest with specified strategy
 
         Args:
             ticker: Stock ticker
-            strategy: Strategy name (buy_and_hold, rsi_strategy, ma_crossover)
+            strategy: Strategy name (buy_and_hold, rsi_strategy, ma_crossover
+                or any registered Strategy) or a Strategy instance
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
             initial_capital: Starting capital
+            mode: "vectorized", "event" or "loop" (default: vectorized for
+                built-in strategies, event otherwise)
+            params: Strategy parameter overrides, e.g. {"period": 10,
+                "oversold": 25} (vectorized and event modes)
+            use_cache: Serve from / store into the result cache (when the
+                engine has one)
+            confidence_resamples: Add bootstrap confidence intervals to the
+                metrics with this many resamples (such runs bypass the
+                result cache)
 
         Returns:
             Performance metrics and trade history
         """
         try:
-            logger.info(f"Running backtest", ticker=ticker, strategy=strategy,
+            logger.info(f"Running backtest", ticker=ticker,
+                        strategy=getattr(strategy, "name", strategy),
                         start=start_date, end=end_date)
 
+            if isinstance(strategy, Strategy):
+                instance, strategy = strategy, strategy.name or type(strategy).__name__
+            elif strategy in self.STRATEGIES or strategy in STRATEGY_CLASSES:
+                instance = None
+            else:
+                return {
+                    "status": "error",
+                    "message": f"Unknown strategy: {strategy}"}
+            built_in = instance is None and strategy in self.STRATEGIES
+            # Only built-ins are cached: ENGINE_VERSION tracks their code,
+            # while a registered strategy's on_bar can change between
+            # sessions under the same name. Runs with bootstrap intervals
+            # are not cached either.
+            cacheable = built_in and not confidence_resamples
+            mode = mode or ("vectorized" if built_in else "event")
+            if mode not in self.MODES:
+                return {"status": "error", "message": f"Unknown mode: {mode}"}
+            if mode != "event" and not built_in:
+                return {"status": "error",
+                        "message": f"{strategy} runs in event mode only"}
+            if params and mode == "loop":
+                return {"status": "error",
+                        "message": "Strategy parameters require vectorized or event mode"}
+            if mode == "event":
+                if instance is None:
+                    instance = get_strategy(strategy, params)
+                elif params:
+                    instance = type(instance)(**{**instance.params, **params})
+                params = dict(instance.params)
+            else:
+                params = strategy_params(strategy, params)
+
+            key = None
+            if self.result_cache is not None and use_cache and cacheable:
+                key = self._result_key(ticker, strategy, params, start_date,
+                                       end_date, initial_capital, mode)
+                cached = self.result_cache.get(key) if key else None
+                if cached is not None:
+                    logger.info("Backtest served from result cache",
+                                ticker=ticker, strategy=strategy)
+                    return cached
+
             # Load historical data
             data = self.data_loader.get_data(ticker, start_date, end_date)
 
             if data.empty:
                 return {"status": "error", "message": "No data available"}
 
-            # Initialize portfolio
-            portfolio = VirtualPortfolio(initial_capital)
-
-            # Execute strategy
-            if strategy == "buy_and_hold":
-                self._execute_buy_and_hold(data, portfolio)
-            elif strategy == "rsi_strategy":
-                self._execute_rsi_strategy(data, portfolio)
-            elif strategy == "ma_crossover":
-                self._execute_ma_crossover(data, portfolio)
+            if mode == "vectorized":
+                run = run_strategy(data, strategy, initial_capital, params)
+            elif mode == "event":
+                run = run_event(BarArrays.from_frame(data), instance, initial_capital)
+            if mode in ("vectorized", "event"):
+                portfolio_values = run.portfolio_values.tolist()
+                trades = run.trades(data.index)
+                returns_series = pd.Series(run.returns)
             else:
-                return {
-                    "status": "error",
-                    "message": f"Unknown strategy: {strategy}"}
-
-            # Calculate performance metrics
-            returns_series = pd.Series(portfolio.daily_returns)
+                portfolio = VirtualPortfolio(initial_capital)
+                if strategy == "buy_and_hold":
+                    self._execute_buy_and_hold(data, portfolio)
+                elif strategy == "rsi_strategy":
+                    self._execute_rsi_strategy(data, portfolio)
+                else:
+                    self._execute_ma_crossover(data, portfolio)
+                portfolio_values = portfolio.portfolio_values
+                trades = portfolio.trades
+                returns_series = pd.Series(portfolio.daily_returns)
 
             # Calculate buy-and-hold return for comparison
             buy_hold_return = ((data['Close'].iloc[-1] - data['Close'].iloc[0]) /
                                data['Close'].iloc[0]) * 100
 
             metrics = PerformanceMetrics.generate_report(
-                portfolio_values=portfolio.portfolio_values,
-                trades=portfolio.trades,
+                portfolio_values=portfolio_values,
+                trades=trades,
                 returns=returns_series,
-                buy_hold_return=buy_hold_return
+                buy_hold_return=buy_hold_return,
+                confidence_resamples=confidence_resamples
             )
 
             result = {
@@ -196,9 +294,10 @@ class BacktestEngine:
                 "start_date": start_date,
                 "end_date": end_date,
                 "initial_capital": initial_capital,
-                "final_value": portfolio.portfolio_values[-1],
+                "params": params,
+                "final_value": portfolio_values[-1],
                 "metrics": metrics,
-                "num_trades": len(portfolio.trades),
+                "num_trades": len(trades),
                 "status": "success"
             }
 
@@ -208,6 +307,15 @@ class BacktestEngine:
                 total_return=metrics['total_return'],
                 sharpe=metrics['sharpe_ratio'])
 
+            if self.result_cache is not None and use_cache and cacheable:
+                # Key on the data actually used (it may have just been fetched)
+                key = self._result_key(ticker, strategy, params, start_date,
+                                       end_date, initial_capital, mode)
+                if key:
+                    self.result_cache.put(
+                        key, result, portfolio_values, ticker,
+                        self.data_loader.coverage(ticker)["checksum"], strategy)
+
             return result
 
         except Exception as e:
@@ -218,6 +326,203 @@ class BacktestEngine:
                 error=str(e))
             return {"status": "error", "message": str(e)}
 
+    def sweep(self,
+              ticker_or_universe: Union[str, Sequence[str]],
+              strategy: str,
+              param_grid: Mapping[str, Sequence],
+              start_date: str = None,
+              end_date: str = None,
+              initial_capital: float = 100000.0,
+              max_workers: int = None,
+              rank_by: str = "sharpe_ratio",
+              on_result: Callable[[Dict[str, Any]], None] = None) -> pd.DataFrame:
+        """
+        Backtest every combination of a parameter grid
+
+        Close prices are loaded once, shared with a process pool through
+        shared memory, and each configuration runs in vectorized mode.
+
+        Args:
+            ticker_or_universe: Ticker or list of tickers
+            strategy: Strategy name (see STRATEGIES)
+            param_grid: Parameter name -> values, e.g.
+                {"period": [7, 14, 21], "oversold": [20, 30]}
+            start_date: Start date (YYYY-MM-DD), optional
+            end_date: End date (YYYY-MM-DD), optional
+            initial_capital: Starting capital
+            max_workers: Worker processes (default: CPU count, 1 = inline)
+            rank_by: Metric column to rank by (descending)
+            on_result: Called with each result row as it completes
+
+        Returns:
+            DataFrame ranked best-first: rank, ticker, parameters,
+            total_return, sharpe_ratio, max_drawdown, win_rate,
+            num_trades, final_value
+        """
+        tickers = [ticker_or_universe] if isinstance(ticker_or_universe, str) \
+            else list(ticker_or_universe)
+        closes = {}
+        for ticker in tickers:
+            try:
+                data = self.data_loader.get_data(ticker, start_date, end_date)
+            except Exception as e:
+                logger.warning("Sweep skipping ticker", ticker=ticker, error=str(e))
+                continue
+            if not data.empty:
+                closes[ticker] = data['Close'].to_numpy(dtype=np.float64)
+
+        started = time.perf_counter()
+        rows: List[Dict[str, Any]] = []
+        for row in iter_sweep(closes, strategy, param_grid, initial_capital,
+                              max_workers=max_workers):
+            rows.append(row)
+            if on_result is not None:
+                on_result(row)
+
+        logger.info("Sweep complete", strategy=strategy, tickers=len(closes),
+                    configurations=len(rows),
+                    seconds=round(time.perf_counter() - started, 3))
+        return rank_results(rows, rank_by)
+
+    def walk_forward(self,
+                     ticker: str,
+                     strategy: str,
+                     param_grid: Mapping[str, Sequence],
+                     train_bars: int = 756,
+                     test_bars: int = 126,
+                     start_date: str = None,
+                     end_date: str = None,
+                     initial_capital: float = 100000.0,
+                     anchored: bool = False,
+                     rank_by: str = "sharpe_ratio",
+                     max_workers: int = None) -> Dict[str, Any]:
+        """
+        Walk-forward optimization with stitched out-of-sample equity
+
+        Data is loaded and indicators computed once; each training window
+        picks the best configuration of the grid (in parallel across
+        windows), which then trades the following test window.
+
+        Args:
+            ticker: Stock ticker
+            strategy: Strategy name (see STRATEGIES)
+            param_grid: Parameter name -> values
+            train_bars: In-sample bars per window (default: ~3 years)
+            test_bars: Out-of-sample bars per window (default: ~6 months)
+            start_date: Start date (YYYY-MM-DD), optional
+            end_date: End date (YYYY-MM-DD), optional
+            initial_capital: Starting capital of the out-of-sample run
+            anchored: Expanding instead of rolling training windows
+            rank_by: In-sample metric to maximize
+            max_workers: Worker processes (default: CPU count, 1 = inline)
+
+        Returns:
+            Out-of-sample metrics, per-window table ("windows") and the
+            stitched out-of-sample equity curve ("equity", a Series)
+        """
+        try:
+            data = self.data_loader.get_data(ticker, start_date, end_date)
+            if data.empty:
+                return {"status": "error", "message": "No data available"}
+
+            started = time.perf_counter()
+            close = data['Close'].to_numpy(dtype=np.float64)
+            result = walk_forward(close, strategy, param_grid, train_bars, test_bars,
+                                  initial_capital, anchored, rank_by, max_workers)
+
+            windows = result.windows
+            # Window ends are exclusive bar indices: report the last bar
+            for column in ("train_start", "test_start"):
+                windows[column] = data.index[windows[column]]
+            for column in ("train_end", "test_end"):
+                windows[column] = data.index[windows[column] - 1]
+            values = np.concatenate(([initial_capital], result.equity))
+            returns = values[1:] / values[:-1] - 1
+            buy_hold_return = (close[-1] - close[result.equity_bars[0]]) / \
+                close[result.equity_bars[0]] * 100
+            metrics = PerformanceMetrics.generate_report(
+                portfolio_values=values.tolist(),
+                trades=[{'profit': p} for p in result.trade_profits.tolist()],
+                returns=pd.Series(returns),
+                buy_hold_return=buy_hold_return)
+
+            logger.info("Walk-forward complete", ticker=ticker, strategy=strategy,
+                        windows=len(windows), oos_return=metrics['total_return'],
+                        seconds=round(time.perf_counter() - started, 3))
+            return {
+                "ticker": ticker,
+                "strategy": strategy,
+                "initial_capital": initial_capital,
+                "final_value": float(values[-1]),
+                "metrics": metrics,
+                "windows": windows,
+                "equity": pd.Series(result.equity, index=data.index[result.equity_bars]),
+                "status": "success"
+            }
+        except Exception as e:
+            logger.error(f"Walk-forward failed: {str(e)}", ticker=ticker, error=str(e))
+            return {"status": "error", "message": str(e)}
+
+    def run_portfolio_backtest(self,
+                               tickers: Sequence[str],
+                               start_date: str = None,
+                               end_date: str = None,
+                               weights: Any = "equal",
+                               rebalance: Any = "M",
+                               initial_capital: float = 100000.0,
+                               cost_bps: float = 0.0,
+                               fractional: bool = False) -> Dict[str, Any]:
+        """
+        Backtest a multi-asset portfolio with target-weight rebalancing
+
+        Args:
+            tickers: Portfolio universe
+            start_date: Start date (YYYY-MM-DD), optional
+            end_date: End date (YYYY-MM-DD), optional
+            weights: "equal", {ticker: weight}, a weight per requested
+                ticker, or a DataFrame of target weights (dates x tickers)
+                applied from each date on; weights of tickers that cannot
+                be loaded are dropped and renormalized
+            rebalance: "D", "W", "M", "Q", "Y", every N bars (int), or a
+                list of dates
+            initial_capital: Starting capital
+            cost_bps: Transaction cost in basis points of traded value
+            fractional: Allow fractional shares
+
+        Returns:
+            Performance metrics, final holdings and weights
+        """
+        try:
+            logger.info("Running portfolio backtest", tickers=len(tickers),
+                        start=start_date, end=end_date, rebalance=str(rebalance))
+            prices = self.data_loader.get_price_matrix(tickers, start_date, end_date)
+            if prices.empty:
+                return {"status": "error", "message": "No data available"}
+
+            backtester = PortfolioBacktester(prices, initial_capital, cost_bps, fractional)
+            # Weights of tickers that failed to load are dropped like unlisted ones
+            weights = align_weights(weights, tickers, list(prices.columns),
+                                    backtester.renormalize)
+            run = backtester.run(weights, rebalance)
+            final = run.holdings[-1]
+            held = np.flatnonzero(final)
+            return {
+                "tickers": run.tickers,
+                "missing": [t.upper() for t in tickers if t.upper() not in prices.columns],
+                "start_date": start_date,
+                "end_date": end_date,
+                "initial_capital": initial_capital,
+                "final_value": float(run.equity[-1]),
+                "metrics": portfolio_report(run, initial_capital),
+                "final_holdings": {run.tickers[i]: float(final[i]) for i in held},
+                "final_weights": {run.tickers[i]: round(float(run.weights[-1, i]), 4)
+                                  for i in held},
+                "status": "success"
+            }
+        except Exception as e:
+            logger.error(f"Portfolio backtest failed: {str(e)}", error=str(e))
+            return {"status": "error", "message": str(e)}
+
     def _execute_buy_and_hold(
             self,
             data: pd.DataFrame,
@@ -245,15 +550,12 @@ class BacktestEngine:
             portfolio: VirtualPortfolio):
         """Buy when RSI < 30, Sell when RSI > 70"""
         # Calculate RSI
-        delta = data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
+        rsi = rsi_indicator(data['Close'])
 
         holding = False
 
-        for idx in range(14, len(data)):  # Start after RSI calculation period
+        # Start after RSI calculation period
+        for idx in range(RSI_PERIOD, len(data)):
             current_price = data['Close'].iloc[idx]
             current_rsi = rsi.iloc[idx]
             current_date = data.index[idx].strftime('%Y-%m-%d')
@@ -282,12 +584,13 @@ class BacktestEngine:
             portfolio: VirtualPortfolio):
         """Golden cross (50d MA > 200d MA) = Buy, Death cross = Sell"""
         # Calculate moving averages
-        data['MA50'] = data['Close'].rolling(window=50).mean()
-        data['MA200'] = data['Close'].rolling(window=200).mean()
+        data['MA50'] = moving_average(data['Close'], MA_FAST)
+        data['MA200'] = moving_average(data['Close'], MA_SLOW)
 
         holding = False
 
-        for idx in range(200, len(data)):  # Start after MA calculation period
+        # Start after MA calculation period
+        for idx in range(MA_SLOW, len(data)):
             current_price = data['Close'].iloc[idx]
             ma50 = data['MA50'].iloc[idx]
             ma200 = data['MA200'].iloc[idx]
@@ -322,5 +625,9 @@ def get_backtest_engine() -> BacktestEngine:
     """Get backtest engine singleton"""
     global _backtest_engine
     if _backtest_engine is None:
-        _backtest_engine = BacktestEngine()
+        loader = get_data_loader()
+        _backtest_engine = BacktestEngine(
+            data_loader=loader,
+            result_cache=BacktestResultCache(
+                os.path.join(loader.cache_dir, "results.sqlite")))
     return _backtest_engine
@@ -0,0 +1,302 @@
+"""
+Event-Driven Strategy API
+Pluggable strategies for BacktestEngine: subclass Strategy, implement
+on_bar(bar, state) and register the class under a name.
+
+The engine loads a ticker's bars into preallocated NumPy arrays once,
+lets the strategy precompute its indicators over them (prepare), then
+calls on_bar once per bar with a reusable cursor (BarView) and a
+__slots__ state object. An order is a small int (BUY / SELL / HOLD), so
+the per-bar path does no DataFrame access and allocates nothing; trades
+are rare and equity is computed from them in one vectorized pass, with
+the same arithmetic as VirtualPortfolio.
+"""
+from .vectorized import (
+    STRATEGY_PARAMS, VectorizedResult, rolling_mean, rsi_values
+)
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Tuple, Type
+
+# Orders returned by Strategy.on_bar
+HOLD = 0
+BUY = 1     # open a long position with all cash (no-op while long)
+SELL = -1   # close the position (no-op while flat)
+
+
+class BarArrays:
+    """
+    Contiguous float64 OHLCV arrays for one ticker, plus named indicator
+    columns added by strategies
+    """
+    __slots__ = ("dates", "open", "high", "low", "close", "volume", "columns")
+
+    def __init__(self, dates: pd.DatetimeIndex, open_: np.ndarray, high: np.ndarray,
+                 low: np.ndarray, close: np.ndarray, volume: np.ndarray):
+        self.dates = dates
+        self.open = np.ascontiguousarray(open_, dtype=np.float64)
+        self.high = np.ascontiguousarray(high, dtype=np.float64)
+        self.low = np.ascontiguousarray(low, dtype=np.float64)
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        self.volume = np.ascontiguousarray(volume, dtype=np.float64)
+        self.columns: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> "BarArrays":
+        """Arrays from an OHLCV DataFrame (Open/High/Low/Close/Volume)"""
+        return cls(data.index, data['Open'].to_numpy(), data['High'].to_numpy(),
+                   data['Low'].to_numpy(), data['Close'].to_numpy(),
+                   data['Volume'].to_numpy())
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def add(self, name: str, values: np.ndarray) -> np.ndarray:
+        """Attach an indicator column (one value per bar) and return it"""
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        if len(values) != len(self.close):
+            raise ValueError(f"Column {name} has {len(values)} values, expected {len(self.close)}")
+        self.columns[name] = values
+        return values
+
+
+class BarView:
+    """
+    Cursor over BarArrays passed to on_bar; ``i`` is the current bar
+
+    The same object is reused for every bar; read values as
+    ``bar.close[bar.i]`` or ``bar.columns["rsi"][bar.i]``.
+    """
+    __slots__ = ("i", "dates", "open", "high", "low", "close", "volume", "columns")
+
+    def __init__(self, bars: BarArrays):
+        self.i = 0
+        self.dates = bars.dates
+        self.open = bars.open
+        self.high = bars.high
+        self.low = bars.low
+        self.close = bars.close
+        self.volume = bars.volume
+        self.columns = bars.columns
+
+
+class StrategyState:
+    """
+    Account state maintained by the engine and visible to on_bar
+
+    Strategies that keep their own per-bar state subclass this with
+    extra __slots__ and set Strategy.state_class.
+    """
+    __slots__ = ("cash", "shares", "position", "entry_price")
+
+    def __init__(self, initial_capital: float):
+        self.cash = initial_capital
+        self.shares = 0
+        self.position = False       # True while long (even with 0 shares)
+        self.entry_price = None     # price of the last buy
+
+
+class Strategy:
+    """
+    Base class for event-driven strategies
+
+    Subclasses set ``name`` and default ``params``, compute indicators in
+    prepare() and emit orders from on_bar(). Parameters are available as
+    ``self.params``.
+    """
+
+    name: str = None
+    params: Dict[str, Any] = {}
+    state_class: Type[StrategyState] = StrategyState
+
+    def __init__(self, **params):
+        unknown = set(params) - set(type(self).params)
+        if unknown:
+            raise ValueError(f"Unknown {self.name} parameters: {sorted(unknown)}")
+        self.params = {**type(self).params, **params}
+
+    def prepare(self, bars: BarArrays) -> int:
+        """
+        Precompute indicators over the whole history
+
+        Returns:
+            First bar to call on_bar for (warm-up length)
+        """
+        return 0
+
+    def create_state(self, initial_capital: float) -> StrategyState:
+        return self.state_class(initial_capital)
+
+    def on_bar(self, bar: BarView, state: StrategyState) -> int:
+        """
+        Decide on the current bar; orders fill at its close
+
+        Returns:
+            BUY, SELL or HOLD (None is treated as HOLD)
+        """
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.params})"
+
+
+# Registered strategies by name
+STRATEGY_CLASSES: Dict[str, Type[Strategy]] = {}
+
+
+def register_strategy(cls: Type[Strategy]) -> Type[Strategy]:
+    """Class decorator making a Strategy available to run_backtest by name"""
+    if not cls.name:
+        raise ValueError(f"{cls.__name__} needs a name to be registered")
+    STRATEGY_CLASSES[cls.name] = cls
+    return cls
+
+
+def get_strategy(name: str, params: Dict[str, Any] = None) -> Strategy:
+    """
+    Instantiate a registered strategy
+
+    Raises:
+        ValueError: Unknown strategy or parameter
+    """
+    if name not in STRATEGY_CLASSES:
+        raise ValueError(f"Unknown strategy: {name}")
+    return STRATEGY_CLASSES[name](**(params or {}))
+
+
+@register_strategy
+class BuyAndHold(Strategy):
+    """Buy on the first bar, hold to the end"""
+    name = "buy_and_hold"
+    params = STRATEGY_PARAMS["buy_and_hold"]
+
+    def on_bar(self, bar, state):
+        return BUY if bar.i == 0 else HOLD
+
+
+@register_strategy
+class RSIStrategy(Strategy):
+    """Buy when RSI < oversold, sell when RSI > overbought"""
+    name = "rsi_strategy"
+    params = STRATEGY_PARAMS["rsi_strategy"]
+
+    def prepare(self, bars):
+        period = self.params["period"]
+        self._rsi = bars.add("rsi", rsi_values(bars.close, period))
+        self._oversold = self.params["oversold"]
+        self._overbought = self.params["overbought"]
+        return period
+
+    def on_bar(self, bar, state):
+        rsi = self._rsi[bar.i]
+        if rsi < self._oversold and not state.position:
+            return BUY
+        if rsi > self._overbought and state.position:
+            return SELL
+        return HOLD
+
+
+@register_strategy
+class MACrossover(Strategy):
+    """Golden cross (fast MA crosses above slow) = buy, death cross = sell"""
+    name = "ma_crossover"
+    params = STRATEGY_PARAMS["ma_crossover"]
+
+    def prepare(self, bars):
+        self._fast = bars.add("ma_fast", rolling_mean(bars.close, self.params["fast"]))
+        self._slow = bars.add("ma_slow", rolling_mean(bars.close, self.params["slow"]))
+        return self.params["slow"]
+
+    def on_bar(self, bar, state):
+        i = bar.i
+        fast, slow = self._fast, self._slow
+        if fast[i - 1] < slow[i - 1] and fast[i] > slow[i] and not state.position:
+            return BUY
+        if fast[i - 1] > slow[i - 1] and fast[i] < slow[i] and state.position:
+            return SELL
+        return HOLD
+
+
+def run_event(bars: BarArrays, strategy: Strategy,
+              initial_capital: float) -> VectorizedResult:
+    """
+    Drive a strategy bar by bar
+
+    Args:
+        bars: Bar arrays (indicator columns are added by the strategy)
+        strategy: Strategy instance
+        initial_capital: Starting cash
+
+    Returns:
+        VectorizedResult (same layout and arithmetic as the vectorized
+        and loop engines)
+    """
+    n = len(bars)
+    start = min(strategy.prepare(bars), n)
+    state = strategy.create_state(initial_capital)
+    view = BarView(bars)
+    close = bars.close
+    on_bar = strategy.on_bar
+
+    # Trades: (bar, action, shares, price, profit); cash/shares after each
+    trades: List[Tuple[int, int, int, float, float]] = []
+    event_bars: List[int] = []
+    event_cash = [initial_capital]
+    event_shares = [0]
+
+    def execute(i: int, order: int):
+        price = close[i]
+        if order == BUY:
+            quantity = int(state.cash / price)
+            cost = quantity * price
+            if cost > state.cash:
+                return
+            state.cash -= cost
+            state.shares += quantity
+            state.entry_price = price
+            state.position = True
+            trades.append((i, 1, quantity, price, 0))
+        else:
+            quantity = state.shares
+            state.cash += quantity * price
+            profit = (price - state.entry_price) * quantity \
+                if state.entry_price is not None else 0
+            state.shares -= quantity
+            state.position = False
+            trades.append((i, -1, quantity, price, profit))
+
+    for i in range(start, n):
+        view.i = i
+        order = on_bar(view, state)
+        if order and (order == BUY) != state.position:
+            execute(i, order)
+            event_bars.append(i)
+            event_cash.append(state.cash)
+            event_shares.append(state.shares)
+
+    # Equity after every bar from the trade log; bar 0 of a strategy that
+    # trades immediately is represented by the initial capital
+    record_from = max(start, 1)
+    executed = np.searchsorted(np.asarray(event_bars, dtype=np.int64),
+                               np.arange(record_from, n), side='right')
+    equity = (np.asarray(event_cash, dtype=np.float64)[executed]
+              + np.asarray(event_shares, dtype=np.int64)[executed] * close[record_from:])
+    values = np.concatenate(([initial_capital], equity))
+    returns = (values[1:] - values[:-1]) / values[:-1]
+
+    if n and state.position:
+        execute(n - 1, SELL)
+
+    if trades:
+        bar_, action, quantity, price, profit = zip(*trades)
+    else:
+        bar_ = action = quantity = price = profit = ()
+    return VectorizedResult(
+        portfolio_values=values,
+        returns=returns,
+        trade_bars=np.asarray(bar_, dtype=np.int64),
+        trade_actions=np.asarray(action, dtype=np.int8),
+        trade_shares=np.asarray(quantity, dtype=np.int64),
+        trade_prices=np.asarray(price, dtype=np.float64),
+        trade_profits=np.asarray(profit, dtype=np.float64),
+    )
@@ -0,0 +1,421 @@
+"""
+Precomputed Strategy Matrix
+Nightly batch of every built-in strategy over the watchlist, served to
+the agent tools by index lookup.
+
+The batch job runs the real BacktestEngine for each (ticker, strategy,
+period) and writes one compact table: a structured NumPy array of shape
+(tickers, strategies, periods) holding the headline metrics, saved as a
+single .npz next to the historical cache. Lookups go through three small
+name -> position dicts, so answering a tool call is O(1) with no
+simulation or data loading. Each period window ends at the ticker's last
+cached bar.
+
+Run nightly (after the data refresh) with:
+    python -m services.backtest_engine.data_loader refresh
+    python -m services.backtest_engine.strategy_matrix AAPL MSFT NVDA
+"""
+from .simulator import BacktestEngine, get_backtest_engine
+from services.ingestion_engine.connectors.ohlcv_cache import PERIOD_SLICES
+from services.ingestion_engine.warmup import DEFAULT_WATCHLIST, load_watchlist
+from shared.utils.logger import get_logger
+import numpy as np
+import pandas as pd
+import argparse
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import os
+import sys
+
+# Add shared utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+logger = get_logger("strategy-matrix")
+
+DEFAULT_PERIODS = ("1y", "2y", "5y")
+
+MATRIX_FILE = "strategy_matrix.npz"
+
+# A nightly build plus slack; older matrices are bypassed for live runs
+MAX_MATRIX_AGE_HOURS = 36.0
+
+# One cell per (ticker, strategy, period)
+MATRIX_DTYPE = np.dtype([
+    ('ok', '?'),
+    ('start', 'datetime64[D]'),
+    ('end', 'datetime64[D]'),
+    ('total_return', 'f8'),
+    ('sharpe_ratio', 'f8'),
+    ('max_drawdown', 'f8'),
+    ('win_rate', 'f8'),
+    ('profit_factor', 'f8'),
+    ('buy_hold_return', 'f8'),
+    ('final_value', 'f8'),
+    ('num_trades', 'i4'),
+])
+
+_METRIC_FIELDS = ('total_return', 'sharpe_ratio', 'max_drawdown', 'win_rate',
+                  'profit_factor')
+
+
+def period_start(end: pd.Timestamp, period: str) -> Optional[pd.Timestamp]:
+    """
+    First day of a trailing period ending at end
+
+    Returns:
+        Timestamp, or None for "max"
+
+    Raises:
+        ValueError: Period is not a calendar span (1y, 5y, 6mo, ...)
+    """
+    spec = PERIOD_SLICES.get(period, "")
+    if spec is None:
+        return None
+    if not isinstance(spec, pd.DateOffset):
+        raise ValueError(f"Unsupported backtest period: {period}")
+    return (end - spec).normalize()
+
+
+class StrategyMatrix:
+    """
+    Indexed table of precomputed backtest results
+    """
+
+    def __init__(self, tickers: Sequence[str], strategies: Sequence[str],
+                 periods: Sequence[str], table: np.ndarray,
+                 as_of: str = None, initial_capital: float = 100000.0):
+        """
+        Args:
+            tickers, strategies, periods: Axis labels of table
+            table: MATRIX_DTYPE array of shape (tickers, strategies, periods)
+            as_of: Build timestamp (ISO)
+            initial_capital: Capital every cell was run with
+        """
+        self.tickers = [t.upper() for t in tickers]
+        self.strategies = list(strategies)
+        self.periods = list(periods)
+        if table.shape != (len(self.tickers), len(self.strategies), len(self.periods)):
+            raise ValueError("Table shape does not match its labels")
+        self.table = table
+        self.as_of = as_of
+        self.initial_capital = initial_capital
+        self._ticker_index = {t: i for i, t in enumerate(self.tickers)}
+        self._strategy_index = {s: i for i, s in enumerate(self.strategies)}
+        self._period_index = {p: i for i, p in enumerate(self.periods)}
+
+    def __len__(self) -> int:
+        """Number of successfully computed cells"""
+        return int(self.table['ok'].sum())
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self._ticker_index
+
+    def age_hours(self, now: datetime = None) -> Optional[float]:
+        """Hours since the build (None when as_of is unknown)"""
+        if not self.as_of:
+            return None
+        return ((now or datetime.now()) - datetime.fromisoformat(self.as_of)).total_seconds() / 3600
+
+    def lookup(self, ticker: str, strategy: str, period: str) -> Optional[Dict[str, Any]]:
+        """
+        Precomputed result for one cell
+
+        Returns:
+            dict of dates and metrics, or None if the cell is not in the matrix
+        """
+        i = self._ticker_index.get(ticker.upper())
+        j = self._strategy_index.get(strategy)
+        k = self._period_index.get(period)
+        if i is None or j is None or k is None:
+            return None
+        cell = self.table[i, j, k]
+        if not cell['ok']:
+            return None
+        result = {
+            "ticker": self.tickers[i],
+            "strategy": strategy,
+            "period": period,
+            "start_date": str(cell['start']),
+            "end_date": str(cell['end']),
+        }
+        result.update({name: float(cell[name]) for name in _METRIC_FIELDS})
+        result.update({
+            "buy_hold_return": float(cell['buy_hold_return']),
+            "final_value": float(cell['final_value']),
+            "num_trades": int(cell['num_trades']),
+            "initial_capital": self.initial_capital,
+            "as_of": self.as_of,
+        })
+        return result
+
+    def to_frame(self) -> pd.DataFrame:
+        """All computed cells, one row per (ticker, strategy, period)"""
+        i, j, k = np.nonzero(self.table['ok'])
+        cells = self.table[i, j, k]
+        frame = pd.DataFrame({
+            'ticker': np.asarray(self.tickers, dtype=object)[i],
+            'strategy': np.asarray(self.strategies, dtype=object)[j],
+            'period': np.asarray(self.periods, dtype=object)[k],
+        })
+        for name in MATRIX_DTYPE.names[1:]:
+            frame[name] = cells[name]
+        return frame
+
+    def save(self, path: str):
+        """Write the matrix to one .npz file (atomically replaced)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp.npz"
+        np.savez(tmp, table=self.table,
+                 tickers=np.asarray(self.tickers, dtype=str),
+                 strategies=np.asarray(self.strategies, dtype=str),
+                 periods=np.asarray(self.periods, dtype=str),
+                 as_of=np.asarray(self.as_of or ""),
+                 initial_capital=np.asarray(self.initial_capital))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "StrategyMatrix":
+        """Read a matrix written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['tickers'].tolist(), data['strategies'].tolist(),
+                       data['periods'].tolist(), data['table'],
+                       as_of=str(data['as_of']) or None,
+                       initial_capital=float(data['initial_capital']))
+
+
+def _earliest(end: pd.Timestamp, periods: Sequence[str]) -> Optional[str]:
+    """Earliest start date (YYYY-MM-DD) the periods need (None with max)"""
+    starts = [period_start(end, p) for p in periods]
+    return None if None in starts else min(starts).strftime('%Y-%m-%d')
+
+
+def build_strategy_matrix(tickers: Sequence[str],
+                          engine: BacktestEngine = None,
+                          strategies: Sequence[str] = None,
+                          periods: Sequence[str] = DEFAULT_PERIODS,
+                          initial_capital: float = 100000.0,
+                          on_progress: Callable[[str, int, int], None] = None
+                          ) -> StrategyMatrix:
+    """
+    Run every strategy over every ticker and period with the real engine
+
+    Tickers missing from the historical cache are downloaded first, and
+    history older than the cache is backfilled through DataLoader.get_data
+    (as a live run would). A period is only clamped to the first cached
+    bar when the catalog shows nothing older exists (e.g. a recent IPO);
+    otherwise the cell is left out rather than stored under a longer
+    label than it covers. A failed cell is left out of the index (and
+    logged); the build goes on.
+
+    Args:
+        tickers: Watchlist
+        engine: Backtest engine (default: singleton, with its result cache)
+        strategies: Strategy names (default: all built-in strategies)
+        periods: Trailing periods (1y, 2y, 5y, ... or max)
+        initial_capital: Starting capital per run
+        on_progress: Callback(ticker, done, total) after every ticker
+
+    Returns:
+        StrategyMatrix
+    """
+    engine = engine or get_backtest_engine()
+    loader = engine.data_loader
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    strategies = list(strategies or engine.STRATEGIES)
+    periods = list(periods)
+    # Reject unsupported periods before any work
+    for period in periods:
+        period_start(pd.Timestamp.now(), period)
+    table = np.zeros((len(tickers), len(strategies), len(periods)), dtype=MATRIX_DTYPE)
+    started = time.perf_counter()
+    failures = 0
+
+    for i, ticker in enumerate(tickers):
+        try:
+            if loader.coverage(ticker) is None:
+                loader.get_data(ticker, _earliest(pd.Timestamp.now(), periods))
+            coverage = loader.coverage(ticker)
+            if coverage is None:
+                raise RuntimeError("no historical data")
+            # Windows end at the last cached bar: backfill what they need
+            loader.get_data(ticker, _earliest(pd.Timestamp(coverage['last_date']), periods))
+            coverage = loader.coverage(ticker)
+        except Exception as e:
+            failures += len(strategies) * len(periods)
+            logger.warning("Strategy matrix ticker skipped", ticker=ticker, error=str(e))
+            if on_progress is not None:
+                on_progress(ticker, i + 1, len(tickers))
+            continue
+
+        first = pd.Timestamp(coverage['first_date'])
+        last = pd.Timestamp(coverage['last_date'])
+        for k, period in enumerate(periods):
+            start = period_start(last, period)
+            if start is not None and start < first:
+                if not loader.catalog.covers(ticker, start.strftime('%Y-%m-%d')):
+                    # Backfill failed: don't store a shorter run as this period
+                    failures += len(strategies)
+                    logger.warning("Strategy matrix period skipped: history missing",
+                                   ticker=ticker, period=period,
+                                   first_date=coverage['first_date'])
+                    continue
+            # Nothing older exists (or "max"): start at the first cached bar
+            start = first if start is None or start < first else start
+            start_date, end_date = start.strftime('%Y-%m-%d'), last.strftime('%Y-%m-%d')
+            for j, strategy in enumerate(strategies):
+                result = engine.run_backtest(ticker, strategy, start_date, end_date,
+                                             initial_capital)
+                if result.get("status") != "success":
+                    failures += 1
+                    logger.warning("Strategy matrix cell failed", ticker=ticker,
+                                   strategy=strategy, period=period,
+                                   error=result.get("message"))
+                    continue
+                metrics = result["metrics"]
+                table[i, j, k] = (
+                    True, start_date, end_date,
+                    *(metrics[name] for name in _METRIC_FIELDS),
+                    metrics.get('vs_buy_hold', {}).get('buy_hold_return', np.nan),
+                    result["final_value"], result["num_trades"])
+        if on_progress is not None:
+            on_progress(ticker, i + 1, len(tickers))
+
+    matrix = StrategyMatrix(tickers, strategies, periods, table,
+                            as_of=datetime.now().isoformat(timespec='seconds'),
+                            initial_capital=initial_capital)
+    logger.info("Strategy matrix built", tickers=len(tickers), cells=len(matrix),
+                failed=failures, seconds=round(time.perf_counter() - started, 2))
+    return matrix
+
+
+def default_matrix_path() -> str:
+    """Matrix file next to the singleton DataLoader's cache"""
+    return os.path.join(get_backtest_engine().data_loader.cache_dir, MATRIX_FILE)
+
+
+# Loaded matrix, reloaded when the file changes
+_matrix: Optional[StrategyMatrix] = None
+_matrix_stamp = None
+_matrix_lock = threading.Lock()
+
+
+def get_strategy_matrix(path: str = None) -> Optional[StrategyMatrix]:
+    """
+    Latest saved strategy matrix (reloaded after a nightly rebuild)
+
+    Returns:
+        StrategyMatrix, or None if no matrix has been built
+    """
+    global _matrix, _matrix_stamp
+    path = path or default_matrix_path()
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    stamp = (path, stat.st_mtime_ns, stat.st_size)
+    with _matrix_lock:
+        if stamp != _matrix_stamp:
+            _matrix = StrategyMatrix.load(path)
+            _matrix_stamp = stamp
+        return _matrix
+
+
+def strategy_result(ticker: str, strategy: str, period: str = "1y",
+                    initial_capital: float = 100000.0,
+                    matrix: StrategyMatrix = None,
+                    engine: BacktestEngine = None,
+                    max_age_hours: Optional[float] = MAX_MATRIX_AGE_HOURS
+                    ) -> Dict[str, Any]:
+    """
+    Backtest summary from the matrix, or a live run on a miss
+
+    A matrix older than max_age_hours (e.g. the nightly job stopped) is
+    not served: its windows end at an old last bar, while live runs end
+    today.
+
+    Args:
+        ticker: Stock ticker
+        strategy: Strategy name
+        period: Trailing period (1y, 2y, 5y, ... or max)
+        initial_capital: Starting capital (a live run if it differs from
+            the matrix's)
+        matrix: Matrix to consult (default: get_strategy_matrix())
+        engine: Engine for live runs (default: singleton)
+        max_age_hours: Oldest matrix served (None: no limit)
+
+    Returns:
+        dict of dates and metrics with source "matrix" or "live", or
+        {"status": "error", "message": ...}
+    """
+    matrix = matrix if matrix is not None else get_strategy_matrix()
+    if matrix is not None and max_age_hours is not None:
+        age = matrix.age_hours()
+        if age is None or age > max_age_hours:
+            logger.warning("Strategy matrix is stale, running live",
+                           as_of=matrix.as_of, max_age_hours=max_age_hours)
+            matrix = None
+    if matrix is not None and matrix.initial_capital == initial_capital:
+        cached = matrix.lookup(ticker, strategy, period)
+        if cached is not None:
+            return dict(cached, source="matrix", status="success")
+
+    try:
+        start = period_start(pd.Timestamp.now(), period)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    start_date = start.strftime('%Y-%m-%d') if start is not None else None
+    result = (engine or get_backtest_engine()).run_backtest(
+        ticker, strategy, start_date, None, initial_capital)
+    if result.get("status") != "success":
+        return result
+    metrics = result["metrics"]
+    summary = {
+        "ticker": ticker.upper(),
+        "strategy": strategy,
+        "period": period,
+        "start_date": start_date,
+        "end_date": None,
+    }
+    summary.update({name: metrics[name] for name in _METRIC_FIELDS})
+    summary.update({
+        "buy_hold_return": metrics.get('vs_buy_hold', {}).get('buy_hold_return'),
+        "final_value": result["final_value"],
+        "num_trades": result["num_trades"],
+        "initial_capital": initial_capital,
+        "as_of": datetime.now().isoformat(timespec='seconds'),
+        "source": "live",
+        "status": "success",
+    })
+    return summary
+
+
+def main(argv: List[str] = None):
+    """Command line entry point (nightly matrix build)"""
+    parser = argparse.ArgumentParser(
+        description="Precompute the strategy matrix for the watchlist")
+    parser.add_argument("tickers", nargs="*",
+                        help="Tickers (default: TITAN_WATCHLIST or DEFAULT_WATCHLIST)")
+    parser.add_argument("--periods", nargs="+", default=list(DEFAULT_PERIODS))
+    parser.add_argument("--capital", type=float, default=100000.0)
+    parser.add_argument("--output", default=None,
+                        help=f"Matrix file (default: <cache dir>/{MATRIX_FILE})")
+    args = parser.parse_args(argv)
+
+    def report(ticker, done, total):
+        print(f"  [{done}/{total}] {ticker}")
+
+    tickers = args.tickers or load_watchlist(DEFAULT_WATCHLIST)
+    print(f"🧮 Building strategy matrix for {len(tickers)} tickers...")
+    matrix = build_strategy_matrix(tickers, periods=args.periods,
+                                   initial_capital=args.capital, on_progress=report)
+    path = args.output or default_matrix_path()
+    matrix.save(path)
+    expected = len(matrix.tickers) * len(matrix.strategies) * len(matrix.periods)
+    print(f"✅ {len(matrix)}/{expected} results written to {path}")
+    return 0 if len(matrix) == expected else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
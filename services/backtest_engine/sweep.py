@@ -0,0 +1,223 @@
+"""
+Parallel Parameter Sweeps for Backtest Engine
+Runs a strategy over every combination of a parameter grid (and every
+ticker of a universe) on a process pool.
+
+Close prices are copied once into a shared-memory block; workers attach
+to it at startup and read NumPy views, so tasks carry only a ticker name
+and a list of parameter dicts. Results stream back per chunk as workers
+finish and are collected into a ranked table.
+"""
+from .metrics import PerformanceMetrics
+from .vectorized import run_arrays, run_window, strategy_params
+from shared.utils.logger import get_logger
+import numpy as np
+import pandas as pd
+import itertools
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, Mapping, Sequence, Tuple
+import os
+
+# Add shared utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+logger = get_logger("backtest-sweep")
+
+# Columns reported for every configuration
+SWEEP_METRICS = ("total_return", "sharpe_ratio", "max_drawdown", "win_rate",
+                 "num_trades", "final_value")
+
+
+def expand_grid(param_grid: Mapping[str, Sequence]) -> List[Dict[str, Any]]:
+    """
+    Every combination of a parameter grid
+
+    Args:
+        param_grid: Parameter name -> candidate values
+
+    Returns:
+        List of parameter dicts; the first parameter varies slowest
+    """
+    names = list(param_grid)
+    return [dict(zip(names, values))
+            for values in itertools.product(*(param_grid[n] for n in names))]
+
+
+def _trades(result) -> List[Dict[str, float]]:
+    return [{'profit': p} for p in result.trade_profits.tolist()]
+
+
+# Metric name -> function of a VectorizedResult (run_backtest's formulas)
+_METRIC_FUNCTIONS = {
+    "total_return": lambda r: round(
+        PerformanceMetrics.calculate_total_return(r.portfolio_values), 2),
+    "sharpe_ratio": lambda r: PerformanceMetrics.calculate_sharpe_ratio(r.returns),
+    "max_drawdown": lambda r: PerformanceMetrics.calculate_max_drawdown(r.portfolio_values),
+    "win_rate": lambda r: PerformanceMetrics.calculate_win_rate(_trades(r)),
+    "num_trades": lambda r: len(r.trade_profits),
+    "final_value": lambda r: float(r.portfolio_values[-1]),
+}
+
+
+def evaluate(close: np.ndarray, strategy: str, params: Dict[str, Any],
+             initial_capital: float, cache: Dict[tuple, np.ndarray] = None,
+             window: Tuple[int, int] = None,
+             metrics: Sequence[str] = SWEEP_METRICS) -> Dict[str, Any]:
+    """
+    Metrics for one configuration (same formulas as run_backtest's report)
+
+    Args:
+        close: Close prices
+        strategy: Strategy name
+        params: Strategy parameters
+        initial_capital: Starting cash
+        cache: Indicator cache shared by configurations on the same close
+        window: Evaluate only bars [lo, hi) (see run_window)
+        metrics: Subset of SWEEP_METRICS to compute
+
+    Returns:
+        dict with the requested metrics
+    """
+    if window is None:
+        result = run_arrays(close, strategy, initial_capital, params, cache)
+    else:
+        result = run_window(close, strategy, initial_capital, *window, params, cache)
+    return {name: _METRIC_FUNCTIONS[name](result) for name in metrics}
+
+
+class SharedPriceArrays:
+    """
+    Close-price arrays of a universe packed into one shared-memory block
+
+    Use as a context manager in the parent process; workers call
+    attach(spec) to get zero-copy views.
+    """
+
+    def __init__(self, closes: Mapping[str, np.ndarray]):
+        """
+        Args:
+            closes: Ticker -> close prices
+        """
+        self.tickers = list(closes)
+        lengths = [len(closes[t]) for t in self.tickers]
+        self.offsets = np.concatenate(([0], np.cumsum(lengths))).tolist()
+        nbytes = max(self.offsets[-1], 1) * 8
+        self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        buffer = np.ndarray(self.offsets[-1], dtype=np.float64, buffer=self.shm.buf)
+        for ticker, lo, hi in zip(self.tickers, self.offsets, self.offsets[1:]):
+            buffer[lo:hi] = closes[ticker]
+
+    @property
+    def spec(self) -> Tuple[str, List[str], List[int]]:
+        """Picklable handle passed to workers"""
+        return self.shm.name, self.tickers, self.offsets
+
+    @staticmethod
+    def attach(spec) -> Tuple[shared_memory.SharedMemory, Dict[str, np.ndarray]]:
+        """Open the block and return (handle, ticker -> read-only view)"""
+        name, tickers, offsets = spec
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+        buffer = np.ndarray(offsets[-1], dtype=np.float64, buffer=shm.buf)
+        buffer.flags.writeable = False
+        views = {t: buffer[lo:hi] for t, lo, hi in zip(tickers, offsets, offsets[1:])}
+        return shm, views
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedPriceArrays":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Per-process state set by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(spec):
+    _worker["shm"], _worker["closes"] = SharedPriceArrays.attach(spec)
+
+
+def _run_chunk(ticker: str, strategy: str, configs: List[Dict[str, Any]],
+               initial_capital: float, closes: Mapping[str, np.ndarray] = None):
+    """Evaluate a chunk of configurations for one ticker"""
+    close = (closes or _worker["closes"])[ticker]
+    cache: Dict[tuple, np.ndarray] = {}
+    return [{"ticker": ticker, **params,
+             **evaluate(close, strategy, params, initial_capital, cache)}
+            for params in configs]
+
+
+def iter_sweep(closes: Mapping[str, np.ndarray], strategy: str,
+               param_grid: Mapping[str, Sequence],
+               initial_capital: float = 100000.0,
+               max_workers: int = None,
+               chunk_size: int = None) -> Iterator[Dict[str, Any]]:
+    """
+    Evaluate a parameter grid, yielding rows as they complete
+
+    Args:
+        closes: Ticker -> close prices
+        strategy: Strategy name
+        param_grid: Parameter name -> candidate values
+        initial_capital: Starting cash
+        max_workers: Worker processes (default: CPU count; 1 runs inline)
+        chunk_size: Configurations per task (default: ~4 tasks per worker)
+
+    Yields:
+        dict with ticker, the parameters and SWEEP_METRICS
+
+    Raises:
+        ValueError: Unknown strategy or parameter
+    """
+    configs = expand_grid(param_grid)
+    for params in configs:
+        strategy_params(strategy, params)
+    max_workers = max_workers or os.cpu_count() or 1
+    tasks = len(configs) * len(closes)
+    if not tasks:
+        return
+
+    if max_workers == 1:
+        for ticker in closes:
+            yield from _run_chunk(ticker, strategy, configs, initial_capital, closes)
+        return
+
+    chunk_size = chunk_size or min(256, max(1, math.ceil(tasks / (max_workers * 4))))
+    with SharedPriceArrays(closes) as shared, ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker,
+            initargs=(shared.spec,)) as pool:
+        futures = [pool.submit(_run_chunk, ticker, strategy,
+                               configs[i:i + chunk_size], initial_capital)
+                   for ticker in closes
+                   for i in range(0, len(configs), chunk_size)]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def rank_results(rows: Sequence[Dict[str, Any]],
+                 rank_by: str = "sharpe_ratio",
+                 ascending: bool = False) -> pd.DataFrame:
+    """
+    Rows sorted best-first with a 1-based rank column
+
+    Ties are broken by ticker and parameters, so the table does not
+    depend on the order in which workers finished.
+    """
+    table = pd.DataFrame(list(rows))
+    if table.empty:
+        return table
+    keys = [rank_by] + [c for c in table.columns if c not in SWEEP_METRICS]
+    table = table.sort_values(
+        keys, ascending=[ascending] + [True] * (len(keys) - 1), kind="stable")
+    table.insert(0, "rank", np.arange(1, len(table) + 1))
+    return table.reset_index(drop=True)
@@ -0,0 +1,329 @@
+"""
+Vectorized Backtest Execution
+Array implementation of the BacktestEngine strategies. Signals are NumPy
+arrays, the holding state is a forward fill of the last buy/sell signal,
+and the equity curve is cash + shares * close over per-bar state arrays.
+Only the (few) trades are walked in Python, using the same arithmetic as
+VirtualPortfolio, so results are identical to the bar-by-bar engine.
+Indicators come from shared.utils.indicators, the kernels also used by
+live streaming and the agent tools.
+"""
+from shared.utils import indicators
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Default strategy parameters (the bar-by-bar engine's fixed settings)
+RSI_PERIOD = 14
+MA_FAST = 50
+MA_SLOW = 200
+
+STRATEGY_PARAMS: Dict[str, Dict[str, Any]] = {
+    "buy_and_hold": {},
+    "rsi_strategy": {"period": RSI_PERIOD, "oversold": 30, "overbought": 70},
+    "ma_crossover": {"fast": MA_FAST, "slow": MA_SLOW},
+}
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean, NaN until the window fills (shared sma kernel)"""
+    return indicators.sma(values, window)
+
+
+def rsi_values(close: np.ndarray, window: int = RSI_PERIOD) -> np.ndarray:
+    """Wilder RSI used by the rsi_strategy backtest (shared rsi kernel)"""
+    return indicators.rsi(close, window)
+
+
+def rsi_indicator(close: pd.Series, window: int = RSI_PERIOD) -> pd.Series:
+    """rsi_values as a Series aligned with close"""
+    return pd.Series(rsi_values(close.to_numpy(dtype=np.float64), window),
+                     index=close.index)
+
+
+def moving_average(close: pd.Series, window: int) -> pd.Series:
+    return pd.Series(rolling_mean(close.to_numpy(dtype=np.float64), window),
+                     index=close.index)
+
+
+def holding_state(buy: np.ndarray, sell: np.ndarray) -> np.ndarray:
+    """
+    Position after each bar for a long/flat state machine
+
+    Buying while long and selling while flat are no-ops, so the state
+    after a bar is simply the type of the most recent signal.
+
+    Args:
+        buy: Boolean buy signals
+        sell: Boolean sell signals (never set together with buy)
+
+    Returns:
+        Boolean array, True while long
+    """
+    signal = np.where(buy, 1, np.where(sell, -1, 0))
+    last = np.where(signal != 0, np.arange(len(signal)), -1)
+    np.maximum.accumulate(last, out=last)
+    return (last >= 0) & (signal[np.maximum(last, 0)] == 1)
+
+
+class VectorizedResult(NamedTuple):
+    """Backtest output in array form"""
+    portfolio_values: np.ndarray    # initial capital, then one value per recorded bar
+    returns: np.ndarray             # bar-over-bar returns of portfolio_values
+    trade_bars: np.ndarray          # bar index of each trade
+    trade_actions: np.ndarray       # 1 = BUY, -1 = SELL
+    trade_shares: np.ndarray
+    trade_prices: np.ndarray
+    trade_profits: np.ndarray
+
+    def trades(self, dates: pd.DatetimeIndex) -> List[dict]:
+        """Trades as VirtualPortfolio-style dicts"""
+        return [{
+            'date': dates[bar].strftime('%Y-%m-%d'),
+            'action': 'BUY' if action == 1 else 'SELL',
+            'shares': int(shares),
+            'price': price,
+            'value': shares * price,
+            'profit': profit if action == -1 else 0,
+        } for bar, action, shares, price, profit in zip(
+            self.trade_bars.tolist(), self.trade_actions.tolist(),
+            self.trade_shares.tolist(), self.trade_prices.tolist(),
+            self.trade_profits.tolist())]
+
+    @property
+    def final_value(self) -> float:
+        return self.portfolio_values[-1]
+
+
+def simulate(close: np.ndarray, holding: np.ndarray, start: int,
+             initial_capital: float,
+             record_from: int = None) -> VectorizedResult:
+    """
+    Execute a long/flat position series with all-in buys
+
+    Trades happen at the close of the bar where the state flips; the
+    portfolio is valued after every bar from ``record_from`` on, and a
+    position still open on the last bar is sold after the final valuation.
+
+    Args:
+        close: Close prices
+        holding: Desired position for bars start..n-1
+        start: First tradable bar
+        initial_capital: Starting cash
+        record_from: First valued bar (default: start)
+
+    Returns:
+        VectorizedResult
+    """
+    n = len(close)
+    record_from = start if record_from is None else record_from
+    state = np.zeros(n + 1, dtype=bool)
+    state[start + 1:] = holding
+    flips = np.flatnonzero(state[1:] != state[:-1])
+
+    # Walk the trades with VirtualPortfolio's arithmetic
+    cash, shares, last_buy = initial_capital, 0, None
+    event_cash = [cash]
+    event_shares = [0]
+    trades: List[Tuple[int, int, int, float, float]] = []
+
+    def execute(bar: int, buy: bool):
+        nonlocal cash, shares, last_buy
+        price = close[bar]
+        if buy:
+            quantity = int(cash / price)
+            cost = quantity * price
+            if cost > cash:
+                return
+            cash -= cost
+            shares += quantity
+            last_buy = price
+            trades.append((bar, 1, quantity, price, 0))
+        else:
+            quantity = shares
+            cash += quantity * price
+            profit = (price - last_buy) * quantity if last_buy is not None else 0
+            shares -= quantity
+            trades.append((bar, -1, quantity, price, profit))
+
+    for bar in flips.tolist():
+        execute(bar, bool(state[bar + 1]))
+        event_cash.append(cash)
+        event_shares.append(shares)
+
+    bars = np.arange(record_from, n)
+    executed = np.searchsorted(flips, bars, side='right')
+    equity = (np.asarray(event_cash, dtype=np.float64)[executed]
+              + np.asarray(event_shares, dtype=np.int64)[executed] * close[record_from:])
+    values = np.concatenate(([initial_capital], equity))
+    returns = (values[1:] - values[:-1]) / values[:-1]
+
+    if n and state[n]:
+        execute(n - 1, False)
+
+    if trades:
+        bar_, action, quantity, price, profit = zip(*trades)
+    else:
+        bar_ = action = quantity = price = profit = ()
+    return VectorizedResult(
+        portfolio_values=values,
+        returns=returns,
+        trade_bars=np.asarray(bar_, dtype=np.int64),
+        trade_actions=np.asarray(action, dtype=np.int8),
+        trade_shares=np.asarray(quantity, dtype=np.int64),
+        trade_prices=np.asarray(price, dtype=np.float64),
+        trade_profits=np.asarray(profit, dtype=np.float64),
+    )
+
+
+def strategy_params(strategy: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Defaults for strategy overlaid with params
+
+    Raises:
+        ValueError: Unknown strategy or parameter
+    """
+    if strategy not in STRATEGY_PARAMS:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    merged = dict(STRATEGY_PARAMS[strategy])
+    unknown = set(params or ()) - set(merged)
+    if unknown:
+        raise ValueError(f"Unknown {strategy} parameters: {sorted(unknown)}")
+    merged.update(params or {})
+    return merged
+
+
+def indicator_keys(strategy: str, params: Dict[str, Any]) -> List[Tuple[str, int]]:
+    """Indicator arrays (kind, window) a configuration reads"""
+    if strategy == "rsi_strategy":
+        return [("rsi", params["period"])]
+    if strategy == "ma_crossover":
+        return [("ma", params["fast"]), ("ma", params["slow"])]
+    return []
+
+
+def compute_indicator(close: np.ndarray, key: Tuple[str, int]) -> np.ndarray:
+    """Full-history indicator array for an indicator_keys entry"""
+    kind, window = key
+    return rsi_values(close, window) if kind == "rsi" else rolling_mean(close, window)
+
+
+def strategy_signals(close: np.ndarray, strategy: str, params: Dict[str, Any],
+                     cache: Dict[tuple, np.ndarray],
+                     lo: int = 0, hi: int = None) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Buy/sell signals of a configuration over bars [start, hi)
+
+    Indicators come from (or are added to) ``cache`` and are computed over
+    the whole close array, so a window only slices them.
+
+    Args:
+        close: Close prices
+        strategy: Strategy name
+        params: Complete strategy parameters (see strategy_params)
+        cache: (kind, window) -> indicator array over close
+        lo: First bar of the window
+        hi: End of the window (default: len(close))
+
+    Returns:
+        (buy, sell, start) where start >= lo is the first bar with a
+        valid signal
+    """
+    hi = len(close) if hi is None else hi
+    for key in indicator_keys(strategy, params):
+        if key not in cache:
+            cache[key] = compute_indicator(close, key)
+
+    if strategy == "buy_and_hold":
+        return np.ones(hi - lo, dtype=bool), np.zeros(hi - lo, dtype=bool), lo
+
+    if strategy == "rsi_strategy":
+        start = min(max(lo, params["period"]), hi)
+        rsi = cache[("rsi", params["period"])][start:hi]
+        return rsi < params["oversold"], rsi > params["overbought"], start
+
+    # ma_crossover
+    start = min(max(lo, params["slow"]), hi)
+    fast = cache[("ma", params["fast"])]
+    slow = cache[("ma", params["slow"])]
+    fast_now, slow_now = fast[start:hi], slow[start:hi]
+    fast_prev, slow_prev = fast[start - 1:hi - 1], slow[start - 1:hi - 1]
+    golden = (fast_prev < slow_prev) & (fast_now > slow_now)
+    death = (fast_prev > slow_prev) & (fast_now < slow_now)
+    return golden, death, start
+
+
+def run_arrays(close: np.ndarray, strategy: str, initial_capital: float,
+               params: Dict[str, Any] = None,
+               cache: Dict[tuple, np.ndarray] = None) -> VectorizedResult:
+    """
+    Run a strategy on a close-price array
+
+    Args:
+        close: float64 close prices
+        strategy: buy_and_hold, rsi_strategy or ma_crossover
+        initial_capital: Starting cash
+        params: Overrides of STRATEGY_PARAMS[strategy]
+        cache: Optional dict reused across calls on the same close array
+            to share indicator arrays (e.g. one RSI per period in a sweep)
+
+    Returns:
+        VectorizedResult
+    """
+    p = strategy_params(strategy, params)
+    cache = {} if cache is None else cache
+    buy, sell, start = strategy_signals(close, strategy, p, cache)
+    # Buy-and-hold buys on the first bar and is valued from the second
+    record_from = 1 if strategy == "buy_and_hold" else start
+    return simulate(close, holding_state(buy, sell), start, initial_capital,
+                    record_from=record_from)
+
+
+def run_window(close: np.ndarray, strategy: str, initial_capital: float,
+               lo: int, hi: int,
+               params: Dict[str, Any] = None,
+               cache: Dict[tuple, np.ndarray] = None) -> VectorizedResult:
+    """
+    Run a strategy on bars [lo, hi) of a longer history
+
+    Indicators are those of the full history (no warm-up inside the
+    window); the strategy starts flat at lo, every bar of the window is
+    valued, and an open position is closed on its last bar.
+
+    Args:
+        close: Full-history close prices
+        strategy: Strategy name
+        initial_capital: Cash at bar lo
+        lo: First bar of the window
+        hi: End of the window (exclusive)
+        params: Strategy parameter overrides
+        cache: Full-history indicator cache shared across windows
+
+    Returns:
+        VectorizedResult with bar indices relative to lo
+    """
+    p = strategy_params(strategy, params)
+    cache = {} if cache is None else cache
+    buy, sell, start = strategy_signals(close, strategy, p, cache, lo, hi)
+    return simulate(close[lo:hi], holding_state(buy, sell), start - lo,
+                    initial_capital, record_from=0)
+
+
+def run_strategy(data: pd.DataFrame, strategy: str, initial_capital: float,
+                 params: Dict[str, Any] = None) -> Optional[VectorizedResult]:
+    """
+    Vectorized equivalent of BacktestEngine's _execute_* methods
+
+    Args:
+        data: OHLCV DataFrame
+        strategy: buy_and_hold, rsi_strategy or ma_crossover
+        initial_capital: Starting cash
+        params: Strategy parameter overrides (see STRATEGY_PARAMS)
+
+    Returns:
+        VectorizedResult, or None for an unknown strategy
+    """
+    if strategy not in STRATEGY_PARAMS:
+        return None
+    return run_arrays(data['Close'].to_numpy(dtype=np.float64), strategy,
+                      initial_capital, params)
@@ -0,0 +1,196 @@
+"""
+Walk-Forward Optimization for Backtest Engine
+Rolling (or anchored) in-sample / out-of-sample validation of a
+strategy's parameter grid.
+
+Every indicator the grid needs is computed once over the full history;
+windows are index ranges into those arrays, so no window reloads data or
+recomputes an indicator. In-sample optimizations are independent and run
+on a process pool with the close and indicator arrays in shared memory.
+Each window's best parameters then trade the following out-of-sample
+window, carrying equity forward into one stitched OOS curve.
+"""
+from .metrics import PerformanceMetrics
+from .sweep import SWEEP_METRICS, SharedPriceArrays, evaluate, expand_grid
+from .vectorized import compute_indicator, indicator_keys, run_window, strategy_params
+from shared.utils.logger import get_logger
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Mapping, NamedTuple, Sequence, Tuple
+import os
+import sys
+
+# Add shared utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+logger = get_logger("walk-forward")
+
+
+class WalkForwardResult(NamedTuple):
+    """Walk-forward output"""
+    windows: pd.DataFrame        # one row per window: ranges, best params, IS/OOS metrics
+    equity: np.ndarray           # stitched out-of-sample portfolio values
+    equity_bars: np.ndarray      # bar index of each equity value
+    trade_profits: np.ndarray    # out-of-sample closed-trade profits
+
+
+def walk_forward_windows(n_bars: int, train_bars: int, test_bars: int,
+                         anchored: bool = False) -> List[Tuple[int, int, int, int]]:
+    """
+    Consecutive train/test splits
+
+    Test windows tile the history after the first training window;
+    the last one may be shorter.
+
+    Args:
+        n_bars: History length
+        train_bars: In-sample length (minimum length when anchored)
+        test_bars: Out-of-sample length (and step)
+        anchored: Grow the training window from bar 0 instead of rolling
+
+    Returns:
+        List of (train_lo, train_hi, test_lo, test_hi)
+    """
+    if train_bars <= 0 or test_bars <= 0:
+        raise ValueError("train_bars and test_bars must be positive")
+    return [(0 if anchored else lo - train_bars, lo, lo, min(lo + test_bars, n_bars))
+            for lo in range(train_bars, n_bars, test_bars)]
+
+
+def precompute_indicators(close: np.ndarray, strategy: str,
+                          configs: Sequence[Dict[str, Any]]) -> Dict[tuple, np.ndarray]:
+    """Every indicator array the configurations read, over the full history"""
+    keys = dict.fromkeys(key for params in configs
+                         for key in indicator_keys(strategy, strategy_params(strategy, params)))
+    return {key: compute_indicator(close, key) for key in keys}
+
+
+def _array_name(key: tuple) -> str:
+    return f"{key[0]}:{key[1]}"
+
+
+def optimize_window(close: np.ndarray, strategy: str, configs: Sequence[Dict[str, Any]],
+                    window: Tuple[int, int], initial_capital: float,
+                    cache: Dict[tuple, np.ndarray],
+                    rank_by: str = "sharpe_ratio") -> Dict[str, Any]:
+    """
+    Best configuration on one in-sample window
+
+    Configurations are scored on rank_by alone; the full metrics are
+    computed for the winner only. Ties keep the earliest configuration
+    in grid order.
+
+    Returns:
+        dict with "params" and the in-sample SWEEP_METRICS
+    """
+    best, best_score = None, None
+    for params in configs:
+        score = evaluate(close, strategy, params, initial_capital, cache, window,
+                         metrics=(rank_by,))[rank_by]
+        if best is None or score > best_score:
+            best, best_score = params, score
+    return {"params": best,
+            **evaluate(close, strategy, best, initial_capital, cache, window)}
+
+
+# Per-process state set by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(spec):
+    _worker["shm"], arrays = SharedPriceArrays.attach(spec)
+    _worker["close"] = arrays.pop("close")
+    cache = {}
+    for name, view in arrays.items():
+        kind, window = name.split(":")
+        cache[(kind, int(window))] = view
+    _worker["cache"] = cache
+
+
+def _optimize_task(index: int, strategy: str, configs: List[Dict[str, Any]],
+                   window: Tuple[int, int], initial_capital: float, rank_by: str):
+    return index, optimize_window(_worker["close"], strategy, configs, window,
+                                  initial_capital, _worker["cache"], rank_by)
+
+
+def walk_forward(close: np.ndarray, strategy: str,
+                 param_grid: Mapping[str, Sequence],
+                 train_bars: int, test_bars: int,
+                 initial_capital: float = 100000.0,
+                 anchored: bool = False,
+                 rank_by: str = "sharpe_ratio",
+                 max_workers: int = None) -> WalkForwardResult:
+    """
+    Optimize on each training window, trade the next test window
+
+    Args:
+        close: Full-history close prices
+        strategy: Strategy name
+        param_grid: Parameter name -> candidate values
+        train_bars: In-sample bars per window
+        test_bars: Out-of-sample bars per window
+        initial_capital: Starting cash of the stitched OOS run
+        anchored: Expanding instead of rolling training windows
+        rank_by: In-sample metric to maximize (see SWEEP_METRICS)
+        max_workers: Worker processes (default: CPU count; 1 runs inline)
+
+    Returns:
+        WalkForwardResult
+
+    Raises:
+        ValueError: Unknown strategy, parameter or metric, or a history
+            too short for a single window
+    """
+    if rank_by not in SWEEP_METRICS:
+        raise ValueError(f"Unknown metric: {rank_by}")
+    configs = expand_grid(param_grid)
+    windows = walk_forward_windows(len(close), train_bars, test_bars, anchored)
+    if not configs or not windows:
+        raise ValueError("Need at least one configuration and one window")
+    cache = precompute_indicators(close, strategy, configs)
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(windows))
+    best: List[Dict[str, Any]] = [None] * len(windows)
+    if max_workers == 1:
+        for i, (train_lo, train_hi, _, _) in enumerate(windows):
+            best[i] = optimize_window(close, strategy, configs, (train_lo, train_hi),
+                                      initial_capital, cache, rank_by)
+    else:
+        arrays = {"close": close, **{_array_name(k): v for k, v in cache.items()}}
+        with SharedPriceArrays(arrays) as shared, ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_worker,
+                initargs=(shared.spec,)) as pool:
+            futures = [pool.submit(_optimize_task, i, strategy, configs,
+                                   (train_lo, train_hi), initial_capital, rank_by)
+                       for i, (train_lo, train_hi, _, _) in enumerate(windows)]
+            for future in futures:
+                i, row = future.result()
+                best[i] = row
+
+    # Out-of-sample runs chain equity from one window to the next
+    rows, curves, profits = [], [], []
+    capital = initial_capital
+    for (train_lo, train_hi, test_lo, test_hi), chosen in zip(windows, best):
+        run = run_window(close, strategy, capital, test_lo, test_hi,
+                         chosen["params"], cache)
+        values = run.portfolio_values
+        curves.append(values[1:])
+        profits.append(run.trade_profits[run.trade_actions == -1])
+        rows.append({
+            "train_start": train_lo, "train_end": train_hi,
+            "test_start": test_lo, "test_end": test_hi,
+            **chosen["params"],
+            **{f"is_{k}": chosen[k] for k in SWEEP_METRICS},
+            "oos_return": round(PerformanceMetrics.calculate_total_return(values), 2),
+            "oos_trades": int((run.trade_actions == -1).sum()),
+        })
+        capital = float(values[-1])
+
+    logger.info("Walk-forward optimized", strategy=strategy, windows=len(windows),
+                configurations=len(configs), indicators=len(cache))
+    return WalkForwardResult(
+        windows=pd.DataFrame(rows),
+        equity=np.concatenate(curves),
+        equity_bars=np.arange(windows[0][2], windows[-1][3]),
+        trade_profits=np.concatenate(profits))
@@ -1,4 +1,12 @@
 """Ingestion Engine Service"""
-from .connectors import MarketDataConnector, get_connector
+from .connectors import (
+    MarketDataConnector, get_connector,
+    AsyncMarketDataConnector, get_async_connector
+)
 
-__all__ = ['MarketDataConnector', 'get_connector']
+__all__ = [
+    'MarketDataConnector',
+    'get_connector',
+    'AsyncMarketDataConnector',
+    'get_async_connector',
+]
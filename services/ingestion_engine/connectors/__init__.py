@@ -1,4 +1,21 @@
 """Market data connectors package"""
-from .yfinance_connector import MarketDataConnector, get_connector
+from .yfinance_connector import MarketDataConnector, YFinanceSource, get_connector
+from .async_connector import AsyncMarketDataConnector, get_async_connector
+from .ohlcv_columns import OHLCVColumns
+from .quote_snapshot import QuoteSnapshotService, get_quote_service
+from .replay import RecordingSource, ReplayArchive, ReplaySource, source_from_env
 
-__all__ = ['MarketDataConnector', 'get_connector']
+__all__ = [
+    'MarketDataConnector',
+    'YFinanceSource',
+    'get_connector',
+    'AsyncMarketDataConnector',
+    'get_async_connector',
+    'OHLCVColumns',
+    'QuoteSnapshotService',
+    'get_quote_service',
+    'RecordingSource',
+    'ReplayArchive',
+    'ReplaySource',
+    'source_from_env',
+]
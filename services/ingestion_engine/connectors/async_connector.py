@@ -0,0 +1,185 @@
+"""
+Asyncio Market Data Connector
+Async front end for MarketDataConnector used by parallel sub-agent tool
+calls. Identical in-flight requests are coalesced into one fetch
+(single-flight) and calls into the blocking data source run on a bounded
+executor, which caps concurrent requests per source.
+"""
+from .yfinance_connector import MarketDataConnector, get_connector
+from shared.utils.errors import DataFetchError
+from shared.utils.logger import get_logger
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Callable, Dict, Hashable, List
+import os
+import sys
+
+# Add shared utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+logger = get_logger("ingestion-engine-async")
+
+
+class AsyncMarketDataConnector:
+    """
+    Async, request-coalescing wrapper around MarketDataConnector
+
+    Shares the wrapped connector's OHLCV cache, so sequential requests hit
+    the cache and concurrent ones share a single in-flight fetch. In-flight
+    requests are tracked with thread-safe futures, so coalescing also works
+    across event loops running in different threads.
+    """
+
+    def __init__(self, connector: MarketDataConnector = None,
+                 max_concurrency: int = 4):
+        """
+        Initialize async connector
+
+        Args:
+            connector: Synchronous connector to wrap (default: singleton)
+            max_concurrency: Maximum concurrent requests against the source
+        """
+        self.connector = connector or get_connector()
+        self.max_concurrency = max_concurrency
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="titan-market-data")
+        self._inflight: Dict[Hashable, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.coalesced = 0
+        logger.info("AsyncMarketDataConnector initialized",
+                    max_concurrency=max_concurrency)
+
+    async def _single_flight(self, key: Hashable,
+                             fn: Callable[..., Any], *args) -> Any:
+        """
+        Run fn(*args) once per key among concurrent callers
+
+        The first caller (leader) schedules the fetch; everyone else awaits
+        the leader's future.
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._inflight[key] = future
+                self.fetches += 1
+            else:
+                self.coalesced += 1
+
+        if leader:
+            loop = asyncio.get_running_loop()
+            try:
+                result = await loop.run_in_executor(self._executor, fn, *args)
+                future.set_result(result)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+
+        return await asyncio.wrap_future(future)
+
+    async def get_ohlcv(self, ticker: str, period: str = "1mo",
+                        layout: str = "records") -> dict:
+        """
+        Fetch OHLCV data for ticker
+
+        Args:
+            ticker: Stock symbol (e.g., AAPL, TSLA)
+            period: Time period (1d, 5d, 1mo, 3mo, 6mo, 1y, 5y)
+            layout: "records" or "columns" (see MarketDataConnector.get_ohlcv)
+
+        Returns:
+            dict with ticker, data, current_price, volume_avg, 52w high/low
+        """
+        # Coalesce on the columnar result; records are a view of it
+        result = await self._single_flight(
+            ("ohlcv", ticker.upper(), period),
+            self.connector.get_ohlcv, ticker, period, True, "columns")
+        if layout == "records":
+            result = dict(result, data=result["data"].rows.to_list())
+        return result
+
+    async def get_historical_data(self, ticker: str, period: str = "1mo",
+                                  layout: str = "records") -> dict:
+        """Alias for get_ohlcv (mirrors MarketDataConnector)"""
+        return await self.get_ohlcv(ticker, period, layout)
+
+    async def get_realtime_price(self, ticker: str) -> float:
+        """
+        Get current price
+
+        Shares the in-flight 1d fetch with concurrent get_ohlcv(ticker, "1d").
+
+        Args:
+            ticker: Stock symbol
+
+        Returns:
+            Current price as float
+        """
+        data = await self.get_ohlcv(ticker, period="1d", layout="columns")
+        return data.get("current_price")
+
+    async def get_multiple_tickers(self, tickers: List[str],
+                                   period: str = "1mo",
+                                   layout: str = "records") -> dict:
+        """
+        Fetch several tickers concurrently
+
+        Args:
+            tickers: List of stock symbols
+            period: Time period
+            layout: "records" or "columns"
+
+        Returns:
+            dict mapping ticker -> data (or {"error": ...})
+        """
+        unique = list(dict.fromkeys(tickers))
+        responses = await asyncio.gather(
+            *(self.get_ohlcv(ticker, period, layout) for ticker in unique),
+            return_exceptions=True)
+
+        results = {}
+        for ticker, response in zip(unique, responses):
+            if isinstance(response, DataFetchError):
+                logger.warning(f"Failed to fetch {ticker}",
+                               ticker=ticker, error=str(response))
+                results[ticker] = {"error": str(response)}
+            elif isinstance(response, BaseException):
+                raise response
+            else:
+                results[ticker] = response
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """Single-flight counters plus the shared cache statistics"""
+        return {
+            "fetches": self.fetches,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+            "max_concurrency": self.max_concurrency,
+            "cache": self.connector.cache_stats(),
+        }
+
+    def close(self):
+        """Shut down the executor"""
+        self._executor.shutdown(wait=False)
+
+
+# Singleton instance
+_async_connector = None
+
+
+def get_async_connector() -> AsyncMarketDataConnector:
+    """Get or create singleton async connector instance"""
+    global _async_connector
+    if _async_connector is None:
+        _async_connector = AsyncMarketDataConnector()
+    return _async_connector
@@ -0,0 +1,181 @@
+"""
+Period-aware OHLCV cache for MarketDataConnector
+Frames are keyed by (ticker, period), expire on a per-period TTL, and a
+longer cached period can answer a shorter request by slicing.
+"""
+from shared.utils.cache import ByteLRUCache
+import pandas as pd
+import threading
+import time
+from typing import Dict, Optional, Tuple
+import os
+import sys
+
+# Add shared utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+# Seconds a fetched frame stays fresh, by period. Short periods are used
+# for "current price" style questions and go stale quickly.
+DEFAULT_PERIOD_TTLS = {
+    "1d": 60,
+    "5d": 5 * 60,
+    "1mo": 15 * 60,
+    "3mo": 30 * 60,
+    "6mo": 60 * 60,
+    "ytd": 2 * 60 * 60,
+    "1y": 2 * 60 * 60,
+    "2y": 4 * 60 * 60,
+    "5y": 12 * 60 * 60,
+    "10y": 12 * 60 * 60,
+    "max": 12 * 60 * 60,
+}
+
+# How to cut a shorter period out of a longer frame: a trailing bar count
+# or a calendar offset back from now (mirrors yfinance's period semantics)
+PERIOD_SLICES = {
+    "1d": 1,
+    "5d": 5,
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "ytd": "ytd",
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+    "max": None,
+}
+
+# Periods ordered by span; an entry can answer any request to its left
+PERIOD_ORDER = ["1d", "5d", "1mo", "3mo", "6mo", "ytd", "1y", "2y", "5y", "10y", "max"]
+
+
+def slice_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """
+    Cut the trailing ``period`` out of a longer OHLCV frame
+
+    Args:
+        df: Frame covering at least ``period``
+        period: Target period (1d, 5d, 1mo, ... max)
+
+    Returns:
+        Sliced frame (a view where pandas allows)
+    """
+    spec = PERIOD_SLICES.get(period)
+    if spec is None:
+        return df
+    if isinstance(spec, int):
+        return df.iloc[-spec:]
+
+    now = pd.Timestamp.now(tz=df.index.tz)
+    if spec == "ytd":
+        start = now.normalize().replace(month=1, day=1)
+    else:
+        start = (now - spec).normalize()
+    return df.loc[df.index >= start]
+
+
+class OHLCVCache:
+    """
+    TTL + byte-bounded LRU cache of OHLCV DataFrames
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024,
+                 ttls: Dict[str, float] = None):
+        """
+        Initialize cache
+
+        Args:
+            max_bytes: Memory budget across all cached frames
+            ttls: Per-period TTL overrides in seconds
+        """
+        self.ttls = dict(DEFAULT_PERIOD_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self._frames = ByteLRUCache(max_bytes)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.subsumed_hits = 0
+        self.misses = 0
+        self.expirations = 0
+
+    def _ttl(self, period: str) -> float:
+        return self.ttls.get(period, self.ttls["1mo"])
+
+    def _candidates(self, period: str):
+        """Periods whose cached frame could answer a request for period"""
+        if period not in PERIOD_ORDER:
+            return [period]
+        candidates = PERIOD_ORDER[PERIOD_ORDER.index(period):]
+        if period != "ytd":
+            # A ytd frame can be shorter than 1mo in early January
+            candidates = [p for p in candidates if p != "ytd"]
+        return candidates
+
+    def get(self, ticker: str, period: str) -> Optional[pd.DataFrame]:
+        """
+        Look up a fresh frame for (ticker, period)
+
+        The entry must be younger than both its own TTL and the TTL of the
+        requested period, so a 1y frame can serve 1mo but never a stale 1d.
+
+        Returns:
+            DataFrame or None on miss
+        """
+        ticker = ticker.upper()
+        now = time.monotonic()
+        max_age = self._ttl(period)
+
+        with self._lock:
+            for candidate in self._candidates(period):
+                key = (ticker, candidate)
+                entry: Tuple[pd.DataFrame, float] = self._frames.peek(key)
+                if entry is None:
+                    continue
+                df, fetched_at = entry
+                age = now - fetched_at
+                if age >= self._ttl(candidate):
+                    self._frames.pop(key)
+                    self.expirations += 1
+                    continue
+                if age >= max_age:
+                    continue
+
+                self._frames.get(key)  # mark recently used
+                if candidate == period:
+                    self.hits += 1
+                    return df
+                self.subsumed_hits += 1
+                return slice_period(df, period)
+
+            self.misses += 1
+            return None
+
+    def put(self, ticker: str, period: str, df: pd.DataFrame):
+        """Store a freshly fetched frame"""
+        with self._lock:
+            self._frames.put((ticker.upper(), period), (df, time.monotonic()),
+                             nbytes=int(df.memory_usage(deep=True).sum()))
+
+    def invalidate(self, ticker: str = None):
+        """Drop cached frames for ticker (or everything)"""
+        with self._lock:
+            if ticker is None:
+                self._frames.clear()
+                return
+            for key in self._frames.keys():
+                if key[0] == ticker.upper():
+                    self._frames.pop(key)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and memory usage"""
+        lookups = self.hits + self.subsumed_hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "subsumed_hits": self.subsumed_hits,
+            "misses": self.misses,
+            "expirations": self.expirations,
+            "hit_rate": round((self.hits + self.subsumed_hits) / lookups, 3) if lookups else 0.0,
+        }
+        stats.update(self._frames.stats())
+        return stats
@@ -0,0 +1,149 @@
+"""
+Columnar OHLCV result container
+Holds one NumPy array per column plus a datetime64[ns] index. Arrays are
+read-only views of the source frame (no copy), and the per-row dict view
+that get_ohlcv used to build eagerly is only materialized on demand.
+"""
+import numpy as np
+import pandas as pd
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional
+
+
+def _readonly(values: np.ndarray) -> np.ndarray:
+    """Read-only view so callers cannot mutate cached frames"""
+    view = values.view()
+    view.flags.writeable = False
+    return view
+
+
+class OHLCVRows(Sequence):
+    """
+    Lazy list-of-dicts view over OHLCVColumns
+
+    Indexing builds only the requested rows; ``to_list()`` builds (and
+    keeps) the full list, equivalent to ``DataFrame.to_dict('records')``.
+    """
+
+    def __init__(self, columns: "OHLCVColumns"):
+        self._columns = columns
+        self._rows: Optional[List[dict]] = None
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def _row(self, i: int) -> dict:
+        return {name: values[i].item()
+                for name, values in self._columns.items()}
+
+    def __getitem__(self, i):
+        if self._rows is not None:
+            return self._rows[i]
+        if isinstance(i, slice):
+            return [self._row(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("row index out of range")
+        return self._row(i)
+
+    def to_list(self) -> List[dict]:
+        """Materialize every row as a dict"""
+        if self._rows is None:
+            names = list(self._columns.keys())
+            lists = [values.tolist() for values in self._columns.values()]
+            self._rows = [dict(zip(names, row)) for row in zip(*lists)]
+        return self._rows
+
+    def __repr__(self) -> str:
+        return f"OHLCVRows({len(self)} rows)"
+
+
+class OHLCVColumns:
+    """
+    Column-oriented OHLCV data
+
+    Behaves like a read-only column dict (``data["Close"]``,
+    ``data.get("Volume")``, ``keys()``); ``len()`` is the number of bars,
+    as with a DataFrame. Columns are plain contiguous NumPy buffers, so
+    they can be handed to Arrow (``pyarrow.array``) without copying.
+    """
+
+    def __init__(self, index: np.ndarray, columns: Dict[str, np.ndarray]):
+        """
+        Args:
+            index: Bar timestamps (datetime64[ns])
+            columns: Column name -> array, each the same length as index
+        """
+        self.index = index
+        self._columns = columns
+        self._rows: Optional[OHLCVRows] = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "OHLCVColumns":
+        """Wrap the numeric columns of a DataFrame without copying them"""
+        index = df.index
+        if isinstance(index, pd.DatetimeIndex):
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            index = index.as_unit('ns')
+        columns = {
+            name: _readonly(df[name].to_numpy())
+            for name in df.columns
+            if pd.api.types.is_numeric_dtype(df[name])
+        }
+        return cls(_readonly(np.asarray(index.values)), columns)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self._columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def get(self, name: str, default=None):
+        return self._columns.get(name, default)
+
+    def keys(self):
+        return self._columns.keys()
+
+    def values(self):
+        return self._columns.values()
+
+    def items(self):
+        return self._columns.items()
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Index as int64 epoch nanoseconds"""
+        return self.index.view('i8')
+
+    @property
+    def rows(self) -> OHLCVRows:
+        """Lazy per-row dict view"""
+        if self._rows is None:
+            self._rows = OHLCVRows(self)
+        return self._rows
+
+    @property
+    def nbytes(self) -> int:
+        return self.index.nbytes + sum(v.nbytes for v in self._columns.values())
+
+    def to_frame(self) -> pd.DataFrame:
+        """Rebuild a DataFrame indexed by Date"""
+        return pd.DataFrame(dict(self._columns),
+                            index=pd.DatetimeIndex(self.index, name='Date'))
+
+    def to_dict(self) -> Dict[str, list]:
+        """JSON-friendly column lists, including ISO dates under 'Date'"""
+        data = {"Date": [str(ts) for ts in self.index.astype('datetime64[s]')]}
+        data.update({name: values.tolist() for name, values in self._columns.items()})
+        return data
+
+    def __repr__(self) -> str:
+        return f"OHLCVColumns({len(self)} rows, columns={list(self._columns)})"
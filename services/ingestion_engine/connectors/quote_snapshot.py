@@ -0,0 +1,266 @@
+"""
+Quote Snapshot Service
+Polls every watched ticker in one batched request on a schedule and keeps
+the latest quotes in an in-memory table. Lookups are a single dict read
+(no lock, no I/O); unwatched symbols fall back to an on-demand fetch
+whose result is kept in a small bounded LRU next to the table.
+"""
+from .yfinance_connector import MarketDataConnector, get_connector
+from shared.utils.cache import ByteLRUCache
+from shared.utils.errors import DataFetchError
+from shared.utils.logger import get_logger
+import numpy as np
+import pandas as pd
+import threading
+import time
+from typing import Dict, Iterable, NamedTuple, Optional
+import os
+import sys
+
+# Add shared utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+logger = get_logger("ingestion-engine-quotes")
+
+
+class Quote(NamedTuple):
+    """Immutable quote snapshot"""
+    ticker: str
+    price: float
+    previous_close: Optional[float]
+    as_of: pd.Timestamp        # timestamp of the last bar
+    fetched_at: float          # epoch seconds when the quote was fetched
+    source: str                # "snapshot" (batched poll) or "on_demand"
+
+
+class QuoteSnapshotService:
+    """
+    Batched, scheduled quote table
+
+    The table is copy-on-write: the poller builds a new dict and swaps the
+    reference, so readers never block and always see a complete snapshot.
+    It only holds watched tickers; on-demand quotes for other symbols go
+    to a separate LRU of at most ``max_on_demand`` entries, so lookups of
+    arbitrary symbols neither grow nor copy the table.
+    """
+
+    # Period requested per poll; enough bars for a previous close
+    SNAPSHOT_PERIOD = "5d"
+
+    def __init__(self, connector: MarketDataConnector = None,
+                 watchlist: Iterable[str] = (),
+                 interval: float = 15.0,
+                 max_staleness: float = 60.0,
+                 max_on_demand: int = 256):
+        """
+        Initialize service
+
+        Args:
+            connector: Connector whose source is polled (default: singleton)
+            watchlist: Tickers refreshed on every poll
+            interval: Seconds between polls
+            max_staleness: Age (seconds) after which a quote is refetched
+            max_on_demand: Unwatched-symbol quotes kept (least recently
+                used are evicted)
+        """
+        self.connector = connector or get_connector()
+        self.interval = interval
+        self.max_staleness = max_staleness
+        self._watchlist = {t.upper() for t in watchlist}
+        self._quotes: Dict[str, Quote] = {}
+        # One "byte" per quote: the budget is an entry count
+        self._on_demand_quotes = ByteLRUCache(max_on_demand, sizeof=lambda quote: 1)
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.polls = 0
+        self.hits = 0
+        self.on_demand = 0
+
+    @property
+    def watchlist(self):
+        return sorted(self._watchlist)
+
+    def watch(self, tickers: Iterable[str]):
+        """Add tickers to the polled watchlist"""
+        self._watchlist.update(t.upper() for t in tickers)
+
+    def unwatch(self, tickers: Iterable[str]):
+        """Remove tickers from the watchlist"""
+        self._watchlist.difference_update(t.upper() for t in tickers)
+
+    @staticmethod
+    def _quote_from_frame(ticker: str, df: pd.DataFrame, source: str,
+                          fetched_at: float) -> Optional[Quote]:
+        closes = df['Close'].to_numpy(dtype=float)
+        valid = np.flatnonzero(~np.isnan(closes))
+        if not len(valid):
+            return None
+        last = valid[-1]
+        previous = float(closes[valid[-2]]) if len(valid) > 1 else None
+        return Quote(ticker, float(closes[last]), previous,
+                     pd.Timestamp(df.index[last]), fetched_at, source)
+
+    def _publish(self, quotes: Dict[str, Quote]):
+        """Swap in a new table containing quotes"""
+        if not quotes:
+            return
+        with self._write_lock:
+            table = dict(self._quotes)
+            table.update(quotes)
+            self._quotes = table
+
+    def refresh(self) -> int:
+        """
+        Poll all watched tickers in batched requests
+
+        Returns:
+            Number of quotes updated
+        """
+        tickers = self.watchlist
+        if not tickers:
+            return 0
+        batch_size = self.connector.BATCH_SIZE
+        fetched_at = time.time()
+        quotes = {}
+        for i in range(0, len(tickers), batch_size):
+            chunk = tickers[i:i + batch_size]
+            try:
+                frames = self.connector.source.download(chunk, self.SNAPSHOT_PERIOD)
+            except Exception as e:
+                logger.warning("Quote snapshot poll failed",
+                               tickers=len(chunk), error=str(e))
+                continue
+            for ticker, df in frames.items():
+                quote = self._quote_from_frame(ticker, df, "snapshot", fetched_at)
+                if quote is not None:
+                    quotes[ticker] = quote
+
+        self._publish(quotes)
+        self.polls += 1
+        missing = len(tickers) - len(quotes)
+        if missing:
+            logger.warning("Quote snapshot incomplete",
+                           updated=len(quotes), missing=missing)
+        return len(quotes)
+
+    def _fetch_one(self, ticker: str) -> Quote:
+        """On-demand quote for a symbol outside the snapshot"""
+        df = self.connector._get_frame(ticker, self.SNAPSHOT_PERIOD, use_cache=False)
+        quote = self._quote_from_frame(ticker, df, "on_demand", time.time())
+        if quote is None:
+            raise DataFetchError(f"No price data for {ticker}", ticker=ticker)
+        if ticker in self._watchlist:
+            self._publish({ticker: quote})
+        else:
+            self._on_demand_quotes.put(ticker, quote)
+        self.on_demand += 1
+        return quote
+
+    def get(self, ticker: str) -> Quote:
+        """
+        Latest quote for ticker
+
+        Served from the table (or the on-demand LRU) when younger than
+        max_staleness; otherwise fetched on demand.
+
+        Raises:
+            DataFetchError: If no quote can be obtained
+        """
+        ticker = ticker.upper()
+        quote = self._quotes.get(ticker)
+        if quote is None:
+            quote = self._on_demand_quotes.get(ticker)
+        if quote is not None and time.time() - quote.fetched_at <= self.max_staleness:
+            self.hits += 1
+            return quote
+        return self._fetch_one(ticker)
+
+    def get_quote(self, ticker: str) -> dict:
+        """
+        Latest quote as a dict with change and staleness fields
+
+        Returns:
+            dict with ticker, price, previous_close, change, change_percent,
+            as_of, age_seconds, source
+        """
+        quote = self.get(ticker)
+        change = change_pct = None
+        if quote.previous_close:
+            change = quote.price - quote.previous_close
+            change_pct = change / quote.previous_close * 100
+        return {
+            "ticker": quote.ticker,
+            "price": quote.price,
+            "previous_close": quote.previous_close,
+            "change": change,
+            "change_percent": change_pct,
+            "as_of": quote.as_of.isoformat(),
+            "age_seconds": round(time.time() - quote.fetched_at, 3),
+            "source": quote.source,
+        }
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error("Quote snapshot loop error", error=str(e))
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Poll on a background thread every `interval` seconds"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="titan-quote-snapshot", daemon=True)
+        self._thread.start()
+        logger.info("Quote snapshot service started",
+                    tickers=len(self._watchlist), interval=self.interval)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background poller"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "watched": len(self._watchlist),
+            "quotes": len(self._quotes),
+            "on_demand_quotes": len(self._on_demand_quotes),
+            "polls": self.polls,
+            "hits": self.hits,
+            "on_demand": self.on_demand,
+        }
+
+
+# Singleton instance
+_quote_service = None
+_quote_service_lock = threading.Lock()
+
+
+def get_quote_service() -> QuoteSnapshotService:
+    """
+    Get or create singleton quote service
+
+    Watches the comma-separated TITAN_WATCHLIST tickers, starts polling if
+    any are configured, and serves get_realtime_price on the singleton
+    connector.
+    """
+    global _quote_service
+    if _quote_service is None:
+        with _quote_service_lock:
+            # Concurrent first calls must not build (and start) two pollers
+            if _quote_service is None:
+                watchlist = [t.strip() for t in
+                             os.getenv("TITAN_WATCHLIST", "").split(",") if t.strip()]
+                service = QuoteSnapshotService(watchlist=watchlist)
+                service.connector.attach_quotes(service)
+                if watchlist:
+                    service.start()
+                _quote_service = service
+    return _quote_service
@@ -0,0 +1,392 @@
+"""
+Record / Replay Data Sources
+Captures the responses of a market data source (YFinanceSource or any
+object with the same methods) into a compact zip archive and serves them
+back offline at a configurable latency, so benchmarks and load tests run
+reproducibly without network access.
+
+Archive layout (one zip file):
+    {digest}.npz   one compressed response: index and column arrays
+    {digest}.json  request (method + arguments), frame metadata, timing
+
+Enable for the connector and DataLoader singletons with:
+    TITAN_REPLAY=./data/replay/yahoo.zip
+    TITAN_REPLAY_MODE=record|replay|auto   (default: replay)
+    TITAN_REPLAY_LATENCY=0.05              (seconds; "recorded" = as captured)
+"""
+from shared.utils.errors import DataFetchError
+from shared.utils.logger import get_logger
+import numpy as np
+import pandas as pd
+import hashlib
+import io
+import json
+import threading
+import time
+import zipfile
+from datetime import datetime
+from typing import Any, Dict, Optional, Union
+import os
+import sys
+
+# Add shared utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+logger = get_logger("ingestion-engine-replay")
+
+REPLAY_MODES = ("record", "replay", "auto")
+
+
+def request_key(method: str, kwargs: Dict[str, Any]) -> str:
+    """Stable digest of a source call"""
+    canonical = json.dumps([method, kwargs], sort_keys=True, default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=10).hexdigest()
+
+
+def _column_label(label):
+    return list(label) if isinstance(label, tuple) else label
+
+
+def _plain(values: np.ndarray) -> np.ndarray:
+    """Object (string) arrays as fixed-width unicode, so no pickling"""
+    return values.astype(str) if values.dtype == object else values
+
+
+def _encode_frame(df: pd.DataFrame, prefix: str, arrays: Dict[str, np.ndarray]) -> dict:
+    """Add a frame's arrays under prefix and return its metadata"""
+    index = df.index
+    meta = {
+        "index_name": index.name,
+        "columns": [_column_label(c) for c in df.columns],
+        "column_names": list(df.columns.names),
+        "dtypes": [str(t) for t in df.dtypes],
+        "tz": None,
+    }
+    if isinstance(index, pd.DatetimeIndex):
+        meta["tz"] = str(index.tz) if index.tz is not None else None
+        meta["unit"] = index.unit
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        arrays[f"{prefix}index"] = index.as_unit("ns").asi8
+        meta["index"] = "datetime"
+    else:
+        arrays[f"{prefix}index"] = _plain(np.asarray(index))
+        meta["index"] = "values"
+    for i, column in enumerate(df.columns):
+        arrays[f"{prefix}c{i}"] = _plain(df.iloc[:, i].to_numpy())
+    return meta
+
+
+def _decode_frame(meta: dict, prefix: str, arrays) -> pd.DataFrame:
+    raw_index = arrays[f"{prefix}index"]
+    if meta["index"] == "datetime":
+        index = pd.DatetimeIndex(raw_index.astype("datetime64[ns]")).as_unit(meta["unit"])
+        if meta["tz"]:
+            index = index.tz_localize("UTC").tz_convert(meta["tz"])
+    else:
+        index = pd.Index(raw_index)
+    index.name = meta["index_name"]
+
+    labels = [tuple(c) if isinstance(c, list) else c for c in meta["columns"]]
+    if labels and isinstance(labels[0], tuple):
+        columns = pd.MultiIndex.from_tuples(labels, names=meta["column_names"])
+    else:
+        columns = pd.Index(labels, name=meta["column_names"][0])
+    data = {i: arrays[f"{prefix}c{i}"] for i in range(len(labels))}
+    df = pd.DataFrame(data, index=index)
+    df.columns = columns
+    return df.astype(dict(zip(columns, meta["dtypes"])))
+
+
+class ReplayArchive:
+    """
+    Zip archive of recorded source responses
+
+    Responses are DataFrames, dicts of DataFrames (batched downloads) or
+    errors. The first recording of a request wins; re-recording the same
+    request is a no-op, so an archive only ever grows.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize archive
+
+        Args:
+            path: Zip file (created on first record)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self._loaded: Dict[str, Any] = {}
+        if os.path.exists(path):
+            with zipfile.ZipFile(path) as archive:
+                for name in archive.namelist():
+                    if name.endswith(".json"):
+                        self._entries[name[:-5]] = json.loads(archive.read(name))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def entries(self) -> Dict[str, dict]:
+        """digest -> request metadata"""
+        return dict(self._entries)
+
+    def record(self, method: str, kwargs: Dict[str, Any], response,
+               elapsed: float = 0.0):
+        """
+        Store one response
+
+        Args:
+            method: Source method name
+            kwargs: Call arguments
+            response: DataFrame, dict of DataFrames or an Exception
+            elapsed: Seconds the live call took
+        """
+        key = request_key(method, kwargs)
+        arrays: Dict[str, np.ndarray] = {}
+        entry = {
+            "method": method,
+            "kwargs": kwargs,
+            "elapsed": round(elapsed, 6),
+            "recorded_at": datetime.now().isoformat(),
+        }
+        if isinstance(response, Exception):
+            entry.update(kind="error", message=str(response))
+        elif isinstance(response, pd.DataFrame):
+            entry.update(kind="frame", frame=_encode_frame(response, "", arrays))
+        else:
+            entry.update(kind="frames", frames={
+                ticker: _encode_frame(df, f"f{i}_", arrays)
+                for i, (ticker, df) in enumerate(response.items())})
+            entry["order"] = list(response)
+
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        with self._lock:
+            if key in self._entries:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with zipfile.ZipFile(self.path, "a", zipfile.ZIP_STORED) as archive:
+                archive.writestr(f"{key}.npz", buffer.getvalue())
+                archive.writestr(f"{key}.json", json.dumps(entry, default=str))
+            self._entries[key] = entry
+        logger.debug("Recorded response", method=method, key=key)
+
+    def load(self, method: str, kwargs: Dict[str, Any]):
+        """
+        Recorded response for a call
+
+        Returns:
+            (entry metadata, response) where response is a fresh copy
+
+        Raises:
+            KeyError: If the call was never recorded
+        """
+        key = request_key(method, kwargs)
+        entry = self._entries[key]
+        with self._lock:
+            response = self._loaded.get(key)
+            if response is None:
+                response = self._read(key, entry)
+                self._loaded[key] = response
+        if isinstance(response, pd.DataFrame):
+            return entry, response.copy()
+        if isinstance(response, dict):
+            return entry, {t: df.copy() for t, df in response.items()}
+        return entry, response
+
+    def _read(self, key: str, entry: dict):
+        if entry["kind"] == "error":
+            return DataFetchError(entry["message"])
+        with zipfile.ZipFile(self.path) as archive:
+            arrays = np.load(io.BytesIO(archive.read(f"{key}.npz")))
+            if entry["kind"] == "frame":
+                return _decode_frame(entry["frame"], "", arrays)
+            return {ticker: _decode_frame(entry["frames"][ticker], f"f{i}_", arrays)
+                    for i, ticker in enumerate(entry["order"])}
+
+
+class _ProxyMethods:
+    """history / download / download_range routed through _call"""
+
+    def history(self, ticker: str, period: str) -> pd.DataFrame:
+        return self._call("history", ticker=ticker, period=period)
+
+    def download(self, tickers, period: str) -> Dict[str, pd.DataFrame]:
+        return self._call("download", tickers=list(tickers), period=period)
+
+    def download_range(self, tickers, start: str = None, end: str = None,
+                       **kwargs) -> pd.DataFrame:
+        tickers = tickers if isinstance(tickers, str) else list(tickers)
+        return self._call("download_range", tickers=tickers, start=start,
+                          end=end, **kwargs)
+
+
+class RecordingSource(_ProxyMethods):
+    """
+    Pass-through source that records every response (and error)
+
+    Wrap the live source:
+        MarketDataConnector(source=RecordingSource(YFinanceSource(), archive))
+    """
+
+    def __init__(self, source, archive: Union[ReplayArchive, str]):
+        """
+        Args:
+            source: Live source to call
+            archive: ReplayArchive or path of one
+        """
+        self.source = source
+        self.archive = archive if isinstance(archive, ReplayArchive) \
+            else ReplayArchive(archive)
+
+    def _call(self, method: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = getattr(self.source, method)(**kwargs)
+        except Exception as e:
+            self.archive.record(method, kwargs, e, time.perf_counter() - start)
+            raise
+        self.archive.record(method, kwargs, response, time.perf_counter() - start)
+        return response
+
+
+class ReplaySource(_ProxyMethods):
+    """
+    Offline source serving recorded responses
+
+    Calls sleep for ``latency`` seconds (0 for none, None for the latency
+    measured at record time) before returning, so benchmarks can model a
+    fixed network cost without the jitter of the real one.
+    """
+
+    def __init__(self, archive: Union[ReplayArchive, str],
+                 latency: Optional[float] = 0.0,
+                 fallback=None):
+        """
+        Args:
+            archive: ReplayArchive or path of one
+            latency: Seconds per call, or None to replay recorded timings
+            fallback: Live source for unrecorded calls (recorded on use);
+                without one an unrecorded call raises DataFetchError
+        """
+        self.archive = archive if isinstance(archive, ReplayArchive) \
+            else ReplayArchive(archive)
+        self.latency = latency
+        self.recorder = RecordingSource(fallback, self.archive) if fallback else None
+        self.hits = 0
+        self.misses = 0
+
+    def _call(self, method: str, **kwargs):
+        try:
+            entry, response = self.archive.load(method, kwargs)
+        except KeyError:
+            self.misses += 1
+            if self.recorder is not None:
+                return self.recorder._call(method, **kwargs)
+            raise DataFetchError(
+                f"No recorded response for {method}({kwargs})",
+                ticker=kwargs.get("ticker"))
+
+        self.hits += 1
+        delay = entry["elapsed"] if self.latency is None else self.latency
+        if delay:
+            time.sleep(delay)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def stats(self) -> dict:
+        return {"recorded": len(self.archive), "hits": self.hits,
+                "misses": self.misses}
+
+
+# One archive object per path, shared by every source using it
+_archives: Dict[str, ReplayArchive] = {}
+_archives_lock = threading.Lock()
+
+
+def open_archive(path: str) -> ReplayArchive:
+    """Shared ReplayArchive for path"""
+    path = os.path.abspath(path)
+    with _archives_lock:
+        if path not in _archives:
+            _archives[path] = ReplayArchive(path)
+        return _archives[path]
+
+
+def source_from_env(live):
+    """
+    Wrap a live source according to TITAN_REPLAY settings
+
+    Args:
+        live: Live source (e.g. YFinanceSource())
+
+    Returns:
+        live itself when TITAN_REPLAY is unset, otherwise a RecordingSource
+        (record), ReplaySource (replay) or ReplaySource with live fallback
+        (auto)
+    """
+    path = os.getenv("TITAN_REPLAY", "").strip()
+    if not path:
+        return live
+    mode = os.getenv("TITAN_REPLAY_MODE", "replay").strip().lower()
+    if mode not in REPLAY_MODES:
+        raise ValueError(f"TITAN_REPLAY_MODE must be one of {REPLAY_MODES}")
+    latency = os.getenv("TITAN_REPLAY_LATENCY", "0").strip().lower()
+    latency = None if latency == "recorded" else float(latency)
+
+    logger.info("Using replay archive", path=path, mode=mode, latency=latency)
+    archive = open_archive(path)
+    if mode == "record":
+        return RecordingSource(live, archive)
+    return ReplaySource(archive, latency=latency,
+                        fallback=live if mode == "auto" else None)
+
+
+def main(argv=None):
+    """Command line entry point: record an archive or list its contents"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Titan record/replay archives")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    record = subparsers.add_parser(
+        "record", help="Capture live Yahoo Finance responses for tickers")
+    record.add_argument("archive")
+    record.add_argument("tickers", nargs="+")
+    record.add_argument("--periods", default="1d,5d,1mo,1y",
+                        help="Comma-separated periods to capture")
+    show = subparsers.add_parser("ls", help="List recorded requests")
+    show.add_argument("archive")
+    args = parser.parse_args(argv)
+
+    archive = ReplayArchive(args.archive)
+    if args.command == "record":
+        from .yfinance_connector import YFinanceSource
+
+        source = RecordingSource(YFinanceSource(), archive)
+        tickers = [t.upper() for t in args.tickers]
+        for period in args.periods.split(","):
+            frames = source.download(tickers, period)
+            for ticker in tickers:
+                try:
+                    source.history(ticker, period)
+                except Exception as e:
+                    print(f"  ❌ {ticker} {period}: {e}")
+            print(f"  ✅ {period}: {len(frames)}/{len(tickers)} tickers")
+        print(f"📼 {len(archive)} responses in {args.archive} "
+              f"({os.path.getsize(args.archive) / 1024:.0f} KB)")
+        return 0
+
+    for entry in sorted(archive.entries().values(),
+                        key=lambda e: (e["method"], str(e["kwargs"]))):
+        print(f"  {entry['method']:<15} {json.dumps(entry['kwargs'])}  "
+              f"{entry['kind']}  {entry['elapsed'] * 1000:.0f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,12 +3,20 @@ Market Data Ingestion Service
 Simulates Kafka → ClickHouse pipeline locally
 Uses YFinance for data fetching with caching
 """
+from .ohlcv_cache import OHLCVCache
+from .ohlcv_columns import OHLCVColumns
+from .replay import source_from_env
 from shared.utils.errors import DataFetchError
 from shared.utils.logger import get_logger
 import yfinance as yf
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Dict, List
 import os
 import sys
+import time
 
 # Add shared utils to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
@@ -16,64 +24,195 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 logger = get_logger("ingestion-engine")
 
 
+class YFinanceSource:
+    """
+    Raw Yahoo Finance access used by MarketDataConnector
+
+    Any object with the same two methods can be passed to the connector
+    as ``source`` (local stand-ins for benchmarks, replay archives, ...).
+    """
+
+    def history(self, ticker: str, period: str) -> pd.DataFrame:
+        """Single-ticker OHLCV history"""
+        return yf.Ticker(ticker).history(period=period)
+
+    def download(self, tickers: List[str], period: str) -> Dict[str, pd.DataFrame]:
+        """
+        Batched OHLCV history for several tickers in one request
+
+        Returns:
+            dict mapping ticker -> DataFrame (tickers with no rows omitted)
+        """
+        data = yf.download(
+            tickers,
+            period=period,
+            group_by='ticker',
+            auto_adjust=True,
+            threads=True,
+            progress=False)
+
+        frames = {}
+        if data is None or data.empty:
+            return frames
+        for ticker in tickers:
+            if isinstance(data.columns, pd.MultiIndex):
+                if ticker not in data.columns.get_level_values(0):
+                    continue
+                frame = data[ticker]
+            elif len(tickers) == 1:
+                frame = data
+            else:
+                continue
+            frame = frame.dropna(how='all')
+            if not frame.empty:
+                frames[ticker] = frame
+        return frames
+
+    def download_range(self, tickers, start: str = None, end: str = None,
+                       **kwargs) -> pd.DataFrame:
+        """
+        Raw yf.download frame for an explicit date range (used by DataLoader)
+
+        Args:
+            tickers: Ticker or list of tickers
+            start: Start date (YYYY-MM-DD)
+            end: End date (YYYY-MM-DD, exclusive)
+            **kwargs: Extra yf.download options (period, interval, ...)
+        """
+        return yf.download(tickers, start=start, end=end, progress=False, **kwargs)
+
+
 class MarketDataConnector:
     """
     Centralized market data fetching
     Replaces direct yfinance calls in tools
     """
 
-    def __init__(self, cache_dir="./data/cache"):
+    # Tickers per batched download request
+    BATCH_SIZE = 100
+
+    def __init__(self, cache_dir="./data/cache",
+                 cache_max_bytes: int = 64 * 1024 * 1024,
+                 cache_ttls: dict = None,
+                 source=None,
+                 max_workers: int = 8):
+        """
+        Initialize connector
+
+        Args:
+            cache_dir: Directory for on-disk cache files
+            cache_max_bytes: Memory budget of the in-process OHLCV cache
+            cache_ttls: Per-period TTL overrides in seconds
+            source: Data source (default: YFinanceSource, wrapped for
+                record/replay when TITAN_REPLAY is set)
+            max_workers: Thread pool size for per-ticker fallback fetches
+        """
         self.cache_dir = cache_dir
         os.makedirs(cache_dir, exist_ok=True)
+        self.cache = OHLCVCache(max_bytes=cache_max_bytes, ttls=cache_ttls)
+        self.source = source or source_from_env(YFinanceSource())
+        self.max_workers = max_workers
+        self.stream = None
+        self.max_stream_staleness = 60.0
+        self.quotes = None
         logger.info("MarketDataConnector initialized", cache_dir=cache_dir)
 
-    def get_ohlcv(self, ticker: str, period: str = "1mo") -> dict:
+    def attach_stream(self, pipeline, max_staleness: float = 60.0):
+        """
+        Serve real-time prices from a StreamingPipeline when fresh
+
+        Args:
+            pipeline: StreamingPipeline (or None to detach)
+            max_staleness: Oldest streamed trade (seconds) still served
+        """
+        self.stream = pipeline
+        self.max_stream_staleness = max_staleness
+
+    def attach_quotes(self, service):
+        """
+        Serve real-time prices from a QuoteSnapshotService
+
+        Args:
+            service: QuoteSnapshotService (or None to detach)
+        """
+        self.quotes = service
+
+    def _get_frame(self, ticker: str, period: str, use_cache: bool = True):
+        """Return the OHLCV DataFrame for ticker/period, cached when possible"""
+        if use_cache:
+            df = self.cache.get(ticker, period)
+            if df is not None:
+                logger.debug(f"Cache hit for {ticker}",
+                             ticker=ticker, period=period)
+                return df
+
+        logger.info(
+            f"Fetching data for {ticker}",
+            ticker=ticker,
+            period=period)
+
+        df = self.source.history(ticker, period)
+
+        if df.empty:
+            raise DataFetchError(
+                f"No data found for {ticker}", ticker=ticker)
+
+        self.cache.put(ticker, period, df)
+        return df
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters and memory usage of the OHLCV cache"""
+        return self.cache.stats()
+
+    def get_ohlcv(self, ticker: str, period: str = "1mo",
+                  use_cache: bool = True, layout: str = "records") -> dict:
         """
         Fetch OHLCV data for ticker
 
         Args:
             ticker: Stock symbol (e.g., AAPL, TSLA)
             period: Time period (1d, 5d, 1mo, 3mo, 6mo, 1y, 5y)
+            use_cache: Serve from the in-process cache when fresh
+            layout: "records" for a list of row dicts, or "columns" for an
+                OHLCVColumns (zero-copy arrays, lazy ``.rows`` view)
 
         Returns:
             dict with ticker, data, current_price, volume_avg, 52w high/low
         """
+        if layout not in ("records", "columns"):
+            raise ValueError(f"Unknown layout: {layout}")
         try:
-            logger.info(
-                f"Fetching data for {ticker}",
-                ticker=ticker,
-                period=period)
-
-            stock = yf.Ticker(ticker)
-            df = stock.history(period=period)
-
-            if df.empty:
-                raise DataFetchError(
-                    f"No data found for {ticker}", ticker=ticker)
-
-            result = {
-                "ticker": ticker,
-                "period": period,
-                "data": df.to_dict('records'),
-                "current_price": float(df['Close'].iloc[-1]),
-                "volume_avg_30d": float(df['Volume'].tail(30).mean()) if len(df) >= 30 else float(df['Volume'].mean()),
-                "high_52w": float(df['High'].tail(252).max()) if len(df) >= 252 else float(df['High'].max()),
-                "low_52w": float(df['Low'].tail(252).min()) if len(df) >= 252 else float(df['Low'].min()),
-                "timestamp": datetime.now().isoformat()
-            }
-
-            logger.info(f"Successfully fetched data for {ticker}",
-                        ticker=ticker,
-                        current_price=result["current_price"])
-
-            return result
+            df = self._get_frame(ticker, period, use_cache)
+            return self._build_result(ticker, period, df, layout)
 
         except Exception as e:
             error_msg = f"Error fetching data for {ticker}: {str(e)}"
             logger.error(error_msg, ticker=ticker, error=str(e))
             raise DataFetchError(error_msg, ticker=ticker)
 
-    def get_historical_data(self, ticker: str, period: str = "1mo") -> dict:
+    def _build_result(self, ticker: str, period: str, df: pd.DataFrame,
+                      layout: str = "records") -> dict:
+        """Summarize an OHLCV frame into the get_ohlcv response"""
+        columns = OHLCVColumns.from_frame(df)
+        result = {
+            "ticker": ticker,
+            "period": period,
+            "data": columns if layout == "columns" else columns.rows.to_list(),
+            "current_price": float(columns['Close'][-1]),
+            "volume_avg_30d": float(np.nanmean(columns['Volume'][-30:])),
+            "high_52w": float(np.nanmax(columns['High'][-252:])),
+            "low_52w": float(np.nanmin(columns['Low'][-252:])),
+            "timestamp": datetime.now().isoformat()
+        }
+
+        logger.info(f"Successfully fetched data for {ticker}",
+                    ticker=ticker,
+                    current_price=result["current_price"])
+
+        return result
+
+    def get_historical_data(self, ticker: str, period: str = "1mo",
+                            layout: str = "records") -> dict:
         """
         Alias for get_ohlcv for backward compatibility.
         Some tools call this method instead of get_ohlcv.
@@ -81,48 +220,104 @@ class MarketDataConnector:
         Args:
             ticker: Stock symbol (e.g., AAPL, TSLA)
             period: Time period (1d, 5d, 1mo, 3mo, 6mo, 1y, 5y)
+            layout: "records" or "columns" (see get_ohlcv)
             
         Returns:
             dict with ticker, data, current_price, and metadata
         """
-        return self.get_ohlcv(ticker, period)
+        return self.get_ohlcv(ticker, period, layout=layout)
 
     def get_realtime_price(self, ticker: str) -> float:
         """
         Get current price (simulates real-time stream)
 
+        Tries a fresh streamed trade, then the quote snapshot table, and
+        only then a 1d history fetch.
+
         Args:
             ticker: Stock symbol
 
         Returns:
             Current price as float
         """
-        data = self.get_ohlcv(ticker, period="1d")
+        if self.stream is not None:
+            trade = self.stream.latest_price(ticker)
+            if trade is not None and \
+                    time.time() - trade["timestamp"] <= self.max_stream_staleness:
+                return trade["price"]
+
+        if self.quotes is not None:
+            return self.quotes.get(ticker).price
+
+        data = self.get_ohlcv(ticker, period="1d", layout="columns")
         return data.get("current_price")
 
-    def get_multiple_tickers(self, tickers: list, period: str = "1mo") -> dict:
+    def get_multiple_tickers(self, tickers: list, period: str = "1mo",
+                             batch: bool = True, layout: str = "records") -> dict:
         """
         Fetch data for multiple tickers in batch
 
+        Cached tickers are answered first, the rest are requested in
+        batched downloads of BATCH_SIZE tickers, and anything the batch did
+        not return is retried per ticker on a bounded thread pool. A failing
+        ticker gets an {"error": ...} entry instead of failing the batch.
+
         Args:
             tickers: List of stock symbols
             period: Time period
+            batch: Use batched downloads (False: per-ticker requests only)
+            layout: "records" or "columns" (see get_ohlcv)
 
         Returns:
             dict mapping ticker -> data
         """
         results = {}
-        for ticker in tickers:
-            try:
-                results[ticker] = self.get_ohlcv(ticker, period)
-            except DataFetchError as e:
-                logger.warning(
-                    f"Failed to fetch {ticker}",
-                    ticker=ticker,
-                    error=str(e))
-                results[ticker] = {"error": str(e)}
+        pending = []
+        for ticker in dict.fromkeys(tickers):
+            df = self.cache.get(ticker, period)
+            if df is not None:
+                results[ticker] = self._build_result(ticker, period, df, layout)
+            else:
+                pending.append(ticker)
+
+        if batch and len(pending) > 1:
+            fallback = []
+            for i in range(0, len(pending), self.BATCH_SIZE):
+                chunk = pending[i:i + self.BATCH_SIZE]
+                try:
+                    frames = self.source.download(chunk, period)
+                except Exception as e:
+                    logger.warning("Batched download failed",
+                                   tickers=len(chunk), error=str(e))
+                    frames = {}
+
+                for ticker in chunk:
+                    df = frames.get(ticker)
+                    if df is None or df.empty:
+                        fallback.append(ticker)
+                        continue
+                    self.cache.put(ticker, period, df)
+                    results[ticker] = self._build_result(ticker, period, df, layout)
+            pending = fallback
+
+        if pending:
+            workers = max(1, min(self.max_workers, len(pending)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    ticker: pool.submit(self.get_ohlcv, ticker, period, True, layout)
+                    for ticker in pending
+                }
+                for ticker, future in futures.items():
+                    try:
+                        results[ticker] = future.result()
+                    except DataFetchError as e:
+                        logger.warning(
+                            f"Failed to fetch {ticker}",
+                            ticker=ticker,
+                            error=str(e))
+                        results[ticker] = {"error": str(e)}
 
-        return results
+        return {ticker: results[ticker] for ticker in dict.fromkeys(tickers)}
 
 
 # Singleton instance
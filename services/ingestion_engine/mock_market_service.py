@@ -1,9 +1,19 @@
 """
 Mock Market Service - Static data for Agent Squad development
 Allows agents to work independently of external APIs during development
+
+Also provides a deterministic synthetic market generator (GBM or
+regime-switching, daily or intraday, correlated universes) and a
+SyntheticSource that plugs into MarketDataConnector, so the whole stack
+can run and be benchmarked without network access.
 """
+from .connectors.ohlcv_cache import PERIOD_SLICES, slice_period
+from .connectors.yfinance_connector import MarketDataConnector
+import numpy as np
+import pandas as pd
+import zlib
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 
 class MockMarketService:
@@ -221,6 +231,348 @@ class MockMarketService:
             "source": "MockMarketService"}
 
 
+class SyntheticMarketGenerator:
+    """
+    Deterministic, seedable OHLCV generator for arbitrary tickers
+
+    Returns follow a one-factor model: every ticker loads on a shared
+    market shock with weight sqrt(correlation), so any two tickers have
+    return correlation ``correlation``. Each ticker's idiosyncratic shocks
+    and parameters (base price, drift, volatility) are derived from the
+    seed and a stable hash of the symbol, so a ticker's path does not
+    depend on which other tickers are requested with it.
+
+    Daily bars are generated on a fixed business-day grid starting at
+    EPOCH, so shorter requests are exact suffixes of longer ones. With
+    model="regime", a two-state (calm/stressed) Markov chain scales the
+    drift and volatility of daily returns for the whole universe.
+    Intraday bars (1m-1h, 09:30-16:00 sessions) are GBM paths that start
+    at the previous daily close.
+    """
+
+    EPOCH = pd.Timestamp("2000-01-03")
+    # Date at which each ticker trades at its ticker_params price
+    ANCHOR = pd.Timestamp("2020-01-02")
+    TRADING_DAYS = 252
+    SESSION_MINUTES = 390
+    INTRADAY_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30,
+                        "60m": 60, "1h": 60}
+
+    # Regime model: (annual drift adjustment, volatility multiplier) and
+    # mean regime durations in trading days
+    REGIMES = {"calm": (0.04, 0.8), "stressed": (-0.25, 2.0)}
+    REGIME_DURATIONS = {"calm": 250, "stressed": 40}
+
+    def __init__(self, seed: int = 42, model: str = "gbm",
+                 correlation: float = 0.3):
+        """
+        Initialize generator
+
+        Args:
+            seed: Base seed; same seed + ticker always yields the same bars
+            model: "gbm" or "regime"
+            correlation: Pairwise return correlation across tickers (0-1)
+        """
+        if model not in ("gbm", "regime"):
+            raise ValueError(f"Unknown model: {model}")
+        if not 0.0 <= correlation < 1.0:
+            raise ValueError("correlation must be in [0, 1)")
+        self.seed = seed
+        self.model = model
+        self.correlation = correlation
+        self._market_cache = {}
+
+    def _rng(self, *keys) -> np.random.Generator:
+        """Independent random stream for (seed, *keys)"""
+        words = [self.seed] + [
+            zlib.crc32(str(k).encode()) for k in keys]
+        return np.random.default_rng(words)
+
+    def ticker_params(self, ticker: str) -> Dict[str, float]:
+        """Per-ticker base price (at ANCHOR), annual drift and volatility"""
+        rng = self._rng("params", ticker.upper())
+        return {
+            "price": float(np.exp(rng.uniform(np.log(10), np.log(500)))),
+            "drift": float(rng.uniform(0.0, 0.15)),
+            "volatility": float(rng.uniform(0.15, 0.55)),
+            "volume": float(np.exp(rng.uniform(np.log(2e5), np.log(5e7)))),
+        }
+
+    def _market_factor(self, epoch: pd.Timestamp, n: int):
+        """
+        Shared market shocks and regime scaling for the first n daily bars
+
+        Draws are prefix-stable: the first k values never depend on n.
+
+        Returns:
+            (shocks, drift_adjustment, vol_multiplier) arrays of length n
+        """
+        key = (epoch.value, n)
+        cached = self._market_cache.get(key)
+        if cached is not None:
+            return cached
+
+        shocks = self._rng("market", "1d", epoch.value).standard_normal(n)
+        drift_adj = np.zeros(n)
+        vol_mult = np.ones(n)
+
+        if self.model == "regime":
+            # Alternate calm/stressed spells with geometric durations
+            spells = max(2, n // min(self.REGIME_DURATIONS.values()) + 1)
+            calm = self._rng("regime", "calm", epoch.value).geometric(
+                1 / self.REGIME_DURATIONS["calm"], spells)
+            stressed = self._rng("regime", "stressed", epoch.value).geometric(
+                1 / self.REGIME_DURATIONS["stressed"], spells)
+            lengths = np.column_stack([calm, stressed]).ravel()
+            states = np.repeat(np.tile([0, 1], spells), lengths)[:n]
+            params = np.array([self.REGIMES["calm"], self.REGIMES["stressed"]])
+            drift_adj = params[states, 0]
+            vol_mult = params[states, 1]
+
+        self._market_cache = {key: (shocks, drift_adj, vol_mult)}
+        return shocks, drift_adj, vol_mult
+
+    @staticmethod
+    def _business_days(start: pd.Timestamp, end: pd.Timestamp) -> np.ndarray:
+        """Mon-Fri dates in [start, end] as datetime64[D]"""
+        days = np.arange(start.to_datetime64().astype('datetime64[D]'),
+                         end.to_datetime64().astype('datetime64[D]') + 1)
+        return days[np.is_busday(days)]
+
+    def _noise(self, tickers: List[str], n: int, *keys) -> np.ndarray:
+        """Per-ticker (4, n, n_tickers) shocks for OHLC/volume"""
+        noise = np.empty((4, n, len(tickers)))
+        for i, ticker in enumerate(tickers):
+            rng = self._rng("noise", ticker.upper(), *keys)
+            noise[:, :, i] = rng.standard_normal((n, 4)).T
+        return noise
+
+    def _bars_from_returns(self, log_returns: np.ndarray, start_prices: np.ndarray,
+                           bar_vol: np.ndarray, volumes: np.ndarray,
+                           noise: np.ndarray, first: int = 0) -> Dict[str, np.ndarray]:
+        """
+        Build OHLCV arrays (n_bars x n_tickers) from log returns
+
+        Prices follow the full path; only rows from ``first`` on are
+        materialized as bars.
+        """
+        close = start_prices * np.exp(np.cumsum(log_returns, axis=0))
+        before = close[first - 1] if first > 0 else start_prices
+        prev_close = np.vstack([before, close[first:-1]])
+        close = close[first:]
+        log_returns = log_returns[first:]
+        bar_vol = bar_vol[first:]
+        noise = noise[:, first:]
+
+        open_ = prev_close * np.exp(0.1 * bar_vol * noise[0])
+        high = np.maximum(open_, close) * np.exp(0.5 * bar_vol * np.abs(noise[1]))
+        low = np.minimum(open_, close) * np.exp(-0.5 * bar_vol * np.abs(noise[2]))
+
+        activity = 1 + np.abs(log_returns) / bar_vol
+        volume = volumes * activity * np.exp(0.3 * noise[3])
+
+        return {
+            "Open": np.round(open_, 2),
+            "High": np.round(high, 2),
+            "Low": np.round(low, 2),
+            "Close": np.round(close, 2),
+            "Volume": volume.astype(np.int64),
+        }
+
+    def _generate_daily(self, tickers: List[str], start: pd.Timestamp,
+                        end: pd.Timestamp) -> Dict[str, pd.DataFrame]:
+        # Very long horizons extend the grid back past EPOCH
+        epoch = min(self.EPOCH, start.normalize())
+        days = self._business_days(epoch, end)
+        n = len(days)
+        first = int(days.searchsorted(start.to_datetime64().astype('datetime64[D]')))
+        if first >= n:
+            return {t: pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"])
+                    for t in tickers}
+
+        market, drift_adj, vol_mult = self._market_factor(epoch, n)
+        params = [self.ticker_params(t) for t in tickers]
+        sigma = np.array([p["volatility"] for p in params])
+        mu = np.array([p["drift"] for p in params])
+
+        idio = np.empty((n, len(tickers)))
+        for i, ticker in enumerate(tickers):
+            idio[:, i] = self._rng(
+                "idio", ticker.upper(), "1d", epoch.value).standard_normal(n)
+        rho = self.correlation
+        shocks = np.sqrt(rho) * market[:, None] + np.sqrt(1 - rho) * idio
+
+        dt = 1.0 / self.TRADING_DAYS
+        vol = sigma[None, :] * vol_mult[:, None]
+        log_returns = ((mu[None, :] + drift_adj[:, None] - 0.5 * vol ** 2) * dt
+                       + vol * np.sqrt(dt) * shocks)
+
+        # Scale paths so each ticker trades at its base price on ANCHOR
+        anchor = min(int(days.searchsorted(self.ANCHOR.to_datetime64())), n - 1)
+        level = log_returns[:anchor + 1].sum(axis=0)
+        start_prices = np.array([p["price"] for p in params]) * np.exp(-level)
+
+        bars = self._bars_from_returns(
+            log_returns,
+            start_prices,
+            vol * np.sqrt(dt),
+            np.array([p["volume"] for p in params]),
+            self._noise(tickers, n, "1d", epoch.value),
+            first)
+
+        index = pd.DatetimeIndex(days[first:].astype('datetime64[ns]'), name="Date")
+        frames = {}
+        for i, ticker in enumerate(tickers):
+            frames[ticker] = pd.DataFrame(
+                {col: values[:, i] for col, values in bars.items()},
+                index=index)
+        return frames
+
+    def _generate_intraday(self, tickers: List[str], start: pd.Timestamp,
+                           end: pd.Timestamp, interval: str) -> Dict[str, pd.DataFrame]:
+        step = self.INTRADAY_MINUTES[interval]
+        days = self._business_days(start.normalize(), end.normalize())
+        offsets = (np.arange(0, self.SESSION_MINUTES, step) + 9 * 60 + 30).astype(
+            'timedelta64[m]')
+        index = pd.DatetimeIndex(
+            (days.astype('datetime64[m]')[:, None] + offsets[None, :]).ravel().astype(
+                'datetime64[ns]'), name="Datetime")
+        n = len(index)
+
+        # Anchor each ticker at the daily close before the window
+        daily = self._generate_daily(
+            tickers, start.normalize() - pd.Timedelta(days=7),
+            start.normalize() - pd.Timedelta(days=1))
+        params = [self.ticker_params(t) for t in tickers]
+        start_prices = np.array([
+            daily[t]["Close"].iloc[-1] if len(daily[t]) else p["price"]
+            for t, p in zip(tickers, params)])
+
+        sigma = np.array([p["volatility"] for p in params])
+        mu = np.array([p["drift"] for p in params])
+        dt = step / (self.TRADING_DAYS * self.SESSION_MINUTES)
+
+        window = (interval, start.value, end.value)
+        market = self._rng("market", *window).standard_normal(n)
+        idio = np.column_stack([
+            self._rng("idio", t.upper(), *window).standard_normal(n) for t in tickers])
+        rho = self.correlation
+        shocks = np.sqrt(rho) * market[:, None] + np.sqrt(1 - rho) * idio
+
+        log_returns = ((mu - 0.5 * sigma ** 2) * dt)[None, :] + \
+            (sigma * np.sqrt(dt))[None, :] * shocks
+        bars = self._bars_from_returns(
+            log_returns, start_prices,
+            np.broadcast_to(sigma * np.sqrt(dt), log_returns.shape),
+            np.array([p["volume"] for p in params]) * step / self.SESSION_MINUTES,
+            self._noise(tickers, n, *window))
+
+        return {
+            ticker: pd.DataFrame(
+                {col: values[:, i] for col, values in bars.items()}, index=index)
+            for i, ticker in enumerate(tickers)
+        }
+
+    def generate(self, tickers: List[str], start: str = None, end: str = None,
+                 years: float = None, interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        """
+        Generate OHLCV frames for a universe of tickers
+
+        Args:
+            tickers: Ticker symbols (any string)
+            start: Start date (default: end - years)
+            end: End date (default: today)
+            years: Horizon when start is not given (default: 5)
+            interval: "1d" or an intraday interval (1m, 5m, 15m, 30m, 1h)
+
+        Returns:
+            dict mapping ticker -> DataFrame with Open/High/Low/Close/Volume
+        """
+        end_ts = pd.Timestamp(end) if end else pd.Timestamp.now().normalize()
+        if start:
+            start_ts = pd.Timestamp(start)
+        else:
+            start_ts = end_ts - pd.DateOffset(days=int(round(365.25 * (years or 5))))
+
+        tickers = list(dict.fromkeys(tickers))
+        if interval == "1d":
+            return self._generate_daily(tickers, start_ts, end_ts)
+        if interval in self.INTRADAY_MINUTES:
+            return self._generate_intraday(tickers, start_ts, end_ts, interval)
+        raise ValueError(f"Unsupported interval: {interval}")
+
+    def generate_frame(self, ticker: str, **kwargs) -> pd.DataFrame:
+        """Generate OHLCV for a single ticker (see generate)"""
+        return self.generate([ticker], **kwargs)[ticker]
+
+    def price_matrix(self, tickers: List[str], **kwargs) -> pd.DataFrame:
+        """Close prices as a (dates x tickers) DataFrame"""
+        frames = self.generate(tickers, **kwargs)
+        return pd.DataFrame({t: f["Close"] for t, f in frames.items()})
+
+
+class SyntheticSource:
+    """
+    MarketDataConnector source backed by SyntheticMarketGenerator
+
+    Use ``MarketDataConnector(source=SyntheticSource())`` (or
+    get_synthetic_connector) for the full connector interface, including
+    caching and bulk fetches, without any network traffic.
+    """
+
+    # Span generated for "max" requests
+    MAX_YEARS = 20
+
+    def __init__(self, generator: SyntheticMarketGenerator = None,
+                 interval: str = "1d"):
+        self.generator = generator or SyntheticMarketGenerator()
+        self.interval = interval
+
+    def _period_start(self, period: str) -> pd.Timestamp:
+        now = pd.Timestamp.now().normalize()
+        spec = PERIOD_SLICES.get(period, PERIOD_SLICES["1mo"])
+        if spec is None:
+            return now - pd.DateOffset(years=self.MAX_YEARS)
+        if isinstance(spec, int):
+            # Bar-count periods: generate a couple of weeks, slice later
+            return now - pd.Timedelta(days=14)
+        if spec == "ytd":
+            return now.replace(month=1, day=1)
+        return now - spec
+
+    def download(self, tickers: List[str], period: str) -> Dict[str, pd.DataFrame]:
+        """Batched synthetic history (same contract as YFinanceSource)"""
+        frames = self.generator.generate(
+            tickers, start=self._period_start(period), interval=self.interval)
+        if isinstance(PERIOD_SLICES.get(period), int):
+            frames = {t: slice_period(f, period) for t, f in frames.items()}
+        return frames
+
+    def history(self, ticker: str, period: str) -> pd.DataFrame:
+        """Single-ticker synthetic history (same contract as YFinanceSource)"""
+        return self.download([ticker], period)[ticker]
+
+
+def get_synthetic_connector(seed: int = 42, model: str = "gbm",
+                            correlation: float = 0.3,
+                            **connector_kwargs) -> MarketDataConnector:
+    """
+    MarketDataConnector backed by synthetic data
+
+    Args:
+        seed: Generator seed
+        model: "gbm" or "regime"
+        correlation: Pairwise return correlation across tickers
+        **connector_kwargs: Passed to MarketDataConnector
+
+    Returns:
+        Connector with the same interface as get_connector()
+    """
+    generator = SyntheticMarketGenerator(seed, model, correlation)
+    return MarketDataConnector(source=SyntheticSource(generator),
+                               **connector_kwargs)
+
+
 # Singleton instance
 _mock_service = MockMarketService()
 
@@ -243,3 +595,9 @@ if __name__ == "__main__":
         print(f"  Price: ${market_data['current_price']}")
         print(f"  RSI: {market_data['rsi']}")
         print(f"  Trend: {market_data['trend']}")
+
+    print("\nSynthetic generator (seed=42, regime model):")
+    generator = SyntheticMarketGenerator(seed=42, model="regime")
+    frames = generator.generate(["NVDA", "MSFT", "XYZ"], years=5)
+    for ticker, frame in frames.items():
+        print(f"  {ticker}: {len(frame)} bars, last close ${frame['Close'].iloc[-1]:.2f}")
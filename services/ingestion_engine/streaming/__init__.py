@@ -0,0 +1,14 @@
+"""
+Streaming tick pipeline (in-process stand-in for Kafka -> ClickHouse)
+"""
+from .bus import TICK_DTYPE, SymbolTable, Subscription, TickBus
+from .aggregator import BAR_DTYPE, INTERVAL_NS, BarAggregator
+from .sink import BarSink
+from .pipeline import StreamingPipeline, get_stream_pipeline
+
+__all__ = [
+    'TICK_DTYPE', 'SymbolTable', 'Subscription', 'TickBus',
+    'BAR_DTYPE', 'INTERVAL_NS', 'BarAggregator',
+    'BarSink',
+    'StreamingPipeline', 'get_stream_pipeline',
+]
@@ -0,0 +1,212 @@
+"""
+Online Bar Aggregator
+Rolls ticks into OHLCV bars (1s/1m/5m by default) as they arrive.
+
+Each batch of ticks is grouped by (symbol, bucket) with one sort and
+ufunc.reduceat calls, so Python-level work is per bar, not per tick.
+"""
+import numpy as np
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+INTERVAL_NS = {
+    "1s": 1_000_000_000,
+    "5s": 5_000_000_000,
+    "1m": 60_000_000_000,
+    "5m": 300_000_000_000,
+    "15m": 900_000_000_000,
+    "1h": 3_600_000_000_000,
+}
+
+BAR_DTYPE = np.dtype([
+    ('ts', '<i8'),        # bar open time, epoch nanoseconds
+    ('symbol', '<i4'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+    ('ticks', '<i8'),
+])
+
+# Open bar state: [bucket, open, high, low, close, volume, ticks, last tick ts]
+_BUCKET, _OPEN, _HIGH, _LOW, _CLOSE, _VOLUME, _TICKS, _LAST_TS = range(8)
+
+
+class BarAggregator:
+    """
+    Incremental OHLCV bars for several intervals at once
+    """
+
+    def __init__(self, intervals: Sequence[str] = ("1s", "1m", "5m"),
+                 history: int = 1000,
+                 on_bars: Callable[[str, np.ndarray], None] = None):
+        """
+        Initialize aggregator
+
+        Args:
+            intervals: Bar intervals (keys of INTERVAL_NS)
+            history: Closed bars kept in memory per symbol and interval
+            on_bars: Callback(interval, bars) for every batch of closed bars
+        """
+        unknown = [i for i in intervals if i not in INTERVAL_NS]
+        if unknown:
+            raise ValueError(f"Unsupported intervals: {unknown}")
+        self.intervals = list(intervals)
+        self.history = history
+        self.on_bars = on_bars
+        self._open: Dict[str, Dict[int, list]] = {i: {} for i in self.intervals}
+        self._closed: Dict[str, Dict[int, deque]] = {i: {} for i in self.intervals}
+        self.ticks_processed = 0
+        self.late_ticks = 0
+
+    def update(self, ticks: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Fold a batch of ticks (TICK_DTYPE) into the bars
+
+        Args:
+            ticks: Structured tick array, in publish order
+
+        Returns:
+            dict mapping interval -> bars closed by this batch (BAR_DTYPE)
+        """
+        closed = {}
+        if len(ticks) == 0:
+            return closed
+
+        symbols = ticks['symbol']
+        prices = ticks['price']
+        sizes = ticks['size']
+        ts = ticks['ts']
+
+        for interval in self.intervals:
+            buckets = ts // INTERVAL_NS[interval]
+            order = np.lexsort((buckets, symbols))
+            sym_sorted = symbols[order]
+            bucket_sorted = buckets[order]
+            price_sorted = prices[order]
+            ts_sorted = ts[order]
+
+            change = np.empty(len(order), dtype=bool)
+            change[0] = True
+            np.not_equal(sym_sorted[1:], sym_sorted[:-1], out=change[1:])
+            change[1:] |= bucket_sorted[1:] != bucket_sorted[:-1]
+            starts = np.flatnonzero(change)
+            ends = np.append(starts[1:], len(order))
+
+            groups = zip(
+                sym_sorted[starts].tolist(),
+                bucket_sorted[starts].tolist(),
+                price_sorted[starts].tolist(),
+                np.maximum.reduceat(price_sorted, starts).tolist(),
+                np.minimum.reduceat(price_sorted, starts).tolist(),
+                price_sorted[ends - 1].tolist(),
+                np.add.reduceat(sizes[order], starts).tolist(),
+                (ends - starts).tolist(),
+                np.maximum.reduceat(ts_sorted, starts).tolist())
+
+            emitted = self._merge(interval, groups)
+            if emitted:
+                bars = np.array(emitted, dtype=BAR_DTYPE)
+                closed[interval] = bars
+                if self.on_bars is not None:
+                    self.on_bars(interval, bars)
+
+        self.ticks_processed += len(ticks)
+        return closed
+
+    def _merge(self, interval: str, groups) -> List[tuple]:
+        """Merge per-(symbol, bucket) partial bars into the open bar state"""
+        width = INTERVAL_NS[interval]
+        open_bars = self._open[interval]
+        emitted = []
+
+        for symbol, bucket, o, h, lo, c, v, n, last_ts in groups:
+            bar = open_bars.get(symbol)
+            if bar is None or bucket > bar[_BUCKET]:
+                if bar is not None:
+                    emitted.append(self._close(interval, symbol, bar, width))
+                open_bars[symbol] = [bucket, o, h, lo, c, v, n, last_ts]
+            elif bucket == bar[_BUCKET]:
+                if h > bar[_HIGH]:
+                    bar[_HIGH] = h
+                if lo < bar[_LOW]:
+                    bar[_LOW] = lo
+                bar[_CLOSE] = c
+                bar[_VOLUME] += v
+                bar[_TICKS] += n
+                if last_ts > bar[_LAST_TS]:
+                    bar[_LAST_TS] = last_ts
+            else:
+                # Tick for a bar that has already closed
+                self.late_ticks += n
+        return emitted
+
+    def _close(self, interval: str, symbol: int, bar: list, width: int) -> tuple:
+        record = (bar[_BUCKET] * width, symbol, bar[_OPEN], bar[_HIGH],
+                  bar[_LOW], bar[_CLOSE], bar[_VOLUME], bar[_TICKS])
+        history = self._closed[interval].get(symbol)
+        if history is None:
+            history = self._closed[interval][symbol] = deque(maxlen=self.history)
+        history.append(record)
+        return record
+
+    def flush(self, now_ns: int) -> Dict[str, np.ndarray]:
+        """
+        Close open bars whose interval ended before now_ns
+
+        Lets quiet symbols publish their last bar without waiting for the
+        next tick.
+
+        Returns:
+            dict mapping interval -> bars closed (BAR_DTYPE)
+        """
+        closed = {}
+        for interval in self.intervals:
+            width = INTERVAL_NS[interval]
+            current = now_ns // width
+            open_bars = self._open[interval]
+            emitted = [
+                self._close(interval, symbol, open_bars.pop(symbol), width)
+                for symbol in [s for s, b in open_bars.items() if b[_BUCKET] < current]
+            ]
+            if emitted:
+                bars = np.array(emitted, dtype=BAR_DTYPE)
+                closed[interval] = bars
+                if self.on_bars is not None:
+                    self.on_bars(interval, bars)
+        return closed
+
+    def latest(self, symbol: int, interval: str, n: int = 1,
+               include_partial: bool = True) -> np.ndarray:
+        """
+        Most recent bars for a symbol id, oldest first
+
+        Args:
+            symbol: Symbol id
+            interval: Bar interval
+            n: Number of bars
+            include_partial: Include the still-open bar
+
+        Returns:
+            Structured array with BAR_DTYPE
+        """
+        width = INTERVAL_NS[interval]
+        rows = list(self._closed[interval].get(symbol, ()))
+        bar = self._open[interval].get(symbol)
+        if include_partial and bar is not None:
+            rows.append((bar[_BUCKET] * width, symbol, bar[_OPEN], bar[_HIGH],
+                         bar[_LOW], bar[_CLOSE], bar[_VOLUME], bar[_TICKS]))
+        return np.array(rows[-n:], dtype=BAR_DTYPE)
+
+    def last_trade(self, symbol: int) -> Optional[Tuple[float, int]]:
+        """(last price, timestamp ns) from the finest interval"""
+        interval = min(self.intervals, key=INTERVAL_NS.get)
+        bar = self._open[interval].get(symbol)
+        if bar is not None:
+            return bar[_CLOSE], bar[_LAST_TS]
+        history = self._closed[interval].get(symbol)
+        if history:
+            # Closed bars only keep their open time; report the bar end
+            return history[-1][5], history[-1][0] + INTERVAL_NS[interval]
+        return None
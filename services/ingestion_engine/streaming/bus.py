@@ -0,0 +1,215 @@
+"""
+Tick Bus - bounded ring-buffer pub/sub for market ticks
+Stands in for the Kafka topic of the Kafka → ClickHouse pipeline.
+
+Ticks live in one preallocated NumPy structured array. Publishers append
+under a lock; subscribers keep their own cursor and read without locking,
+detecting (and counting) ticks overwritten before they were read. Like a
+seqlock, a publisher advances ``reserved`` before touching any slot and
+``head`` once the batch is written, so a reader re-checks ``reserved``
+after copying and discards every slot a publisher may have been writing.
+"""
+import numpy as np
+import threading
+import time
+from typing import Dict, List, Sequence, Union
+
+TICK_DTYPE = np.dtype([
+    ('ts', '<i8'),        # epoch nanoseconds
+    ('symbol', '<i4'),    # SymbolTable id
+    ('price', '<f8'),
+    ('size', '<f8'),
+])
+
+
+class SymbolTable:
+    """
+    Maps ticker strings to dense integer ids used inside the pipeline
+
+    Tickers are case-insensitive: "aapl" and "AAPL" share one id and
+    name() always returns the upper-case form.
+    """
+
+    def __init__(self):
+        # Every spelling seen -> id; names hold the canonical upper case
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def id(self, symbol: str) -> int:
+        """Id for symbol, registering it on first use"""
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is None:
+            name = symbol.upper()
+            with self._lock:
+                symbol_id = self._ids.get(name)
+                if symbol_id is None:
+                    symbol_id = len(self._names)
+                    self._names.append(name)
+                    self._ids[name] = symbol_id
+                self._ids[symbol] = symbol_id
+        return symbol_id
+
+    def ids(self, symbols: Sequence[str]) -> np.ndarray:
+        """Vector of ids for a sequence of symbols"""
+        return np.fromiter((self.id(s) for s in symbols), dtype=np.int32,
+                           count=len(symbols))
+
+    def name(self, symbol_id: int) -> str:
+        return self._names[symbol_id]
+
+    def get(self, symbol: str, default=None):
+        """Id for symbol without registering it"""
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._ids.get(symbol.upper(), default)
+        return symbol_id
+
+
+class Subscription:
+    """
+    Independent reader over a TickBus
+
+    Starts at the bus head at subscribe time. If it falls more than one
+    buffer behind, the oldest unread ticks are skipped and counted in
+    ``dropped``.
+    """
+
+    def __init__(self, bus: "TickBus"):
+        self.bus = bus
+        self.cursor = bus.head
+        self.dropped = 0
+
+    @property
+    def lag(self) -> int:
+        """Published ticks not yet read"""
+        return self.bus.head - self.cursor
+
+    def poll(self, max_ticks: int = None) -> np.ndarray:
+        """
+        Read the next batch of ticks
+
+        Args:
+            max_ticks: Upper bound on ticks returned (default: all available)
+
+        Returns:
+            Structured array (copy) with TICK_DTYPE, possibly empty
+        """
+        bus = self.bus
+        capacity = bus.capacity
+        head = bus.head
+
+        # Slots below reserved - capacity are (being) overwritten
+        oldest = bus.reserved - capacity
+        if oldest > self.cursor:
+            self.dropped += oldest - self.cursor
+            self.cursor = oldest
+
+        n = head - self.cursor
+        if max_ticks is not None:
+            n = min(n, max_ticks)
+        if n <= 0:
+            return bus.buffer[:0].copy()
+
+        start = self.cursor % capacity
+        end = start + n
+        if end <= capacity:
+            ticks = bus.buffer[start:end].copy()
+        else:
+            ticks = np.concatenate(
+                [bus.buffer[start:], bus.buffer[:end - capacity]])
+
+        # Publishers may have lapped us while copying; any slot they had
+        # reserved by now may be torn
+        overrun = bus.reserved - capacity - self.cursor
+        if overrun > 0:
+            ticks = ticks[overrun:]
+            self.dropped += overrun
+            self.cursor += overrun
+
+        self.cursor += len(ticks)
+        return ticks
+
+
+class TickBus:
+    """
+    Bounded, multi-subscriber tick buffer
+    """
+
+    def __init__(self, capacity: int = 1 << 20, symbols: SymbolTable = None):
+        """
+        Initialize bus
+
+        Args:
+            capacity: Ticks retained in the ring buffer
+            symbols: Shared symbol table (default: new table)
+        """
+        self.capacity = capacity
+        self.buffer = np.zeros(capacity, dtype=TICK_DTYPE)
+        self.symbols = symbols or SymbolTable()
+        self.head = 0  # total ticks ever published
+        self.reserved = 0  # head plus ticks being written
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> Subscription:
+        """Create a reader positioned at the current head"""
+        return Subscription(self)
+
+    def publish(self, symbol: str, price: float, size: float = 0.0,
+                ts: int = None):
+        """Publish a single tick (ts in epoch ns, default: now)"""
+        self.publish_batch(
+            np.array([self.symbols.id(symbol)], dtype=np.int32),
+            np.array([price], dtype=np.float64),
+            np.array([size], dtype=np.float64),
+            np.array([ts if ts is not None else time.time_ns()], dtype=np.int64))
+
+    def publish_batch(self, symbols: Union[Sequence[str], np.ndarray],
+                      prices: np.ndarray, sizes: np.ndarray = None,
+                      ts: np.ndarray = None) -> int:
+        """
+        Publish a batch of ticks
+
+        Args:
+            symbols: Ticker strings or int32 symbol ids
+            prices: Trade prices
+            sizes: Trade sizes (default: 0)
+            ts: Epoch-ns timestamps (default: now for every tick)
+
+        Returns:
+            Number of ticks published
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        n = len(prices)
+        if n == 0:
+            return 0
+        if isinstance(symbols, np.ndarray) and symbols.dtype.kind in "iu":
+            symbol_ids = symbols.astype(np.int32, copy=False)
+        else:
+            symbol_ids = self.symbols.ids(symbols)
+        if sizes is None:
+            sizes = np.zeros(n)
+        if ts is None:
+            ts = np.full(n, time.time_ns(), dtype=np.int64)
+
+        # Only the newest `capacity` ticks can survive a single write
+        skip = max(0, n - self.capacity)
+        count = n - skip
+
+        with self._lock:
+            self.reserved = self.head + n
+            start = (self.head + skip) % self.capacity
+            first = min(count, self.capacity - start)
+            for dst, src in ((slice(start, start + first), slice(skip, skip + first)),
+                             (slice(0, count - first), slice(skip + first, n))):
+                if dst.stop > dst.start:
+                    block = self.buffer[dst]
+                    block['ts'] = ts[src]
+                    block['symbol'] = symbol_ids[src]
+                    block['price'] = prices[src]
+                    block['size'] = sizes[src]
+            self.head += n
+        return n
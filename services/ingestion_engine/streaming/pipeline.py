@@ -0,0 +1,215 @@
+"""
+Streaming Pipeline
+Wires TickBus -> BarAggregator -> BarSink in one process and serves the
+latest bars, prices and indicators from memory to the agent tools.
+"""
+from shared.utils.indicators import IndicatorSet
+from shared.utils.logger import get_logger
+from .aggregator import BAR_DTYPE, INTERVAL_NS, BarAggregator
+from .bus import SymbolTable, TickBus
+from .sink import BarSink
+import numpy as np
+import pandas as pd
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+# Add shared utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+logger = get_logger("stream-pipeline")
+
+
+class StreamingPipeline:
+    """
+    In-process tick pipeline
+
+    Usage:
+        pipeline = StreamingPipeline()
+        pipeline.bus.publish_batch(symbols, prices, sizes, ts)
+        pipeline.pump()                    # or pipeline.start()
+        pipeline.latest_bars("AAPL", "1m", n=30)
+        pipeline.latest_indicators("AAPL", "1m")
+    """
+
+    def __init__(self, bus: TickBus = None,
+                 intervals: Sequence[str] = ("1s", "1m", "5m"),
+                 sink: BarSink = None,
+                 persist_intervals: Sequence[str] = ("1m", "5m"),
+                 root_dir: str = "./data/historical/stream",
+                 history: int = 1000,
+                 batch: int = 1 << 16,
+                 indicator_intervals: Sequence[str] = ("1m",)):
+        """
+        Initialize pipeline
+
+        Args:
+            bus: Tick bus to consume (default: new TickBus)
+            intervals: Bar intervals kept in memory
+            sink: Bar sink (default: BarSink for persist_intervals)
+            persist_intervals: Intervals appended to the historical store;
+                empty disables persistence
+            root_dir: Store root for the default sink
+            history: Closed bars kept in memory per symbol and interval
+            batch: Maximum ticks consumed per pump step
+            indicator_intervals: Intervals whose closed bars update the
+                live indicators (O(1) per bar)
+        """
+        self.bus = bus or TickBus()
+        self.symbols: SymbolTable = self.bus.symbols
+        if sink is None and persist_intervals:
+            sink = BarSink(self.symbols, root_dir=root_dir,
+                           intervals=[i for i in persist_intervals if i in intervals])
+        self.sink = sink
+        self.indicator_intervals = [i for i in indicator_intervals if i in intervals]
+        # (symbol id, interval) -> IndicatorSet
+        self.indicators: Dict[Tuple[int, str], IndicatorSet] = {}
+        self.aggregator = BarAggregator(
+            intervals, history=history, on_bars=self._on_bars)
+        self.subscription = self.bus.subscribe()
+        self.batch = batch
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _on_bars(self, interval: str, bars: np.ndarray):
+        if self.sink is not None:
+            self.sink.add(interval, bars)
+        if interval not in self.indicator_intervals:
+            return
+        for symbol_id, high, low, close in zip(
+                bars['symbol'].tolist(), bars['high'].tolist(),
+                bars['low'].tolist(), bars['close'].tolist()):
+            state = self.indicators.get((symbol_id, interval))
+            if state is None:
+                state = self.indicators[(symbol_id, interval)] = IndicatorSet()
+            state.update(high, low, close)
+
+    def pump(self, max_ticks: int = None, now_ns: int = None) -> int:
+        """
+        Drain the bus into the aggregator
+
+        Args:
+            max_ticks: Stop after this many ticks (default: drain everything)
+            now_ns: Wall clock used to close idle bars (default: skip)
+
+        Returns:
+            Number of ticks processed
+        """
+        processed = 0
+        while max_ticks is None or processed < max_ticks:
+            limit = self.batch if max_ticks is None else \
+                min(self.batch, max_ticks - processed)
+            ticks = self.subscription.poll(limit)
+            if len(ticks) == 0:
+                break
+            self.aggregator.update(ticks)
+            processed += len(ticks)
+        if now_ns is not None:
+            self.aggregator.flush(now_ns)
+        return processed
+
+    def _run(self, poll_interval: float):
+        while not self._stop.is_set():
+            if self.pump(now_ns=time.time_ns()) == 0:
+                self._stop.wait(poll_interval)
+        self.pump()
+
+    def start(self, poll_interval: float = 0.01):
+        """Consume the bus on a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(poll_interval,),
+            name="titan-stream-pipeline", daemon=True)
+        self._thread.start()
+        logger.info("Streaming pipeline started",
+                    intervals=self.aggregator.intervals)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background thread and flush the sink"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout)
+            self._thread = None
+        if self.sink is not None:
+            self.sink.close(timeout)
+        logger.info("Streaming pipeline stopped", **self.stats())
+
+    def latest_bars(self, symbol: str, interval: str = "1m", n: int = 1,
+                    include_partial: bool = True) -> pd.DataFrame:
+        """
+        Most recent in-memory bars for a ticker
+
+        Returns:
+            DataFrame with Open/High/Low/Close/Volume/Ticks indexed by bar
+            open time (empty if the ticker has not traded)
+        """
+        symbol_id = self.symbols.get(symbol.upper())
+        if symbol_id is None or interval not in INTERVAL_NS:
+            bars = np.zeros(0, dtype=BAR_DTYPE)
+        else:
+            bars = self.aggregator.latest(symbol_id, interval, n, include_partial)
+        return pd.DataFrame({
+            'Open': bars['open'],
+            'High': bars['high'],
+            'Low': bars['low'],
+            'Close': bars['close'],
+            'Volume': bars['volume'],
+            'Ticks': bars['ticks'],
+        }, index=pd.DatetimeIndex(bars['ts'].astype('datetime64[ns]'), name='Date'))
+
+    def latest_price(self, symbol: str) -> Optional[dict]:
+        """
+        Last streamed trade for a ticker
+
+        Returns:
+            dict with price and timestamp (epoch seconds), or None
+        """
+        symbol_id = self.symbols.get(symbol.upper())
+        if symbol_id is None:
+            return None
+        trade = self.aggregator.last_trade(symbol_id)
+        if trade is None:
+            return None
+        price, ts = trade
+        return {"price": price, "timestamp": ts / 1e9}
+
+    def latest_indicators(self, symbol: str, interval: str = "1m") -> Optional[dict]:
+        """
+        Live indicators over a ticker's closed bars
+
+        Returns:
+            dict of indicator values (see shared.utils.indicators.technicals)
+            with the bar count and last close, or None
+        """
+        symbol_id = self.symbols.get(symbol.upper())
+        state = self.indicators.get((symbol_id, interval))
+        if state is None:
+            return None
+        return dict(state.snapshot(), bars=state.bars, close=state.close)
+
+    def stats(self) -> dict:
+        """Throughput and backlog counters"""
+        return {
+            "published": self.bus.head,
+            "processed": self.aggregator.ticks_processed,
+            "lag": self.subscription.lag,
+            "dropped": self.subscription.dropped,
+            "late_ticks": self.aggregator.late_ticks,
+            "bars_written": self.sink.bars_written if self.sink is not None else 0,
+        }
+
+
+# Singleton instance
+_pipeline = None
+
+
+def get_stream_pipeline() -> StreamingPipeline:
+    """Get or create singleton streaming pipeline"""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = StreamingPipeline()
+    return _pipeline
@@ -0,0 +1,157 @@
+"""
+Batched Bar Sink
+Stands in for the ClickHouse side of the pipeline: buffers closed bars
+and appends them to a per-interval intraday store in batches.
+
+Bars go to an IntradayStore (one compressed chunk per ticker and day),
+so a flush merges into the current day instead of rewriting a growing
+partition. Flushes run on the sink's own writer thread; the pump thread
+only buffers bars and signals it.
+"""
+from services.backtest_engine.columnar_store import OHLCV_DTYPE
+from services.backtest_engine.intraday_store import IntradayStore
+from shared.utils.logger import get_logger
+from .bus import SymbolTable
+import numpy as np
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+# Add shared utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+logger = get_logger("stream-sink")
+
+
+class BarSink:
+    """
+    Buffers closed bars and appends them to one IntradayStore per interval
+
+    Stores live under {root_dir}/{interval}, separate from the daily
+    DataLoader cache. Volumes are stored as whole units.
+    """
+
+    def __init__(self, symbols: SymbolTable,
+                 root_dir: str = "./data/historical/stream",
+                 intervals: Sequence[str] = ("1m", "5m"),
+                 batch_size: int = 50_000,
+                 flush_interval: float = 30.0):
+        """
+        Initialize sink
+
+        Args:
+            symbols: Symbol table used to resolve ids to tickers
+            root_dir: Root directory for per-interval stores
+            intervals: Intervals to persist (others are ignored)
+            batch_size: Buffered bars that trigger a flush
+            flush_interval: Seconds after which buffered bars are flushed
+        """
+        self.symbols = symbols
+        self.intervals = list(intervals)
+        self.stores = {
+            interval: IntradayStore(os.path.join(root_dir, interval))
+            for interval in self.intervals
+        }
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffers: Dict[str, List[np.ndarray]] = {i: [] for i in self.intervals}
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        # Serializes store writes between the writer thread and flush() callers
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self.bars_written = 0
+
+    def add(self, interval: str, bars: np.ndarray):
+        """
+        Buffer closed bars (BAR_DTYPE)
+
+        Never writes on the caller's thread: a full batch wakes the writer
+        thread, which also flushes every flush_interval seconds.
+        """
+        if interval not in self._buffers or len(bars) == 0:
+            return
+        with self._lock:
+            self._buffers[interval].append(bars)
+            self._buffered += len(bars)
+            full = self._buffered >= self.batch_size
+        self.start()
+        if full:
+            self._wake.set()
+
+    def start(self):
+        """Start the writer thread (idempotent)"""
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._lock:
+            if self._writer is not None and self._writer.is_alive():
+                return
+            self._stop.clear()
+            self._writer = threading.Thread(
+                target=self._run, name="titan-stream-sink", daemon=True)
+            self._writer.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(max(0.0, self.flush_interval -
+                                (time.monotonic() - self._last_flush)))
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            if self._buffered >= self.batch_size or \
+                    time.monotonic() - self._last_flush >= self.flush_interval:
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.error("Stream bar flush failed", error=str(e))
+
+    def close(self, timeout: float = 5.0):
+        """Stop the writer thread and flush what is still buffered"""
+        writer = self._writer
+        if writer is not None:
+            self._stop.set()
+            self._wake.set()
+            writer.join(timeout)
+            self._writer = None
+        self.flush()
+
+    def flush(self) -> int:
+        """
+        Append all buffered bars to their stores (synchronously)
+
+        Returns:
+            Number of bars written
+        """
+        with self._lock:
+            buffers = self._buffers
+            self._buffers = {i: [] for i in self.intervals}
+            self._buffered = 0
+            self._last_flush = time.monotonic()
+
+        written = 0
+        with self._write_lock:
+            for interval, chunks in buffers.items():
+                if not chunks:
+                    continue
+                bars = np.concatenate(chunks)
+                order = np.lexsort((bars['ts'], bars['symbol']))
+                bars = bars[order]
+                splits = np.flatnonzero(np.diff(bars['symbol'])) + 1
+                for group in np.split(bars, splits):
+                    ticker = self.symbols.name(int(group['symbol'][0]))
+                    records = np.empty(len(group), dtype=OHLCV_DTYPE)
+                    for field in ('ts', 'open', 'high', 'low', 'close'):
+                        records[field] = group[field]
+                    records['volume'] = np.round(group['volume'])
+                    self.stores[interval].append_records(ticker, records)
+                    written += len(group)
+
+        if written:
+            self.bars_written += written
+            logger.info("Flushed streamed bars", bars=written)
+        return written
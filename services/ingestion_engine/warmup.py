@@ -0,0 +1,250 @@
+"""
+Startup Cache Warmer
+Loads a watchlist into the quote table, the connector's OHLCV cache, the
+DataLoader history cache and the indicator cache in the background, so
+the first query for a watched ticker is as fast as later ones.
+
+Runs from main.py at startup when TITAN_WATCHLIST is set (TITAN_WARMUP=0
+to disable) or standalone, where DEFAULT_WATCHLIST is the fallback:
+    python -m services.ingestion_engine.warmup AAPL MSFT NVDA
+"""
+from services.backtest_engine.data_loader import DataLoader, get_data_loader
+from .connectors.quote_snapshot import QuoteSnapshotService, get_quote_service
+from .connectors.yfinance_connector import MarketDataConnector, get_connector
+from shared.utils.indicator_graph import TECHNICALS, get_indicator_cache
+from shared.utils.logger import get_logger
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Sequence
+import os
+import sys
+
+# Add shared utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+logger = get_logger("cache-warmer")
+
+# Command line fallback when TITAN_WATCHLIST is not set
+DEFAULT_WATCHLIST = ["AAPL", "MSFT", "GOOGL", "NVDA", "AMZN", "TSLA"]
+
+
+def load_watchlist(default: Sequence[str] = ()) -> List[str]:
+    """
+    Tickers from the comma-separated TITAN_WATCHLIST env var
+
+    Args:
+        default: Returned when TITAN_WATCHLIST is unset (default: none)
+    """
+    configured = [t.strip().upper()
+                  for t in os.getenv("TITAN_WATCHLIST", "").split(",") if t.strip()]
+    return configured or list(default)
+
+
+class CacheWarmer:
+    """
+    Concurrent, non-blocking cache warmup for a watchlist
+
+    Stages:
+    - quotes:  one batched snapshot poll, then scheduled polling
+    - ohlcv:   batched get_multiple_tickers for ``period``; shorter tool
+               periods are then served from the same entry by slicing
+    - history: full daily history per ticker into DataLoader's cache
+    - indicators: TECHNICALS over the ``indicator_period`` OHLCV (what
+               calculate_technicals evaluates), once the ohlcv stage is done
+
+    Further stages can be registered with add_stage(name, fn), where
+    fn(ticker) warms one ticker.
+    """
+
+    def __init__(self, tickers: Sequence[str],
+                 connector: MarketDataConnector = None,
+                 data_loader: DataLoader = None,
+                 quote_service: QuoteSnapshotService = None,
+                 period: str = "1y",
+                 indicator_period: str = "3mo",
+                 max_workers: int = 4,
+                 on_progress: Callable[[str, int, int], None] = None):
+        """
+        Initialize warmer
+
+        Args:
+            tickers: Watchlist
+            connector: Connector to warm (default: singleton)
+            data_loader: DataLoader to warm (default: singleton)
+            quote_service: Quote table to warm (default: singleton)
+            period: OHLCV period fetched for the connector cache
+            indicator_period: OHLCV period the indicator cache is warmed
+                for (calculate_technicals' default)
+            max_workers: Concurrent warmup tasks
+            on_progress: Callback(stage, done, total) after every task
+        """
+        self.tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        self.connector = connector
+        self.data_loader = data_loader
+        self.quote_service = quote_service
+        self.period = period
+        self.indicator_period = indicator_period
+        self.max_workers = max_workers
+        self.on_progress = on_progress
+        self._stages: Dict[str, Callable[[str], None]] = {}
+        self.progress: Dict[str, List[int]] = {}
+        self.errors: Dict[str, str] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._ohlcv_done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_stage(self, name: str, fn: Callable[[str], None]):
+        """Register a per-ticker warmup stage"""
+        self._stages[name] = fn
+
+    def _warm_quotes(self):
+        service = self.quote_service or get_quote_service()
+        service.watch(self.tickers)
+        service.refresh()
+        service.start()
+
+    def _warm_ohlcv(self):
+        try:
+            connector = self.connector or get_connector()
+            results = connector.get_multiple_tickers(
+                self.tickers, self.period, layout="columns")
+        finally:
+            self._ohlcv_done.set()
+        failed = {t: r["error"] for t, r in results.items() if "error" in r}
+        if failed:
+            raise RuntimeError(f"{len(failed)} tickers failed: {sorted(failed)}")
+
+    def _warm_indicators(self, ticker: str):
+        # Slice the batched ohlcv entry instead of fetching per ticker. The
+        # ohlcv task is queued first, so it is already running.
+        self._ohlcv_done.wait()
+        connector = self.connector or get_connector()
+        result = connector.get_historical_data(
+            ticker, self.indicator_period, layout="columns")
+        get_indicator_cache().latest(ticker, result["data"], TECHNICALS)
+
+    def _warm_history(self, ticker: str):
+        (self.data_loader or get_data_loader()).load_history(ticker)
+
+    def _tasks(self):
+        """(stage, label, fn) for every unit of work"""
+        tasks = [("quotes", "*", self._warm_quotes),
+                 ("ohlcv", "*", self._warm_ohlcv)]
+        stages = {"history": self._warm_history,
+                  "indicators": self._warm_indicators, **self._stages}
+        for stage, fn in stages.items():
+            tasks += [(stage, ticker, (lambda fn=fn, t=ticker: fn(t)))
+                      for ticker in self.tickers]
+        return tasks
+
+    def _finish_task(self, stage: str, label: str, error: Exception = None):
+        with self._lock:
+            counts = self.progress[stage]
+            counts[0] += 1
+            if error is not None:
+                self.errors[f"{stage}:{label}"] = str(error)
+            done, total = counts
+        logger.debug("Warmup progress", stage=stage, done=done, total=total,
+                     error=str(error) if error else None)
+        if self.on_progress is not None:
+            self.on_progress(stage, done, total)
+
+    def run(self) -> dict:
+        """Warm all stages (blocking) and return the final status"""
+        self.started_at = time.time()
+        self._ohlcv_done.clear()
+        tasks = self._tasks()
+        self.progress = {}
+        for stage, _, _ in tasks:
+            self.progress.setdefault(stage, [0, 0])[1] += 1
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="titan-warmup") as pool:
+            futures = {pool.submit(fn): (stage, label) for stage, label, fn in tasks}
+            for future in as_completed(futures):
+                stage, label = futures[future]
+                self._finish_task(stage, label, future.exception())
+
+        self.finished_at = time.time()
+        self._done.set()
+        status = self.status()
+        logger.info("Cache warmup complete", tickers=len(self.tickers),
+                    seconds=status["elapsed"], errors=len(self.errors))
+        return status
+
+    def start(self) -> "CacheWarmer":
+        """Run in a daemon thread and return immediately"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.run, name="titan-cache-warmer", daemon=True)
+            self._thread.start()
+        return self
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until warmup finishes; False on timeout"""
+        return self._done.wait(timeout)
+
+    def status(self) -> dict:
+        """Progress per stage, errors and elapsed seconds"""
+        end = self.finished_at or time.time()
+        return {
+            "tickers": len(self.tickers),
+            "progress": {s: {"done": d, "total": t}
+                         for s, (d, t) in self.progress.items()},
+            "errors": dict(self.errors),
+            "finished": self._done.is_set(),
+            "elapsed": round(end - self.started_at, 3) if self.started_at else 0.0,
+        }
+
+
+def start_background_warmup(tickers: Sequence[str] = None) -> Optional[CacheWarmer]:
+    """
+    Start warming the configured watchlist without blocking
+
+    Nothing is warmed (and no quote poller started) unless a watchlist is
+    configured, matching get_quote_service.
+
+    Returns:
+        The running CacheWarmer, or None if disabled via TITAN_WARMUP=0 or
+        no watchlist is configured
+    """
+    if os.getenv("TITAN_WARMUP", "1").strip().lower() in ("0", "false", "no"):
+        return None
+    tickers = list(tickers or load_watchlist())
+    if not tickers:
+        return None
+    return CacheWarmer(tickers).start()
+
+
+def main(argv: List[str] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Warm Titan data caches")
+    parser.add_argument("tickers", nargs="*",
+                        help="Tickers to warm (default: TITAN_WATCHLIST or "
+                             "DEFAULT_WATCHLIST)")
+    parser.add_argument("--period", default="1y",
+                        help="OHLCV period for the connector cache")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    def report(stage, done, total):
+        print(f"  [{stage:<10}] {done}/{total}")
+
+    tickers = args.tickers or load_watchlist(DEFAULT_WATCHLIST)
+    warmer = CacheWarmer(tickers, period=args.period,
+                         max_workers=args.workers, on_progress=report)
+    print(f"🔥 Warming caches for {len(warmer.tickers)} tickers...")
+    status = warmer.run()
+    for task, error in status["errors"].items():
+        print(f"  ❌ {task}: {error}")
+    print(f"✅ Done in {status['elapsed']:.1f}s")
+    return 0 if not status["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+In-process caching helpers for Titan Platform
+Thread-safe LRU cache bounded by an approximate byte budget
+"""
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+def estimate_nbytes(value: Any) -> int:
+    """
+    Approximate in-memory size of a cached value
+
+    Uses DataFrame.memory_usage / ndarray.nbytes when available and falls
+    back to sys.getsizeof for plain Python objects.
+    """
+    memory_usage = getattr(value, "memory_usage", None)
+    if callable(memory_usage):
+        try:
+            usage = memory_usage(deep=True)
+            return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+        except TypeError:
+            pass
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(value)
+
+
+class ByteLRUCache:
+    """
+    Least-recently-used cache that evicts once total size exceeds max_bytes
+
+    A single entry larger than max_bytes is not stored.
+    """
+
+    def __init__(self, max_bytes: int,
+                 sizeof: Callable[[Any], int] = estimate_nbytes):
+        """
+        Initialize cache
+
+        Args:
+            max_bytes: Total byte budget for all entries
+            sizeof: Function returning the size of a value in bytes
+        """
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def nbytes(self) -> int:
+        """Current total size of all entries"""
+        return self._bytes
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return value for key and mark it most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Return value for key without touching recency"""
+        entry = self._entries.get(key)
+        return default if entry is None else entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: int = None) -> List[Hashable]:
+        """
+        Insert or replace value for key
+
+        Args:
+            key: Cache key
+            value: Value to store
+            nbytes: Size of value (computed with sizeof if omitted)
+
+        Returns:
+            Keys evicted to make room
+        """
+        size = self.sizeof(value) if nbytes is None else nbytes
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return []
+            self._entries[key] = (value, size)
+            self._bytes += size
+
+            evicted = []
+            while self._bytes > self.max_bytes and self._entries:
+                old_key, (_, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+                evicted.append(old_key)
+            return evicted
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value"""
+        with self._lock:
+            entry = self._remove(key)
+            return default if entry is None else entry[0]
+
+    def _remove(self, key: Hashable) -> Optional[Tuple[Any, int]]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+        return entry
+
+    def keys(self) -> List[Hashable]:
+        """Snapshot of keys, least recently used first"""
+        with self._lock:
+            return list(self._entries.keys())
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count, size and eviction counters"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,396 @@
+"""
+Indicator Graph for Titan Platform
+Lazy, memoized evaluation of indicator requests against one OHLCV series.
+
+Indicators are nodes named ``kind:params`` (``ema:12``, ``macd:12,26``,
+``bb_upper:20,2``) whose inputs are other nodes, so a batch of requests
+shares its intermediates: MACD and PPO reuse the same EMA12/EMA26, SMA
+and Bollinger bands the same rolling mean, volatility and Sharpe the
+same returns. Only nodes reachable from the requested names are
+evaluated, each at most once per graph. IndicatorCache keeps one graph
+per (ticker, bar range), so repeated requests on the same data are free.
+"""
+from . import indicators
+from .cache import ByteLRUCache
+import numpy as np
+import threading
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+TRADING_DAYS = 252
+
+# Source columns of the OHLCV input
+SOURCES = ("open", "high", "low", "close", "volume")
+
+# kind -> factory(*params) returning (input node names, fn(*inputs))
+NODE_KINDS: Dict[str, Callable[..., Tuple[Tuple[str, ...], Callable]]] = {}
+
+# calculate_technicals fields -> nodes
+TECHNICALS = {
+    "rsi": "rsi:14",
+    "macd": "macd:12,26",
+    "macd_signal": "macd_signal:12,26,9",
+    "macd_histogram": "macd_hist:12,26,9",
+    "bollinger_middle": "sma:20",
+    "bollinger_upper": "bb_upper:20,2",
+    "bollinger_lower": "bb_lower:20,2",
+    "atr": "atr:14",
+    "sma_50": "sma:50",
+    "sma_200": "sma:200",
+}
+
+
+def node_kind(kind: str):
+    """Register a node factory for ``kind:params`` names"""
+    def register(factory):
+        NODE_KINDS[kind] = factory
+        return factory
+    return register
+
+
+def _number(text: str):
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def parse_node(name: str) -> Tuple[str, tuple]:
+    """
+    Split a node name into kind and numeric parameters
+
+    Raises:
+        ValueError: Unknown kind or malformed parameters
+    """
+    kind, _, params = name.strip().lower().partition(":")
+    if kind not in NODE_KINDS and kind not in SOURCES:
+        raise ValueError(f"Unknown indicator: {name}")
+    try:
+        return kind, tuple(_number(p) for p in params.split(",")) if params else ()
+    except ValueError:
+        raise ValueError(f"Bad indicator parameters: {name}") from None
+
+
+def node_name(kind: str, *params) -> str:
+    """Canonical node name (``node_name("ema", 12) == "ema:12"``)"""
+    return f"{kind}:{','.join(str(p) for p in params)}" if params else kind
+
+
+def canonical(name: str) -> str:
+    """Canonical form of a node name (``"EMA:12.0"`` -> ``"ema:12"``)"""
+    kind, params = parse_node(name)
+    return node_name(kind, *params)
+
+
+# ---------------------------------------------------------------------------
+# Node kinds
+# ---------------------------------------------------------------------------
+
+@node_kind("diff")
+def _diff():
+    return ("close",), lambda close: np.diff(close, prepend=np.nan)
+
+
+@node_kind("returns")
+def _returns():
+    return ("close", "diff"), lambda close, diff: diff / np.concatenate(([np.nan], close[:-1]))
+
+
+@node_kind("gain")
+def _gain():
+    return ("diff",), lambda diff: np.where(diff > 0, diff, 0.0)
+
+
+@node_kind("loss")
+def _loss():
+    return ("diff",), lambda diff: np.where(diff < 0, -diff, 0.0)
+
+
+@node_kind("sma")
+def _sma(window):
+    return ("close",), lambda close: indicators.sma(close, window)
+
+
+@node_kind("std")
+def _std(window):
+    return ("close",), lambda close: indicators.rolling_std(close, window)
+
+
+@node_kind("ema")
+def _ema(span):
+    return ("close",), lambda close: indicators.ema(close, span=span)
+
+
+@node_kind("avg_gain")
+def _avg_gain(period):
+    return ("gain",), lambda gain: indicators.wilder(gain, period, 1)
+
+
+@node_kind("avg_loss")
+def _avg_loss(period):
+    return ("loss",), lambda loss: indicators.wilder(loss, period, 1)
+
+
+@node_kind("rsi")
+def _rsi(period=14):
+    return (node_name("avg_gain", period), node_name("avg_loss", period)), \
+        indicators.rsi_from_averages
+
+
+@node_kind("macd")
+def _macd(fast=12, slow=26):
+    return (node_name("ema", fast), node_name("ema", slow)), np.subtract
+
+
+@node_kind("macd_signal")
+def _macd_signal(fast=12, slow=26, signal=9):
+    return (node_name("macd", fast, slow),), \
+        lambda line: indicators.ema(line, span=signal)
+
+
+@node_kind("macd_hist")
+def _macd_hist(fast=12, slow=26, signal=9):
+    return (node_name("macd", fast, slow), node_name("macd_signal", fast, slow, signal)), \
+        np.subtract
+
+
+@node_kind("ppo")
+def _ppo(fast=12, slow=26):
+    return (node_name("ema", fast), node_name("ema", slow)), \
+        lambda fast_ema, slow_ema: 100.0 * (fast_ema - slow_ema) / slow_ema
+
+
+@node_kind("bb_upper")
+def _bb_upper(window=20, k=2):
+    return (node_name("sma", window), node_name("std", window)), \
+        lambda middle, std: middle + k * std
+
+
+@node_kind("bb_lower")
+def _bb_lower(window=20, k=2):
+    return (node_name("sma", window), node_name("std", window)), \
+        lambda middle, std: middle - k * std
+
+
+@node_kind("tr")
+def _tr():
+    return ("high", "low", "close"), indicators.true_range
+
+
+@node_kind("atr")
+def _atr(period=14):
+    return ("tr",), lambda tr: indicators.wilder(tr, period, 0)
+
+
+@node_kind("ret_mean")
+def _ret_mean(window):
+    return ("returns",), lambda returns: indicators.sma(returns, window)
+
+
+@node_kind("ret_std")
+def _ret_std(window):
+    return ("returns",), lambda returns: indicators.rolling_std(returns, window, ddof=1)
+
+
+@node_kind("volatility")
+def _volatility(window=20):
+    """Annualized rolling volatility of simple returns"""
+    return (node_name("ret_std", window),), lambda std: std * np.sqrt(TRADING_DAYS)
+
+
+@node_kind("sharpe")
+def _sharpe(window=63):
+    """Annualized rolling Sharpe ratio (no risk-free rate)"""
+    def sharpe(mean, std):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return mean / std * np.sqrt(TRADING_DAYS)
+    return (node_name("ret_mean", window), node_name("ret_std", window)), sharpe
+
+
+# ---------------------------------------------------------------------------
+# Evaluation
+# ---------------------------------------------------------------------------
+
+def _inputs(name: str) -> Tuple[Tuple[str, ...], Optional[Callable]]:
+    kind, params = parse_node(name)
+    if kind in SOURCES:
+        return (), None
+    try:
+        return NODE_KINDS[kind](*params)
+    except TypeError:
+        raise ValueError(f"Bad indicator parameters: {name}") from None
+
+
+def plan(names: Iterable[str]) -> List[str]:
+    """
+    Evaluation order for a batch of requests
+
+    Returns:
+        Every node the requests depend on (sources included), once each,
+        inputs before the nodes that use them
+    """
+    order: List[str] = []
+    done = set()
+    for root in names:
+        stack = [(canonical(root), False)]
+        while stack:
+            name, expanded = stack.pop()
+            if name in done:
+                continue
+            if expanded:
+                done.add(name)
+                order.append(name)
+                continue
+            stack.append((name, True))
+            stack.extend((dep, False) for dep in reversed(_inputs(name)[0])
+                         if dep not in done)
+    return order
+
+
+class IndicatorGraph:
+    """
+    Indicator values over one OHLCV series, computed on demand
+
+    Every node is evaluated at most once; results are read-only arrays
+    aligned with the input bars.
+    """
+
+    def __init__(self, columns: Mapping[str, np.ndarray]):
+        """
+        Args:
+            columns: OHLCV arrays by name (case-insensitive: Close or close);
+                only the columns the requested indicators need are required
+        """
+        self.values: Dict[str, np.ndarray] = {}
+        for name, values in columns.items():
+            if name.lower() in SOURCES:
+                array = np.array(values, dtype=np.float64)
+                array.flags.writeable = False
+                self.values[name.lower()] = array
+        if "close" not in self.values:
+            raise ValueError("OHLCV input needs a close column")
+        self.evaluations = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.values["close"])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(v.nbytes for v in self.values.values())
+
+    def compute(self, names: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        Evaluate a batch of indicators
+
+        Args:
+            names: Node names (e.g. ["rsi:14", "macd:12,26", "sma:50"])
+
+        Returns:
+            Requested name -> array
+
+        Raises:
+            ValueError: Unknown indicator or missing source column
+        """
+        names = list(names)
+        with self._lock:
+            for node in plan(names):
+                if node in self.values:
+                    continue
+                inputs, fn = _inputs(node)
+                if fn is None:
+                    raise ValueError(f"OHLCV input has no {node} column")
+                value = np.asarray(fn(*(self.values[i] for i in inputs)), dtype=np.float64)
+                value.flags.writeable = False
+                self.values[node] = value
+                self.evaluations += 1
+        return {name: self.values[canonical(name)] for name in names}
+
+    def get(self, name: str) -> np.ndarray:
+        """Single indicator (see compute)"""
+        return self.compute([name])[name]
+
+    def latest(self, fields: Mapping[str, str]) -> Dict[str, Optional[float]]:
+        """
+        Last value of each indicator
+
+        Args:
+            fields: Output field -> node name (e.g. TECHNICALS)
+
+        Returns:
+            Field -> float (None where there is not enough history)
+        """
+        arrays = self.compute(fields.values())
+        values = {field: arrays[name][-1] for field, name in fields.items()}
+        return {field: None if np.isnan(v) else float(v) for field, v in values.items()}
+
+
+class IndicatorCache:
+    """
+    One IndicatorGraph per (ticker, bar range), bounded by bytes
+
+    The bar range is the bar count, first/last timestamp and last close,
+    so a refreshed or extended series gets a new graph.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.graphs = ByteLRUCache(max_bytes, sizeof=lambda graph: graph.nbytes)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def bar_range(columns, index=None) -> tuple:
+        """Key of a series: (bars, first ts, last ts, last close)"""
+        index = getattr(columns, "index", None) if index is None else index
+        close = columns["Close"] if "Close" in columns else columns["close"]
+        if index is None or len(index) == 0:
+            return (len(close), None, None, float(close[-1]) if len(close) else None)
+        index = np.asarray(index)
+        return (len(close), index[0].item(), index[-1].item(), float(close[-1]))
+
+    def _entry(self, ticker: str, columns, index) -> Tuple[tuple, IndicatorGraph]:
+        key = (ticker.upper(),) + self.bar_range(columns, index)
+        graph = self.graphs.get(key)
+        if graph is None:
+            self.misses += 1
+            graph = IndicatorGraph(columns)
+        else:
+            self.hits += 1
+        return key, graph
+
+    def compute(self, ticker: str, columns: Mapping[str, np.ndarray],
+                names: Iterable[str], index=None) -> Dict[str, np.ndarray]:
+        """
+        Batched indicator arrays for a ticker's series (memoized)
+
+        Args:
+            ticker: Ticker symbol
+            columns: OHLCV arrays (an OHLCVColumns or a column dict)
+            names: Node names
+            index: Bar timestamps (default: columns.index if present)
+        """
+        key, graph = self._entry(ticker, columns, index)
+        values = graph.compute(names)
+        # (Re)insert so the budget tracks the graph's grown size
+        self.graphs.put(key, graph)
+        return values
+
+    def latest(self, ticker: str, columns: Mapping[str, np.ndarray],
+               fields: Mapping[str, str] = None, index=None) -> Dict[str, Optional[float]]:
+        """Last value per field (default: TECHNICALS) for a ticker's series"""
+        key, graph = self._entry(ticker, columns, index)
+        values = graph.latest(TECHNICALS if fields is None else fields)
+        self.graphs.put(key, graph)
+        return values
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, **self.graphs.stats()}
+
+
+# Singleton instance
+_cache = None
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """Get or create singleton indicator cache"""
+    global _cache
+    if _cache is None:
+        _cache = IndicatorCache()
+    return _cache
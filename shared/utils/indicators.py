@@ -0,0 +1,397 @@
+"""
+Technical Indicators for Titan Platform
+One implementation of each indicator in two forms:
+
+- Batch functions over NumPy arrays (sma, ema, rsi, macd, bollinger, atr)
+  for backtests and agent tools
+- Streaming objects (SMA, EMA, RSI, MACD, Bollinger, ATR) that update in
+  O(1) per new bar for live data
+
+Both forms use the same definitions and recurrences, so a streaming
+indicator fed bar by bar reproduces the batch array (to rounding).
+Conventions: EMAs are seeded with the first value (pandas
+``ewm(adjust=False)``); RSI and ATR use Wilder smoothing seeded with a
+simple average; Bollinger bands use the population standard deviation.
+Values are NaN until an indicator has enough bars.
+"""
+import math
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+NAN = float("nan")
+
+
+def _com(span: float = None, alpha: float = None) -> float:
+    """Center of mass for a span or smoothing factor (pandas' convention)"""
+    if (span is None) == (alpha is None):
+        raise ValueError("Pass exactly one of span or alpha")
+    if span is not None:
+        if span < 1:
+            raise ValueError("span must be >= 1")
+        return (span - 1) / 2.0
+    if not 0 < alpha <= 1:
+        raise ValueError("alpha must be in (0, 1]")
+    return 1.0 / alpha - 1.0
+
+
+def _ewm(values: np.ndarray, com: float) -> np.ndarray:
+    """Exponential smoothing seeded with the first non-NaN value"""
+    return pd.Series(values, dtype=np.float64).ewm(
+        com=com, adjust=False, ignore_na=True).mean().to_numpy()
+
+
+def wilder(values: np.ndarray, period: int, first: int = 0) -> np.ndarray:
+    """
+    Wilder smoothing: simple mean of values[first:first + period] at
+    index first + period - 1, then avg += (x - avg) / period
+    """
+    out = np.full(len(values), np.nan)
+    seed_at = first + period - 1
+    if len(values) <= seed_at:
+        return out
+    tail = values[seed_at:].copy()
+    tail[0] = math.fsum(values[first:seed_at + 1]) / period
+    out[seed_at:] = _ewm(tail, period - 1.0)
+    return out
+
+
+def rsi_from_averages(gain: np.ndarray, loss: np.ndarray) -> np.ndarray:
+    """RSI from average gains and losses"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+    # No losses: 100; no movement at all: neutral 50
+    return np.where((loss == 0) & (gain == 0), 50.0, rsi)
+
+
+# ---------------------------------------------------------------------------
+# Batch versions
+# ---------------------------------------------------------------------------
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average, NaN until the window fills"""
+    return pd.Series(values, dtype=np.float64).rolling(window=window).mean().to_numpy()
+
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 0) -> np.ndarray:
+    """Trailing standard deviation, NaN until the window fills"""
+    return pd.Series(values, dtype=np.float64).rolling(window=window).std(ddof=ddof).to_numpy()
+
+
+def ema(values: np.ndarray, span: float = None, alpha: float = None) -> np.ndarray:
+    """Exponential moving average (span or alpha), seeded with the first value"""
+    return _ewm(np.asarray(values, dtype=np.float64), _com(span, alpha))
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Wilder RSI
+
+    Returns:
+        RSI per bar; NaN for the first ``period`` bars
+    """
+    close = np.asarray(close, dtype=np.float64)
+    delta = np.diff(close, prepend=np.nan)
+    gain = wilder(np.where(delta > 0, delta, 0.0), period, 1)
+    loss = wilder(np.where(delta < 0, -delta, 0.0), period, 1)
+    return rsi_from_averages(gain, loss)
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26,
+         signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD line, signal line and histogram
+
+    Returns:
+        (macd, signal, histogram) arrays
+    """
+    close = np.asarray(close, dtype=np.float64)
+    line = ema(close, span=fast) - ema(close, span=slow)
+    signal_line = ema(line, span=signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(close: np.ndarray, window: int = 20,
+              k: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger bands (population standard deviation)
+
+    Returns:
+        (middle, upper, lower) arrays
+    """
+    series = pd.Series(close, dtype=np.float64).rolling(window=window)
+    middle = series.mean().to_numpy()
+    width = k * series.std(ddof=0).to_numpy()
+    return middle, middle + width, middle - width
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range; the first bar is high - low"""
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    prev = np.concatenate(([np.nan], np.asarray(close, dtype=np.float64)[:-1]))
+    ranges = np.stack([high - low, np.abs(high - prev), np.abs(low - prev)])
+    return np.nanmax(ranges, axis=0)
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+        period: int = 14) -> np.ndarray:
+    """Wilder average true range; NaN for the first period - 1 bars"""
+    return wilder(true_range(high, low, close), period, 0)
+
+
+def technicals(high: np.ndarray, low: np.ndarray,
+               close: np.ndarray) -> Dict[str, Optional[float]]:
+    """
+    Latest value of the standard indicator set (see IndicatorSet)
+
+    Returns:
+        dict of floats (None where there is not enough history)
+    """
+    line, signal_line, histogram = macd(close)
+    middle, upper, lower = bollinger(close)
+    values = {
+        "rsi": rsi(close)[-1],
+        "macd": line[-1], "macd_signal": signal_line[-1], "macd_histogram": histogram[-1],
+        "bollinger_middle": middle[-1], "bollinger_upper": upper[-1],
+        "bollinger_lower": lower[-1],
+        "atr": atr(high, low, close)[-1],
+        "sma_50": sma(close, 50)[-1], "sma_200": sma(close, 200)[-1],
+    }
+    return {name: None if np.isnan(v) else float(v) for name, v in values.items()}
+
+
+# ---------------------------------------------------------------------------
+# Streaming versions
+# ---------------------------------------------------------------------------
+
+class SMA:
+    """Simple moving average over a ring buffer with a running sum"""
+    __slots__ = ("window", "value", "_buffer", "_index", "_count", "_sum")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.value = NAN
+        self._buffer = [0.0] * window
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, x: float) -> float:
+        self._sum += x - self._buffer[self._index]
+        self._buffer[self._index] = x
+        self._index += 1
+        if self._index == self.window:
+            self._index = 0
+            # Re-sum once per window so rounding error cannot accumulate
+            self._sum = math.fsum(self._buffer)
+        if self._count < self.window:
+            self._count += 1
+        if self._count == self.window:
+            self.value = self._sum / self.window
+        return self.value
+
+
+class RollingStats:
+    """Windowed mean and variance (sliding Welford updates)"""
+    __slots__ = ("window", "mean", "_m2", "_buffer", "_index", "_count")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._buffer = [0.0] * window
+        self._index = 0
+        self._count = 0
+
+    def update(self, x: float):
+        if self._count < self.window:
+            self._count += 1
+            delta = x - self.mean
+            self.mean += delta / self._count
+            self._m2 += delta * (x - self.mean)
+        else:
+            old = self._buffer[self._index]
+            old_mean = self.mean
+            self.mean += (x - old) / self.window
+            self._m2 += (x - old) * (x - self.mean + old - old_mean)
+        self._buffer[self._index] = x
+        self._index += 1
+        if self._index == self.window:
+            self._index = 0
+            # Two-pass resync once per window (amortized O(1))
+            self.mean = math.fsum(self._buffer) / self.window
+            self._m2 = math.fsum((v - self.mean) ** 2 for v in self._buffer)
+
+    @property
+    def ready(self) -> bool:
+        return self._count == self.window
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the window (NaN until full)"""
+        return max(self._m2, 0.0) / self.window if self.ready else NAN
+
+
+class EMA:
+    """Exponential moving average (span or alpha), seeded with the first value"""
+    __slots__ = ("value", "_old", "_new")
+
+    def __init__(self, span: float = None, alpha: float = None, com: float = None):
+        com = _com(span, alpha) if com is None else com
+        self._new = 1.0 / (1.0 + com)
+        self._old = 1.0 - self._new
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        if x != x:
+            return self.value
+        if self.value != self.value:
+            self.value = x
+        elif self.value != x:
+            self.value = (self._old * self.value + self._new * x) / (self._old + self._new)
+        return self.value
+
+
+class _Wilder:
+    """Wilder smoothing: simple average of the first period values, then EMA"""
+    __slots__ = ("period", "_seed", "_count", "_ema")
+
+    def __init__(self, period: int):
+        self.period = period
+        self._seed = []
+        self._count = 0
+        self._ema = EMA(com=period - 1.0)
+
+    def update(self, x: float) -> float:
+        if self._count < self.period:
+            self._count += 1
+            self._seed.append(x)
+            if self._count < self.period:
+                return NAN
+            x = math.fsum(self._seed) / self.period
+            self._seed = None
+        return self._ema.update(x)
+
+
+class RSI:
+    """Wilder RSI"""
+    __slots__ = ("value", "_prev", "_gain", "_loss")
+
+    def __init__(self, period: int = 14):
+        self.value = NAN
+        self._prev = NAN
+        self._gain = _Wilder(period)
+        self._loss = _Wilder(period)
+
+    def update(self, close: float) -> float:
+        prev, self._prev = self._prev, close
+        if prev != prev:
+            return self.value
+        delta = close - prev
+        gain = self._gain.update(delta if delta > 0 else 0.0)
+        loss = self._loss.update(-delta if delta < 0 else 0.0)
+        if gain == gain:
+            if loss == 0:
+                self.value = 50.0 if gain == 0 else 100.0
+            else:
+                self.value = 100.0 - 100.0 / (1.0 + gain / loss)
+        return self.value
+
+
+class MACD:
+    """MACD line, signal line and histogram"""
+    __slots__ = ("macd", "signal", "histogram", "_fast", "_slow", "_signal")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast = EMA(span=fast)
+        self._slow = EMA(span=slow)
+        self._signal = EMA(span=signal)
+        self.macd = self.signal = self.histogram = NAN
+
+    def update(self, close: float) -> float:
+        self.macd = self._fast.update(close) - self._slow.update(close)
+        self.signal = self._signal.update(self.macd)
+        self.histogram = self.macd - self.signal
+        return self.macd
+
+
+class Bollinger:
+    """Bollinger bands over a sliding Welford window"""
+    __slots__ = ("k", "middle", "upper", "lower", "_stats")
+
+    def __init__(self, window: int = 20, k: float = 2.0):
+        self.k = k
+        self._stats = RollingStats(window)
+        self.middle = self.upper = self.lower = NAN
+
+    def update(self, close: float) -> float:
+        self._stats.update(close)
+        if self._stats.ready:
+            width = self.k * math.sqrt(self._stats.variance)
+            self.middle = self._stats.mean
+            self.upper = self.middle + width
+            self.lower = self.middle - width
+        return self.middle
+
+
+class ATR:
+    """Wilder average true range"""
+    __slots__ = ("value", "_prev", "_smooth")
+
+    def __init__(self, period: int = 14):
+        self.value = NAN
+        self._prev = NAN
+        self._smooth = _Wilder(period)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        prev, self._prev = self._prev, close
+        tr = high - low
+        if prev == prev:
+            tr = max(tr, abs(high - prev), abs(low - prev))
+        self.value = self._smooth.update(tr)
+        return self.value
+
+
+class IndicatorSet:
+    """
+    The standard indicator set for one ticker, updated bar by bar
+    (same fields as technicals())
+    """
+    __slots__ = ("bars", "close", "_rsi", "_macd", "_bollinger", "_atr",
+                 "_sma_50", "_sma_200")
+
+    def __init__(self):
+        self.bars = 0
+        self.close = NAN
+        self._rsi = RSI(14)
+        self._macd = MACD(12, 26, 9)
+        self._bollinger = Bollinger(20, 2.0)
+        self._atr = ATR(14)
+        self._sma_50 = SMA(50)
+        self._sma_200 = SMA(200)
+
+    def update(self, high: float, low: float, close: float) -> "IndicatorSet":
+        self.bars += 1
+        self.close = close
+        self._rsi.update(close)
+        self._macd.update(close)
+        self._bollinger.update(close)
+        self._atr.update(high, low, close)
+        self._sma_50.update(close)
+        self._sma_200.update(close)
+        return self
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """Current values (None where there is not enough history)"""
+        values = {
+            "rsi": self._rsi.value,
+            "macd": self._macd.macd, "macd_signal": self._macd.signal,
+            "macd_histogram": self._macd.histogram,
+            "bollinger_middle": self._bollinger.middle,
+            "bollinger_upper": self._bollinger.upper,
+            "bollinger_lower": self._bollinger.lower,
+            "atr": self._atr.value,
+            "sma_50": self._sma_50.value, "sma_200": self._sma_200.value,
+        }
+        return {name: None if v != v else v for name, v in values.items()}
@@ -0,0 +1,83 @@
+"""
+============================================================================
+TITAN PLATFORM - ASYNC CONNECTOR TEST
+============================================================================
+Verifies AsyncMarketDataConnector:
+- Concurrent identical requests are coalesced into one fetch
+- Requests against the source respect the concurrency limit
+
+Run with: python -m pytest tests/test_async_connector.py
+============================================================================
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from services.ingestion_engine.connectors import (
+    AsyncMarketDataConnector, MarketDataConnector
+)
+
+
+class SlowSource:
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def history(self, ticker, period):
+        with self._lock:
+            self.calls.append((ticker, period))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.latency)
+        with self._lock:
+            self.active -= 1
+        index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=5)
+        return pd.DataFrame({
+            "Open": 1.0, "High": 1.0, "Low": 1.0,
+            "Close": np.arange(5, dtype=float) + 100, "Volume": 10,
+        }, index=index)
+
+    def download(self, tickers, period):
+        return {}
+
+
+def test_single_flight_coalesces_identical_requests(tmp_path):
+    source = SlowSource()
+    connector = AsyncMarketDataConnector(
+        MarketDataConnector(cache_dir=str(tmp_path), source=source))
+
+    async def scenario():
+        return await asyncio.gather(
+            *(connector.get_ohlcv("AAPL", "1d") for _ in range(10)),
+            connector.get_realtime_price("AAPL"))
+
+    results = asyncio.run(scenario())
+
+    assert source.calls == [("AAPL", "1d")]
+    assert results[-1] == 104.0
+    assert connector.stats()["coalesced"] == 10
+
+
+def test_concurrency_limit(tmp_path):
+    source = SlowSource(latency=0.02)
+    connector = AsyncMarketDataConnector(
+        MarketDataConnector(cache_dir=str(tmp_path), source=source),
+        max_concurrency=2)
+
+    tickers = [f"T{i}" for i in range(8)]
+    results = asyncio.run(connector.get_multiple_tickers(tickers, "1mo"))
+
+    assert set(results) == set(tickers)
+    assert source.max_active <= 2
@@ -0,0 +1,95 @@
+"""
+============================================================================
+TITAN PLATFORM - BOOTSTRAP CONFIDENCE INTERVAL TEST
+============================================================================
+Verifies the vectorized bootstrap behind PerformanceMetrics intervals:
+- A single whole-series block reproduces the point estimates
+- Chunking bounds memory without changing the resamples
+- Intervals bracket the estimates; win rate resamples trades
+- 10k resamples of a 5-year curve run in about a second or less
+- run_backtest reports intervals on request
+
+Run with: python -m pytest tests/test_bootstrap_metrics.py
+============================================================================
+"""
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from services.backtest_engine.bootstrap import bootstrap_samples, confidence_intervals
+from services.backtest_engine.metrics import PerformanceMetrics
+from services.backtest_engine.simulator import BacktestEngine
+
+RETURNS = np.random.default_rng(1).normal(0.0006, 0.012, 1260)
+
+
+def test_whole_series_block_is_point_estimate():
+    values = 1000 * np.concatenate(([1.0], np.cumprod(1 + RETURNS)))
+    samples = bootstrap_samples(RETURNS, n_resamples=5, block_size=len(RETURNS))
+    assert samples["total_return"] == pytest.approx(
+        PerformanceMetrics.calculate_total_return(values))
+    assert samples["sharpe_ratio"] == pytest.approx(
+        PerformanceMetrics.calculate_sharpe_ratio(RETURNS), abs=0.005)
+    assert samples["max_drawdown"] == pytest.approx(
+        PerformanceMetrics.calculate_max_drawdown(values), abs=0.005)
+    assert "win_rate" not in samples
+
+
+def test_chunking_and_seed():
+    wins = np.arange(40) % 3 == 0
+    whole = bootstrap_samples(RETURNS, wins, 2000, seed=4)
+    chunked = bootstrap_samples(RETURNS, wins, 2000, seed=4, max_chunk_bytes=100_000)
+    for name in whole:
+        np.testing.assert_array_equal(whole[name], chunked[name])
+    other = bootstrap_samples(RETURNS, wins, 2000, seed=5)
+    assert not np.array_equal(whole["sharpe_ratio"], other["sharpe_ratio"])
+    with pytest.raises(ValueError):
+        bootstrap_samples(RETURNS[:1])
+
+
+def test_intervals():
+    wins = np.arange(40) % 4 == 0
+    ci = confidence_intervals(RETURNS, wins, 4000, confidence=0.9)
+    assert ci["confidence"] == 0.9 and ci["block_size"] == 11
+    for name in ("total_return", "sharpe_ratio", "max_drawdown", "win_rate"):
+        assert ci[name]["lower"] < ci[name]["median"] < ci[name]["upper"]
+    assert ci["win_rate"]["lower"] < 25.0 < ci["win_rate"]["upper"]
+    assert ci["max_drawdown"]["upper"] <= 0
+    narrow = confidence_intervals(RETURNS, wins, 4000, confidence=0.5)
+    assert narrow["sharpe_ratio"]["upper"] - narrow["sharpe_ratio"]["lower"] < \
+        ci["sharpe_ratio"]["upper"] - ci["sharpe_ratio"]["lower"]
+    assert confidence_intervals(RETURNS, np.ones(5, bool), 500)["win_rate"]["lower"] == 100.0
+
+
+def test_ten_thousand_resamples_fast():
+    confidence_intervals(RETURNS, n_resamples=500)
+    start = time.perf_counter()
+    ci = confidence_intervals(RETURNS, np.ones(60, bool), n_resamples=10_000)
+    elapsed = time.perf_counter() - start
+    assert ci["resamples"] == 10_000
+    # ~0.4s here; generous bound for slow CI machines
+    assert elapsed < 2.0
+
+
+def test_backtest_report(synthetic_loader):
+    loader = synthetic_loader(["AAA"], "2014-01-01", "2020-01-01", seed=2)
+    engine = BacktestEngine(data_loader=loader)
+    plain = engine.run_backtest("AAA", "rsi_strategy", "2015-01-01", "2020-01-01")
+    assert "confidence_intervals" not in plain["metrics"]
+
+    report = engine.run_backtest("AAA", "rsi_strategy", "2015-01-01", "2020-01-01",
+                                 confidence_resamples=2000)
+    metrics = report["metrics"]
+    intervals = metrics["confidence_intervals"]
+    assert intervals["resamples"] == 2000
+    assert {k: v for k, v in metrics.items() if k != "confidence_intervals"} == \
+        plain["metrics"]
+    for name in ("total_return", "sharpe_ratio", "max_drawdown", "win_rate"):
+        assert intervals[name]["lower"] <= metrics[name] <= intervals[name]["upper"]
+    assert PerformanceMetrics.calculate_confidence_intervals([100.0, 101.0], []) == {}
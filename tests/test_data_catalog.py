@@ -0,0 +1,138 @@
+"""
+============================================================================
+TITAN PLATFORM - HISTORICAL DATA CATALOG TEST
+============================================================================
+Verifies the SQLite catalog kept by DataLoader:
+- Every store write/append updates coverage, row count and checksum
+- Appends only rehash the partitions they touched
+- get_data backfills a missing head instead of returning a truncated slice
+- A failed backfill is retried instead of being recorded as covered
+- Tickers cached before the catalog existed are registered on first use
+
+Run with: python -m pytest tests/test_data_catalog.py
+============================================================================
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+
+import pandas as pd
+
+from services.backtest_engine.catalog import DataCatalog
+from services.backtest_engine.columnar_store import SCHEMA_VERSION
+from services.backtest_engine.data_loader import DataLoader
+from tests.test_columnar_store import make_ohlcv
+
+
+def test_catalog_tracks_store_writes(tmp_path):
+    loader = DataLoader(cache_dir=str(tmp_path), max_cache_age_hours=None)
+    loader.store.write("AAPL", make_ohlcv(periods=30))
+    entry = loader.catalog.get("aapl")
+    assert entry["rows"] == 30
+    assert entry["first_date"] == "2020-12-21"
+    assert entry["schema_version"] == SCHEMA_VERSION
+
+    loader.store.append("AAPL", make_ohlcv("2021-02-01", periods=5))
+    updated = loader.catalog.get("AAPL")
+    assert updated["rows"] == 35
+    assert updated["checksum"] != entry["checksum"]
+    assert loader.catalog.covers("AAPL", "2020-12-21", updated["last_date"])
+    assert not loader.catalog.covers("AAPL", "2020-01-01")
+
+    loader.store.delete("AAPL")
+    assert loader.catalog.get("AAPL") is None
+
+
+def test_append_rehashes_touched_partitions(tmp_path, monkeypatch):
+    loader = DataLoader(cache_dir=str(tmp_path), max_cache_age_hours=None)
+    store = loader.store
+    store.write("AAPL", make_ohlcv("2017-01-02", periods=1000))
+    assert len(store.read_meta("AAPL")["partitions"]) == 4
+
+    hashed = []
+    partition_info = store._partition_info
+    monkeypatch.setattr(store, "_partition_info", lambda ticker, year: (
+        hashed.append(year), partition_info(ticker, year))[1])
+    store.append("AAPL", make_ohlcv("2021-02-01", periods=5))
+    assert hashed == [2021]
+    store.touch("AAPL")
+    assert hashed == [2021]
+
+    # Same checksum as hashing every partition from scratch
+    incremental = store.read_meta("AAPL")
+    os.remove(os.path.join(str(tmp_path), "columnar", "AAPL", "_meta.json"))
+    rebuilt = store.read_meta("AAPL")
+    assert rebuilt["checksum"] == incremental["checksum"]
+    assert rebuilt["rows"] == incremental["rows"] == 1005
+    assert len(hashed) == 6
+
+
+def test_get_data_backfills_missing_head(tmp_path, monkeypatch):
+    loader = DataLoader(cache_dir=str(tmp_path), max_cache_age_hours=None)
+    full = make_ohlcv("2020-06-01", periods=200)
+    loader.store.write("AAPL", full.loc["2020-10-01":])
+    calls = []
+
+    def fake_download(ticker, start=None, end=None, progress=False):
+        calls.append((start, end))
+        # yfinance treats end as exclusive
+        return full.loc[start:end].iloc[:-1]
+
+    monkeypatch.setattr(
+        "services.ingestion_engine.connectors.yfinance_connector.yf.download", fake_download)
+
+    data = loader.get_data("AAPL", "2020-06-01", "2020-12-31")
+    assert data.index[0] == pd.Timestamp("2020-06-01")
+    assert calls == [("2020-06-01", "2020-10-02")]
+
+    # Nothing older exists: the earlier request is remembered
+    loader.get_data("AAPL", "2019-01-01")
+    loader.get_data("AAPL", "2019-06-01")
+    assert calls[1:] == [("2019-01-01", "2020-06-02")]
+
+
+def test_failed_backfill_is_retried(tmp_path, monkeypatch):
+    loader = DataLoader(cache_dir=str(tmp_path), max_cache_age_hours=None)
+    full = make_ohlcv("2020-06-01", periods=200)
+    loader.store.write("AAPL", full.loc["2020-10-01":])
+    responses = [pd.DataFrame()]
+
+    def fake_download(ticker, start=None, end=None, progress=False):
+        # First call: yfinance's empty frame on a network error
+        if responses:
+            return responses.pop()
+        return full.loc[start:end].iloc[:-1]
+
+    monkeypatch.setattr(
+        "services.ingestion_engine.connectors.yfinance_connector.yf.download", fake_download)
+
+    loader.get_data("AAPL", "2020-06-01")
+    assert not loader.catalog.covers("AAPL", "2020-06-01")
+    data = loader.get_data("AAPL", "2020-06-01")
+    assert data.index[0] == pd.Timestamp("2020-06-01")
+    assert loader.catalog.covers("AAPL", "2020-06-01")
+
+
+def test_legacy_store_registered_on_first_use(tmp_path):
+    loader = DataLoader(cache_dir=str(tmp_path), max_cache_age_hours=None)
+    loader.store.write("MSFT", make_ohlcv())
+    meta_path = os.path.join(str(tmp_path), "columnar", "MSFT", "_meta.json")
+    with open(meta_path) as f:
+        meta = json.load(f)
+    for key in ("schema_version", "checksum"):
+        meta.pop(key)
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+    loader.catalog.close()
+    os.remove(loader.catalog.path)
+
+    fresh = DataLoader(cache_dir=str(tmp_path), max_cache_age_hours=None)
+    assert fresh.catalog.get("MSFT") is None
+    entry = fresh.coverage("MSFT")
+    assert entry["rows"] == 30 and entry["checksum"]
+    assert entry["last_refresh"] == meta["last_refresh"]
+    assert DataCatalog(fresh.catalog.path).tickers() == ["MSFT"]
@@ -0,0 +1,99 @@
+"""
+============================================================================
+TITAN PLATFORM - INDICATOR GRAPH TEST
+============================================================================
+Verifies the indicator dependency graph:
+- Shared intermediates are planned and evaluated once
+- Only requested nodes (and their inputs) are evaluated
+- Results match the standalone indicator kernels
+- IndicatorCache memoizes per (ticker, bar range)
+
+Run with: python -m pytest tests/test_indicator_graph.py
+============================================================================
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from shared.utils import indicators
+from shared.utils.indicator_graph import (
+    TECHNICALS, IndicatorCache, IndicatorGraph, canonical, plan)
+from services.ingestion_engine.connectors.ohlcv_columns import OHLCVColumns
+from services.ingestion_engine.mock_market_service import SyntheticMarketGenerator
+
+
+@pytest.fixture(scope="module")
+def columns():
+    frame = SyntheticMarketGenerator(seed=9).generate(
+        ["AAA"], start="2016-01-01", end="2020-01-01")["AAA"]
+    return OHLCVColumns.from_frame(frame)
+
+
+def test_plan_shares_intermediates():
+    order = plan(["macd:12,26", "ppo:12,26", "sma:20", "bb_upper:20,2",
+                  "volatility:20", "sharpe:20"])
+    assert len(order) == len(set(order))
+    for shared in ("ema:12", "ema:26", "sma:20", "returns", "ret_std:20"):
+        assert order.count(shared) == 1
+    assert order.index("ema:12") < order.index("macd:12,26")
+    assert order.index("diff") < order.index("returns") < order.index("ret_std:20")
+    assert canonical("EMA:12.0") == "ema:12"
+    with pytest.raises(ValueError):
+        plan(["stochastic:14"])
+    with pytest.raises(ValueError):
+        plan(["ema:12,26,9"])
+
+
+def test_lazy_and_memoized(columns):
+    graph = IndicatorGraph(columns)
+    graph.compute(["macd:12,26"])
+    assert graph.evaluations == 3
+    assert "rsi:14" not in graph.values and "sma:20" not in graph.values
+    # PPO only adds itself: both EMAs are reused
+    graph.compute(["ppo:12,26", "macd:12,26"])
+    assert graph.evaluations == 4
+    graph.compute(["bb_upper:20,2", "bb_lower:20,2", "sma:20"])
+    assert graph.evaluations == 4 + 4
+    with pytest.raises(ValueError):
+        graph.get("sma:20")[0] = 1.0
+
+
+def test_matches_kernels(columns):
+    high, low, close = columns["High"], columns["Low"], columns["Close"]
+    graph = IndicatorGraph(columns)
+    assert graph.latest(TECHNICALS) == indicators.technicals(high, low, close)
+
+    values = graph.compute(["rsi:14", "atr:14", "ppo:12,26", "volatility:20", "sharpe:20"])
+    np.testing.assert_array_equal(values["rsi:14"], indicators.rsi(close))
+    np.testing.assert_array_equal(values["atr:14"], indicators.atr(high, low, close))
+    fast, slow = indicators.ema(close, span=12), indicators.ema(close, span=26)
+    np.testing.assert_allclose(values["ppo:12,26"], 100 * (fast - slow) / slow)
+    returns = close[1:] / close[:-1] - 1
+    assert values["volatility:20"][-1] == pytest.approx(
+        returns[-20:].std(ddof=1) * np.sqrt(252))
+    assert values["sharpe:20"][-1] == pytest.approx(
+        returns[-20:].mean() / returns[-20:].std(ddof=1) * np.sqrt(252))
+
+    with pytest.raises(ValueError):
+        IndicatorGraph({"Close": close}).get("atr:14")
+
+
+def test_cache_per_bar_range(columns):
+    cache = IndicatorCache()
+    first = cache.latest("aaa", columns)
+    assert cache.latest("AAA", columns) == first
+    assert cache.hits == 1 and cache.misses == 1
+    evaluated = cache.graphs.peek(cache.graphs.keys()[0]).evaluations
+
+    # Another range of the same ticker is a separate graph
+    shorter = OHLCVColumns(columns.index[:-5], {k: v[:-5] for k, v in columns.items()})
+    assert cache.latest("AAA", shorter) != first
+    assert cache.misses == 2 and len(cache.graphs) == 2
+    # The first graph did no further work and its grown size is accounted
+    assert cache.graphs.peek(cache.graphs.keys()[0]).evaluations == evaluated
+    assert cache.stats()["bytes"] > 2 * 10 * columns["Close"].nbytes
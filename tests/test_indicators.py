@@ -0,0 +1,144 @@
+"""
+============================================================================
+TITAN PLATFORM - TECHNICAL INDICATORS TEST
+============================================================================
+Verifies the shared indicator kernels:
+- Streaming indicators reproduce the batch arrays bar by bar
+- Known values (Wilder RSI, flat/monotonic series, true range)
+- Sliding-window state stays accurate over long streams
+- Live indicators from the streaming pipeline and calculate_technicals
+
+Run with: python -m pytest tests/test_indicators.py
+============================================================================
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shared.utils import indicators
+from services.ingestion_engine.streaming import StreamingPipeline
+from services.ingestion_engine.mock_market_service import SyntheticMarketGenerator
+
+
+@pytest.fixture(scope="module")
+def bars():
+    frame = SyntheticMarketGenerator(seed=5).generate(
+        ["AAA"], start="2015-01-01", end="2020-01-01")["AAA"]
+    return (frame["High"].to_numpy(), frame["Low"].to_numpy(),
+            frame["Close"].to_numpy())
+
+
+def stream(indicator, *columns, field="value"):
+    out = []
+    for values in zip(*columns):
+        indicator.update(*values)
+        out.append(getattr(indicator, field))
+    return np.array(out)
+
+
+def test_streaming_matches_batch(bars):
+    high, low, close = bars
+    close_tol = dict(rtol=1e-10, atol=1e-10, equal_nan=True)
+
+    np.testing.assert_allclose(stream(indicators.SMA(20), close),
+                               indicators.sma(close, 20), **close_tol)
+    np.testing.assert_allclose(stream(indicators.EMA(span=12), close),
+                               indicators.ema(close, span=12), **close_tol)
+    np.testing.assert_allclose(stream(indicators.RSI(14), close),
+                               indicators.rsi(close, 14), **close_tol)
+    np.testing.assert_allclose(stream(indicators.ATR(14), high, low, close),
+                               indicators.atr(high, low, close, 14), **close_tol)
+
+    for field, expected in zip(("macd", "signal", "histogram"), indicators.macd(close)):
+        np.testing.assert_allclose(stream(indicators.MACD(), close, field=field),
+                                   expected, **close_tol)
+    for field, expected in zip(("middle", "upper", "lower"), indicators.bollinger(close)):
+        np.testing.assert_allclose(stream(indicators.Bollinger(), close, field=field),
+                                   expected, **close_tol)
+
+    live = indicators.IndicatorSet()
+    for h, l, c in zip(high, low, close):
+        live.update(h, l, c)
+    assert live.snapshot() == pytest.approx(indicators.technicals(high, low, close),
+                                            rel=1e-10)
+
+
+def test_known_values():
+    # Wilder's worked example (New Concepts in Technical Trading Systems)
+    close = np.array([44.34, 44.09, 44.15, 43.61, 44.33, 44.83, 45.10, 45.42,
+                      45.84, 46.08, 45.89, 46.03, 45.61, 46.28, 46.28, 46.00,
+                      46.03, 46.41, 46.22, 45.64])
+    rsi = indicators.rsi(close, 14)
+    assert np.isnan(rsi[:14]).all()
+    assert rsi[14] == pytest.approx(70.46, abs=0.01)
+    assert rsi[19] == pytest.approx(57.92, abs=0.5)
+
+    assert (indicators.rsi(np.arange(1.0, 40.0))[14:] == 100.0).all()
+    assert (indicators.rsi(np.full(40, 5.0))[14:] == 50.0).all()
+    assert np.isnan(indicators.RSI(14).update(5.0))
+
+    tr = indicators.true_range(np.array([10.0, 12.0, 9.0]), np.array([8.0, 11.0, 8.5]),
+                               np.array([9.0, 11.5, 8.8]))
+    assert tr.tolist() == [2.0, 3.0, 3.0]
+    middle, upper, lower = indicators.bollinger(np.full(30, 7.0))
+    assert middle[-1] == upper[-1] == lower[-1] == 7.0
+
+
+def test_long_stream_stays_accurate():
+    rng = np.random.default_rng(1)
+    values = 1e6 + rng.normal(0, 1, 200_000).cumsum()
+    bands = indicators.Bollinger(50)
+    average = indicators.SMA(50)
+    for x in values.tolist():
+        bands.update(x)
+        average.update(x)
+    window = values[-50:]
+    assert bands.middle == pytest.approx(window.mean(), rel=1e-12)
+    assert (bands.upper - bands.middle) / 2 == pytest.approx(window.std(), rel=1e-8)
+    assert average.value == pytest.approx(window.mean(), rel=1e-12)
+
+
+def test_pipeline_live_indicators(tmp_path, bars):
+    high, low, close = bars
+    pipeline = StreamingPipeline(intervals=("1m",), persist_intervals=(),
+                                 root_dir=str(tmp_path))
+    # One tick per minute: each closed 1m bar is a single price
+    t0 = 1_700_000_040_000_000_000
+    ts = t0 + np.arange(len(close)) * 60_000_000_000
+    pipeline.bus.publish_batch(["AAA"] * len(close), close, ts=ts)
+    pipeline.pump(now_ns=int(ts[-1]) + 120_000_000_000)
+
+    live = pipeline.latest_indicators("AAA")
+    assert live["bars"] == len(close) and live["close"] == close[-1]
+    assert live["rsi"] == pytest.approx(indicators.rsi(close)[-1], rel=1e-10)
+    assert live["sma_200"] == pytest.approx(close[-200:].mean(), rel=1e-10)
+    assert pipeline.latest_indicators("AAA", "5m") is None
+    assert pipeline.latest_indicators("ZZZ") is None
+
+
+def test_calculate_technicals(tmp_path, monkeypatch):
+    import services.ingestion_engine.connectors as connectors
+    from services.ingestion_engine.mock_market_service import get_synthetic_connector
+    from agent_platform import tools
+
+    connector = get_synthetic_connector(cache_dir=str(tmp_path))
+    monkeypatch.setattr(connectors, "get_connector", lambda: connector)
+    result = tools.calculate_technicals("AAPL", "1y")
+    assert result["success"], result
+
+    frame = connector.cache.get("AAPL", "1y")
+    close = frame["Close"].to_numpy()
+    assert result["rsi"] == pytest.approx(indicators.rsi(close)[-1], abs=1e-4)
+    assert result["rsi"] != 50
+    assert result["ma_200"] == pytest.approx(close[-200:].mean(), abs=1e-4)
+    std = pd.Series(close[-20:]).std(ddof=0)
+    assert result["bollinger_upper"] - result["bollinger_lower"] == \
+        pytest.approx(4 * std, abs=1e-3)
+    assert result["atr"] > 0
+    assert result["macd_signal"] == ("bullish" if result["macd_histogram"] > 0 else "bearish")
@@ -0,0 +1,73 @@
+"""
+============================================================================
+TITAN PLATFORM - COLUMNAR OHLCV RESULT TEST
+============================================================================
+Verifies the columnar get_ohlcv layout:
+- Column arrays are read-only views of the cached frame (no copies)
+- Lazy row view matches DataFrame.to_dict('records')
+- Quant tools consume the column layout
+
+Run with: python -m pytest tests/test_ohlcv_columns.py
+============================================================================
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+
+import numpy as np
+import pytest
+
+import services.ingestion_engine.connectors as connectors
+from services.ingestion_engine.mock_market_service import get_synthetic_connector
+
+
+@pytest.fixture
+def connector(tmp_path):
+    return get_synthetic_connector(cache_dir=str(tmp_path))
+
+
+def test_columns_share_cached_frame(connector):
+    result = connector.get_ohlcv("AAPL", "5y", layout="columns")
+    frame = connector.cache.get("AAPL", "5y")
+    data = result["data"]
+
+    assert len(data) == len(frame)
+    assert np.shares_memory(data["Close"], frame["Close"].to_numpy())
+    with pytest.raises(ValueError):
+        data["Close"][0] = 0.0
+    assert data.index.dtype == np.dtype("datetime64[ns]")
+    assert result["current_price"] == data["Close"][-1]
+
+
+def test_lazy_rows_match_records(connector):
+    columns = connector.get_ohlcv("MSFT", "1y", layout="columns")["data"]
+    records = connector.get_ohlcv("MSFT", "1y")["data"]
+    expected = connector.cache.get("MSFT", "1y").to_dict("records")
+
+    assert records == expected
+    assert columns.rows[5] == expected[5]
+    assert columns.rows[-1] == expected[-1]
+    assert columns.rows[2:4] == expected[2:4]
+    assert columns.rows._rows is None
+    assert columns.rows.to_list() == expected
+
+
+def test_tools_consume_columns(connector, monkeypatch):
+    monkeypatch.setattr(connectors, "get_connector", lambda: connector)
+    from agent_platform import tools
+
+    market = tools.get_market_data("AAPL", "3mo")
+    assert market["success"]
+    json.dumps(market)
+    assert len(market["data"]["Date"]) == len(market["data"]["Close"])
+
+    for result in (tools.calculate_technicals("AAPL", "1y"),
+                   tools.analyze_price_action("AAPL"),
+                   tools.analyze_volume("AAPL"),
+                   tools.detect_chart_patterns("AAPL")):
+        assert result["success"], result
+        json.dumps(result)
@@ -0,0 +1,130 @@
+"""
+============================================================================
+TITAN PLATFORM - QUOTE SNAPSHOT TEST
+============================================================================
+Verifies QuoteSnapshotService:
+- Watched tickers are refreshed in one batched request per poll
+- Lookups are served from memory with staleness information
+- Unwatched tickers fall back to a single on-demand fetch, kept in a
+  bounded LRU outside the snapshot table
+- Concurrent first calls create one singleton service
+
+Run with: python -m pytest tests/test_quote_snapshot.py
+============================================================================
+"""
+import sys
+import os
+import threading
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from services.ingestion_engine.connectors import (
+    MarketDataConnector, QuoteSnapshotService
+)
+from services.ingestion_engine.connectors import quote_snapshot
+
+
+class CountingSource:
+    def __init__(self):
+        self.history_calls = []
+        self.download_calls = []
+
+    def _frame(self, ticker):
+        index = pd.bdate_range(end="2024-06-07", periods=5)
+        base = 100 + sum(map(ord, ticker)) % 50
+        return pd.DataFrame({
+            "Open": base, "High": base + 2, "Low": base - 2,
+            "Close": base + np.arange(5, dtype=float), "Volume": 1000,
+        }, index=index)
+
+    def history(self, ticker, period):
+        self.history_calls.append(ticker)
+        return self._frame(ticker)
+
+    def download(self, tickers, period):
+        self.download_calls.append(list(tickers))
+        return {t: self._frame(t) for t in tickers}
+
+
+def test_batched_poll_and_memory_lookups(tmp_path):
+    source = CountingSource()
+    connector = MarketDataConnector(cache_dir=str(tmp_path), source=source)
+    service = QuoteSnapshotService(connector, watchlist=["aapl", "MSFT", "NVDA"])
+
+    assert service.refresh() == 3
+    assert source.download_calls == [["AAPL", "MSFT", "NVDA"]]
+
+    for _ in range(100):
+        quote = service.get_quote("msft")
+    assert source.history_calls == []
+    assert quote["source"] == "snapshot"
+    assert quote["change"] == 1.0
+    assert quote["as_of"].startswith("2024-06-07")
+    assert quote["age_seconds"] >= 0
+
+
+def test_unwatched_and_stale_fallback(tmp_path):
+    source = CountingSource()
+    connector = MarketDataConnector(cache_dir=str(tmp_path), source=source)
+    service = QuoteSnapshotService(connector, watchlist=["AAPL"], max_staleness=60)
+    connector.attach_quotes(service)
+
+    price = connector.get_realtime_price("TSLA")
+    assert connector.get_realtime_price("TSLA") == price
+    assert source.history_calls == ["TSLA"]
+    assert service.get_quote("TSLA")["source"] == "on_demand"
+
+    service.max_staleness = 0
+    service.get("TSLA")
+    assert source.history_calls == ["TSLA", "TSLA"]
+
+
+def test_on_demand_quotes_are_bounded(tmp_path):
+    source = CountingSource()
+    connector = MarketDataConnector(cache_dir=str(tmp_path), source=source)
+    service = QuoteSnapshotService(connector, watchlist=["AAPL"], max_on_demand=2)
+    service.refresh()
+    table = service._quotes
+
+    for ticker in ("T1", "T2", "T3", "T2"):
+        service.get(ticker)
+    # The snapshot table is neither copied nor grown by on-demand lookups
+    assert service._quotes is table and list(table) == ["AAPL"]
+    assert service.stats()["on_demand_quotes"] == 2
+    assert source.history_calls == ["T1", "T2", "T3"]
+    service.get("T1")  # evicted, fetched again
+    assert source.history_calls == ["T1", "T2", "T3", "T1"]
+
+
+def test_singleton_created_once(monkeypatch):
+    created = []
+
+    class SlowService:
+        def __init__(self, watchlist=()):
+            created.append(self)
+            time.sleep(0.05)
+            self.connector = self
+
+        def attach_quotes(self, service):
+            pass
+
+        def start(self):
+            pass
+
+    monkeypatch.setattr(quote_snapshot, "QuoteSnapshotService", SlowService)
+    monkeypatch.setattr(quote_snapshot, "_quote_service", None)
+    results = []
+    threads = [threading.Thread(
+        target=lambda: results.append(quote_snapshot.get_quote_service()))
+        for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1
+    assert all(result is created[0] for result in results)
@@ -0,0 +1,125 @@
+"""
+============================================================================
+TITAN PLATFORM - BACKTEST RESULT CACHE TEST
+============================================================================
+Verifies the content-addressed run_backtest result cache:
+- Keys change with every input (params, range, capital, mode, data)
+- Repeated backtests are served without touching the data loader
+- Results persist on disk across engine instances (with equity curves)
+- Refreshing a ticker's data invalidates and prunes its results
+- Custom registered strategies are never cached
+
+Run with: python -m pytest tests/test_result_cache.py
+============================================================================
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from services.backtest_engine.result_cache import BacktestResultCache, result_key
+from services.backtest_engine.simulator import BacktestEngine
+from services.ingestion_engine.mock_market_service import SyntheticMarketGenerator
+
+ARGS = ("AAA", "rsi_strategy", "2015-01-01", "2020-01-01", 50_000.0)
+
+
+@pytest.fixture
+def setup(tmp_path, synthetic_loader):
+    loader = synthetic_loader(["AAA"], "2014-01-01", "2020-01-01", seed=2,
+                              cache_dir=tmp_path)
+    cache = BacktestResultCache(str(tmp_path / "results.sqlite"))
+    return loader, cache, BacktestEngine(data_loader=loader, result_cache=cache)
+
+
+def test_result_key():
+    base = dict(ticker="AAA", strategy="rsi_strategy", params={"period": 14},
+                start_date="2015-01-01", end_date=None, initial_capital=1000,
+                mode="vectorized", checksum="abc", engine_version=1)
+    key = result_key(**base)
+    assert key == result_key(**{**base, "ticker": "aaa", "initial_capital": 1000.0})
+    for change in ({"params": {"period": 15}}, {"end_date": "2020-01-01"},
+                   {"mode": "loop"}, {"checksum": "abd"}, {"engine_version": 2}):
+        assert result_key(**{**base, **change}) != key
+
+
+def test_repeat_is_served_from_cache(setup, monkeypatch):
+    loader, cache, engine = setup
+    first = engine.run_backtest(*ARGS)
+    assert first["status"] == "success"
+    assert cache.stats()["entries"] == 1
+
+    def no_loading(*args, **kwargs):
+        raise AssertionError("data loaded on a cache hit")
+    monkeypatch.setattr(loader, "get_data", no_loading)
+    assert engine.run_backtest(*ARGS) == first
+    assert cache.hits == 1
+    # A different input is a miss
+    monkeypatch.undo()
+    other = engine.run_backtest(*ARGS, params={"period": 10})
+    assert other["params"]["period"] == 10 and cache.stats()["entries"] == 2
+    assert engine.run_backtest(*ARGS, mode="loop") == first
+    assert cache.stats()["entries"] == 3
+
+
+def test_persists_across_instances(setup, tmp_path):
+    loader, cache, engine = setup
+    report = engine.run_backtest(*ARGS)
+    cache.close()
+
+    reopened = BacktestResultCache(str(tmp_path / "results.sqlite"))
+    engine = BacktestEngine(data_loader=loader, result_cache=reopened)
+    assert engine.run_backtest(*ARGS) == report
+    assert reopened.hits == 1
+    key = engine._result_key(*ARGS[:2], {"period": 14, "oversold": 30, "overbought": 70},
+                             *ARGS[2:], "vectorized")
+    equity = reopened.get_equity(key)
+    assert equity[-1] == report["final_value"] and equity[0] == 50_000.0
+    assert not equity.flags.writeable
+
+
+def test_refresh_invalidates(setup):
+    loader, cache, engine = setup
+    before = engine.run_backtest(*ARGS)
+    engine.run_backtest("AAA", "buy_and_hold", None, None)
+    assert cache.stats()["entries"] == 2
+
+    loader.store.write("AAA", SyntheticMarketGenerator(seed=3).generate(
+        ["AAA"], start="2014-01-01", end="2020-01-01")["AAA"])
+    loader.frames.clear()
+    after = engine.run_backtest(*ARGS)
+    assert after != before and cache.hits == 0
+    # Results computed on the old data were pruned
+    assert cache.stats()["entries"] == 1
+    assert engine.run_backtest(*ARGS, use_cache=False) == after
+    assert cache.invalidate("AAA") == 1 and cache.stats()["entries"] == 0
+
+
+def test_custom_strategies_not_cached(setup):
+    from services.backtest_engine.strategy import (
+        BUY, HOLD, STRATEGY_CLASSES, Strategy, register_strategy)
+    loader, cache, engine = setup
+
+    class FirstBar(Strategy):
+        name = "first_bar_probe"
+
+        def on_bar(self, bar, state):
+            return BUY if bar.i == 0 else HOLD
+
+    register_strategy(FirstBar)
+    try:
+        first = engine.run_backtest("AAA", "first_bar_probe", "2015-01-01", "2020-01-01")
+        assert first["status"] == "success"
+        assert cache.stats()["entries"] == 0
+
+        # Edited code under the same name is picked up, not served stale
+        FirstBar.on_bar = lambda self, bar, state: HOLD
+        edited = engine.run_backtest("AAA", "first_bar_probe", "2015-01-01", "2020-01-01")
+        assert edited["num_trades"] == 0 != first["num_trades"]
+        assert cache.stats()["entries"] == 0 and cache.hits == 0
+    finally:
+        STRATEGY_CLASSES.pop("first_bar_probe")
@@ -0,0 +1,135 @@
+"""
+============================================================================
+TITAN PLATFORM - STRATEGY API TEST
+============================================================================
+Verifies the event-driven Strategy interface:
+- Built-in strategies in event mode equal the vectorized and loop modes
+- Custom strategies (registered or passed as instances) with __slots__
+  state run through run_backtest
+- Parameter validation and mode errors
+
+Run with: python -m pytest tests/test_strategy_api.py
+============================================================================
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from services.backtest_engine.simulator import BacktestEngine
+from services.backtest_engine.strategy import (
+    BUY, HOLD, SELL, STRATEGY_CLASSES, BarArrays, BarView, Strategy, StrategyState,
+    get_strategy, register_strategy, run_event
+)
+from services.backtest_engine.vectorized import run_strategy
+from services.ingestion_engine.mock_market_service import SyntheticMarketGenerator
+
+
+class StreakState(StrategyState):
+    __slots__ = ("up_days", "held")
+
+    def __init__(self, initial_capital):
+        super().__init__(initial_capital)
+        self.up_days = 0
+        self.held = 0
+
+
+class MomentumStreak(Strategy):
+    """Buy after `streak` up closes in a row, sell after `hold` bars"""
+    name = "momentum_streak"
+    params = {"streak": 3, "hold": 5}
+    state_class = StreakState
+
+    def prepare(self, bars):
+        self._close = bars.close
+        return 1
+
+    def on_bar(self, bar, state):
+        i = bar.i
+        state.up_days = state.up_days + 1 if self._close[i] > self._close[i - 1] else 0
+        if state.position:
+            state.held += 1
+            return SELL if state.held >= self.params["hold"] else HOLD
+        if state.up_days >= self.params["streak"]:
+            state.held = 0
+            return BUY
+        return HOLD
+
+
+@pytest.fixture(scope="module")
+def engine(synthetic_loader):
+    loader = synthetic_loader(["AAA", "BBB"], "2010-01-01", "2020-01-01",
+                              seed=9, model="regime")
+    return BacktestEngine(data_loader=loader)
+
+
+@pytest.mark.parametrize("strategy", ["buy_and_hold", "rsi_strategy", "ma_crossover"])
+def test_event_matches_other_modes(engine, strategy):
+    args = ("AAA", strategy, "2010-01-01", "2020-01-01", 25_000.0)
+    event = engine.run_backtest(*args, mode="event")
+    assert event["status"] == "success"
+    assert event == engine.run_backtest(*args, mode="vectorized")
+    assert event == engine.run_backtest(*args, mode="loop")
+
+    data = engine.data_loader.get_data("BBB")
+    params = {"ma_crossover": {"fast": 20, "slow": 60},
+              "rsi_strategy": {"period": 9, "oversold": 35}}.get(strategy)
+    expected = run_strategy(data, strategy, 25_000.0, params)
+    result = run_event(BarArrays.from_frame(data), get_strategy(strategy, params), 25_000.0)
+    for field in expected._fields:
+        np.testing.assert_array_equal(getattr(result, field), getattr(expected, field))
+
+
+def test_custom_strategy(engine):
+    data = engine.data_loader.get_data("AAA")
+    result = run_event(BarArrays.from_frame(data), MomentumStreak(hold=3), 10_000.0)
+    buys = result.trade_bars[result.trade_actions == 1]
+    sells = result.trade_bars[result.trade_actions == -1]
+    assert len(buys) > 10
+    # Every position is held exactly three bars (except one closed at the end)
+    assert ((sells - buys)[:-1] == 3).all()
+    close = data["Close"].to_numpy()
+    assert (close[buys] > close[buys - 1]).all()
+
+    report = engine.run_backtest("AAA", MomentumStreak(), None, None)
+    assert report["status"] == "success"
+    assert report["strategy"] == "momentum_streak"
+    assert report["params"] == {"streak": 3, "hold": 5}
+
+    register_strategy(MomentumStreak)
+    try:
+        named = engine.run_backtest("AAA", "momentum_streak", None, None,
+                                    params={"streak": 2})
+        assert named["params"] == {"streak": 2, "hold": 5}
+        assert named["num_trades"] > report["num_trades"]
+    finally:
+        STRATEGY_CLASSES.pop("momentum_streak")
+
+
+def test_slots_state_and_view():
+    state = StreakState(1000.0)
+    with pytest.raises(AttributeError):
+        state.anything = 1
+    bars = BarArrays.from_frame(SyntheticMarketGenerator(seed=1).generate(
+        ["X"], start="2020-01-01", end="2020-03-01")["X"])
+    with pytest.raises(AttributeError):
+        BarView(bars).extra = 1
+    with pytest.raises(ValueError):
+        bars.add("short", np.zeros(3))
+
+
+def test_errors(engine):
+    with pytest.raises(ValueError, match="window"):
+        MomentumStreak(window=3)
+    with pytest.raises(ValueError):
+        get_strategy("nope")
+    result = engine.run_backtest("AAA", MomentumStreak(), None, None, mode="vectorized")
+    assert result["status"] == "error"
+    result = engine.run_backtest("AAA", "rsi_strategy", None, None, mode="loop",
+                                 params={"period": 5})
+    assert result["status"] == "error"
+    assert BUY == 1 and SELL == -1 and HOLD == 0
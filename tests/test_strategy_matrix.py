@@ -0,0 +1,171 @@
+"""
+============================================================================
+TITAN PLATFORM - STRATEGY MATRIX TEST
+============================================================================
+Verifies the precomputed strategy matrix:
+- The batch build runs every strategy/period through the real engine
+- Short caches are backfilled; periods never silently shrink
+- Save/load round trip of the compact table and reload after a rebuild
+- Lookups are served without running backtests; misses and stale
+  matrices run live
+- backtest_strategy tool answers from the matrix
+
+Run with: python -m pytest tests/test_strategy_matrix.py
+============================================================================
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import services.backtest_engine.strategy_matrix as strategy_matrix
+from services.backtest_engine.simulator import BacktestEngine
+from services.backtest_engine.strategy_matrix import (
+    MATRIX_DTYPE, StrategyMatrix, build_strategy_matrix, get_strategy_matrix,
+    strategy_result)
+from services.ingestion_engine.mock_market_service import SyntheticMarketGenerator
+
+
+@pytest.fixture
+def engine(monkeypatch, synthetic_loader):
+    monkeypatch.setattr(
+        "services.ingestion_engine.connectors.yfinance_connector.yf.download",
+        lambda *args, **kwargs: pd.DataFrame())
+    loader = synthetic_loader(["AAA", "BBB", "CCC"], "2012-01-01", "2020-01-01",
+                              seed=4)
+    return BacktestEngine(data_loader=loader)
+
+
+@pytest.fixture
+def matrix(engine):
+    return build_strategy_matrix(["aaa", "BBB", "ZZZ"], engine=engine,
+                                 periods=("1y", "5y"), initial_capital=50_000.0)
+
+
+def test_build_uses_engine(engine, matrix):
+    assert matrix.table.dtype == MATRIX_DTYPE
+    assert matrix.table.shape == (3, 3, 2)
+    # ZZZ has no data: skipped, the rest are all computed
+    assert len(matrix) == 2 * 3 * 2 and "ZZZ" in matrix
+    assert matrix.lookup("ZZZ", "buy_and_hold", "1y") is None
+
+    cell = matrix.lookup("aaa", "rsi_strategy", "5y")
+    assert (cell["start_date"], cell["end_date"]) == ("2015-01-01", "2020-01-01")
+    live = engine.run_backtest("AAA", "rsi_strategy", cell["start_date"],
+                               cell["end_date"], 50_000.0)
+    for name in ("total_return", "sharpe_ratio", "max_drawdown", "win_rate"):
+        assert cell[name] == live["metrics"][name]
+    assert cell["num_trades"] == live["num_trades"]
+    assert cell["final_value"] == pytest.approx(live["final_value"])
+    assert matrix.lookup("AAA", "rsi_strategy", "2y") is None
+    assert matrix.lookup("AAA", "momentum", "1y") is None
+
+    with pytest.raises(ValueError):
+        build_strategy_matrix(["AAA"], engine=engine, periods=("5d",))
+
+
+def test_short_cache_backfills_longer_periods(monkeypatch, synthetic_loader):
+    full = SyntheticMarketGenerator(seed=4).generate(
+        ["AAA", "NEW"], start="2012-01-01", end="2020-01-01")
+    full["NEW"] = full["NEW"].loc["2018-01-01":]  # listed in 2018
+    responses = []
+
+    def fake_download(ticker, start=None, end=None, **kwargs):
+        responses.append(ticker)
+        if len(responses) == 1:
+            return pd.DataFrame()  # transient failure
+        return full[ticker].loc[start:end].iloc[:-1]
+
+    monkeypatch.setattr(
+        "services.ingestion_engine.connectors.yfinance_connector.yf.download",
+        fake_download)
+    loader = synthetic_loader(["AAA", "NEW"], "2012-01-01", "2020-01-01", seed=4,
+                              listed={"AAA": "2019-01-01", "NEW": "2019-01-01"})
+    engine = BacktestEngine(data_loader=loader)
+
+    # Failed backfill: the 5y cell is left out, not filled with the 1y run
+    failed = build_strategy_matrix(["AAA"], engine=engine, periods=("1y", "5y"))
+    assert failed.lookup("AAA", "buy_and_hold", "1y") is not None
+    assert failed.lookup("AAA", "buy_and_hold", "5y") is None
+
+    matrix = build_strategy_matrix(["AAA", "NEW"], engine=engine, periods=("1y", "5y"))
+    one, five = (matrix.lookup("AAA", "buy_and_hold", p) for p in ("1y", "5y"))
+    assert (one["start_date"], five["start_date"]) == ("2019-01-01", "2015-01-01")
+    assert five["total_return"] != one["total_return"]
+    # Nothing older than the listing exists: 5y starts at the first bar
+    assert matrix.lookup("NEW", "buy_and_hold", "5y")["start_date"] == "2018-01-01"
+
+
+def test_save_load_and_reload(matrix, engine, tmp_path):
+    path = str(tmp_path / "matrix" / "strategy_matrix.npz")
+    matrix.save(path)
+    loaded = StrategyMatrix.load(path)
+    np.testing.assert_array_equal(loaded.table, matrix.table)
+    assert loaded.lookup("BBB", "ma_crossover", "1y") == \
+        matrix.lookup("BBB", "ma_crossover", "1y")
+    assert loaded.as_of == matrix.as_of and loaded.initial_capital == 50_000.0
+    frame = loaded.to_frame()
+    assert len(frame) == 12 and set(frame["ticker"]) == {"AAA", "BBB"}
+
+    assert get_strategy_matrix(path) is get_strategy_matrix(path)
+    first = get_strategy_matrix(path)
+    build_strategy_matrix(["CCC"], engine=engine, periods=("1y",)).save(path)
+    assert get_strategy_matrix(path) is not first
+    assert get_strategy_matrix(path).tickers == ["CCC"]
+    assert get_strategy_matrix(str(tmp_path / "missing.npz")) is None
+
+
+def test_lookup_without_running(matrix, engine, monkeypatch):
+    def no_runs(*args, **kwargs):
+        raise AssertionError("backtest ran on a matrix hit")
+    run_backtest = engine.run_backtest
+    monkeypatch.setattr(engine, "run_backtest", no_runs)
+    result = strategy_result("AAA", "buy_and_hold", "1y", 50_000.0,
+                             matrix=matrix, engine=engine)
+    assert result["source"] == "matrix" and result["status"] == "success"
+    monkeypatch.setattr(engine, "run_backtest", run_backtest)
+
+    # Unseen ticker: live run through the engine
+    live = strategy_result("CCC", "buy_and_hold", "max", 50_000.0,
+                           matrix=matrix, engine=engine)
+    assert live["source"] == "live"
+    assert live["total_return"] == engine.run_backtest(
+        "CCC", "buy_and_hold", None, None, 50_000.0)["metrics"]["total_return"]
+    # Different capital than the matrix was built with is also live
+    assert strategy_result("AAA", "buy_and_hold", "max", 10_000.0,
+                           matrix=matrix, engine=engine)["source"] == "live"
+    assert strategy_result("AAA", "momentum", "max", matrix=matrix,
+                           engine=engine)["status"] == "error"
+    assert strategy_result("AAA", "buy_and_hold", "5d", matrix=matrix,
+                           engine=engine)["status"] == "error"
+
+    # A matrix the nightly job stopped refreshing is not served
+    matrix.as_of = "2020-01-02T00:00:00"
+    runs = []
+    monkeypatch.setattr(engine, "run_backtest", lambda *args, **kwargs: (
+        runs.append(args), run_backtest(*args, **kwargs))[1])
+    strategy_result("AAA", "buy_and_hold", "1y", 50_000.0, matrix=matrix, engine=engine)
+    assert len(runs) == 1
+    assert strategy_result("AAA", "buy_and_hold", "1y", 50_000.0, matrix=matrix,
+                           engine=engine, max_age_hours=None)["source"] == "matrix"
+
+
+def test_backtest_tool(engine, monkeypatch):
+    from agent_platform import tools
+    matrix = build_strategy_matrix(["AAA"], engine=engine, periods=("1y",))
+    monkeypatch.setattr(strategy_matrix, "get_strategy_matrix", lambda: matrix)
+    monkeypatch.setattr(strategy_matrix, "get_backtest_engine", lambda: engine)
+
+    result = tools.backtest_strategy("AAA", "rsi_strategy", "1y")
+    assert result["success"] and result["source"] == "matrix"
+    assert result == dict(matrix.lookup("AAA", "rsi_strategy", "1y"),
+                          source="matrix", success=True)
+    assert "status" not in result
+    live = tools.backtest_strategy("BBB", "ma_crossover", "max")
+    assert live["success"] and live["source"] == "live"
+    assert not tools.backtest_strategy("AAA", "coin_flip")["success"]
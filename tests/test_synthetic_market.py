@@ -0,0 +1,67 @@
+"""
+============================================================================
+TITAN PLATFORM - SYNTHETIC MARKET DATA TEST
+============================================================================
+Verifies SyntheticMarketGenerator and the synthetic connector:
+- Same seed + ticker always yields the same bars, independent of universe
+- Correlated universes, valid OHLC, intraday sessions
+- MarketDataConnector interface works without network
+
+Run with: python -m pytest tests/test_synthetic_market.py
+============================================================================
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from services.ingestion_engine.mock_market_service import (
+    SyntheticMarketGenerator, get_synthetic_connector
+)
+
+
+def test_deterministic_and_universe_independent():
+    gen = SyntheticMarketGenerator(seed=7, model="regime")
+    alone = gen.generate_frame("AAPL", years=5, end="2024-12-31")
+    in_universe = SyntheticMarketGenerator(seed=7, model="regime").generate(
+        ["MSFT", "AAPL", "XYZ"], years=1, end="2024-12-31")["AAPL"]
+
+    pd.testing.assert_frame_equal(alone.loc[in_universe.index], in_universe)
+    assert not alone.equals(
+        SyntheticMarketGenerator(seed=8).generate_frame(
+            "AAPL", years=5, end="2024-12-31"))
+
+
+def test_correlation_and_ohlc_validity():
+    gen = SyntheticMarketGenerator(seed=1, correlation=0.5)
+    closes = gen.price_matrix([f"T{i}" for i in range(20)], years=10)
+    corr = np.corrcoef(np.log(closes).diff().dropna().to_numpy().T)
+    mean_corr = (corr.sum() - 20) / (20 * 19)
+    assert 0.4 < mean_corr < 0.6
+
+    bars = gen.generate_frame("T0", years=2)
+    assert (bars["High"] >= bars[["Open", "Close"]].max(axis=1)).all()
+    assert (bars["Low"] <= bars[["Open", "Close"]].min(axis=1)).all()
+
+
+def test_intraday_sessions():
+    gen = SyntheticMarketGenerator(seed=3)
+    bars = gen.generate_frame(
+        "AAPL", start="2024-12-02", end="2024-12-06", interval="5m")
+    assert len(bars) == 5 * 78
+    assert bars.index[0] == pd.Timestamp("2024-12-02 09:30")
+    assert bars.index[-1] == pd.Timestamp("2024-12-06 15:55")
+
+
+def test_synthetic_connector_interface(tmp_path):
+    connector = get_synthetic_connector(cache_dir=str(tmp_path))
+    result = connector.get_ohlcv("ANYTHING", "3mo")
+    assert 55 <= len(result["data"]) <= 70
+    assert connector.get_realtime_price("ANYTHING") == result["current_price"]
+
+    batch = connector.get_multiple_tickers(["A", "B", "C"], "1y")
+    assert all("error" not in r for r in batch.values())
@@ -0,0 +1,100 @@
+"""
+============================================================================
+TITAN PLATFORM - TRADE LEDGER TEST
+============================================================================
+Verifies the array-backed TradeLedger and VirtualPortfolio on top of it:
+- FIFO / LIFO / last-buy realized P&L with partial lot closes
+- Lot deque reuse and growth over many round trips
+- Bulk export (structured array, DataFrame, legacy dicts)
+- 100k-trade portfolios stay linear
+
+Run with: python -m pytest tests/test_trade_ledger.py
+============================================================================
+"""
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from services.backtest_engine.ledger import TRADE_DTYPE, TradeLedger
+from services.backtest_engine.simulator import VirtualPortfolio
+
+
+def fill(ledger):
+    ledger.record_buy("2024-01-02", 10, 100.0)
+    ledger.record_buy("2024-01-03", 10, 110.0)
+    return ledger.record_sell("2024-01-04", 15, 120.0)
+
+
+def test_cost_basis_methods():
+    fifo = TradeLedger("fifo")
+    assert fill(fifo) == 10 * 20.0 + 5 * 10.0
+    assert fifo.open_shares == 5 and fifo.average_cost == 110.0
+
+    lifo = TradeLedger("lifo")
+    assert fill(lifo) == 10 * 10.0 + 5 * 20.0
+    assert lifo.open_shares == 5 and lifo.average_cost == 100.0
+
+    last = TradeLedger("last")
+    assert fill(last) == 15 * 10.0
+    assert last.realized_pnl == 150.0
+
+    assert fifo.record_sell("2024-01-05", 5, 100.0) == -50.0
+    assert fifo.open_lots == 0 and fifo.open_cost == 0.0
+    assert fifo.realized_pnl == 200.0
+    with pytest.raises(ValueError):
+        fifo.record_sell("2024-01-06", 1, 100.0)
+    with pytest.raises(ValueError):
+        TradeLedger("average")
+
+
+def test_lots_grow_and_compact():
+    ledger = TradeLedger("fifo", capacity=2)
+    # Staggered buys and partial sells keep a few lots open at all times
+    for day in range(1000):
+        ledger.record_buy("2024-01-01", 3, float(day))
+        if day >= 2:
+            ledger.record_sell("2024-01-01", 3, float(day))
+    assert ledger.open_shares == 6 and ledger.open_lots == 2
+    assert len(ledger._lot_shares) <= 4
+    # Every sell closed the lot bought two days earlier
+    profits = ledger.to_array()['profit'][ledger.to_array()['action'] == -1]
+    assert (profits == 6.0).all()
+
+
+def test_bulk_export():
+    ledger = TradeLedger()
+    fill(ledger)
+    rows = ledger.to_array()
+    assert rows.dtype == TRADE_DTYPE and len(rows) == len(ledger) == 3
+    frame = ledger.to_frame()
+    assert frame["action"].tolist() == ["BUY", "BUY", "SELL"]
+    assert str(frame["date"].iloc[-1].date()) == "2024-01-04"
+    assert ledger.to_dicts()[-1] == {"date": "2024-01-04", "action": "SELL", "shares": 15,
+                                     "price": 120.0, "value": 1800.0, "profit": 250.0}
+    assert ledger.to_dicts()[0]["profit"] == 0
+
+
+def test_portfolio_high_turnover_is_linear():
+    def round_trips(n):
+        portfolio = VirtualPortfolio(1_000_000.0)
+        start = time.perf_counter()
+        for i in range(n):
+            portfolio.buy(100.0, "2024-01-02", shares=10)
+            portfolio.sell(100.5, "2024-01-03")
+        return time.perf_counter() - start, portfolio
+
+    small, _ = round_trips(5_000)
+    large, portfolio = round_trips(50_000)
+    # 10x the trades: linear is ~10x, the old list scan was ~100x
+    assert large < small * 30
+    assert len(portfolio.ledger) == 100_000
+    assert portfolio.realized_pnl == pytest.approx(50_000 * 5.0)
+    assert portfolio.cash == pytest.approx(1_000_000.0 + 50_000 * 5.0)
+    assert portfolio.trades[-1]["profit"] == pytest.approx(5.0)
+    assert not portfolio.sell(100.0, "2024-01-04", shares=1)